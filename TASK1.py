@@ -1,68 +1,431 @@
-def display_tasks(tasks):
-    """Displays the current list of tasks."""
-    if not tasks:
-        print("Your To-Do list is empty.")
-    else:
-        print("Your To-Do List:")
-        for i, task in enumerate(tasks):
-            status = "✓" if task["completed"] else " "
-            print(f"{i + 1}. [{status}] {task['description']}")
-
-def add_task(tasks, description):
-    """Adds a new task to the list."""
-    tasks.append({"description": description, "completed": False})
-    print(f"Task '{description}' added.")
-
-def mark_completed(tasks, task_index):
-    """Marks a task as completed."""
-    if 0 <= task_index < len(tasks):
-        tasks[task_index]["completed"] = True
-        print(f"Task '{tasks[task_index]['description']}' marked as completed.")
-    else:
-        print("Invalid task number.")
-
-def delete_task(tasks, task_index):
-    """Deletes a task from the list."""
-    if 0 <= task_index < len(tasks):
-        deleted_task = tasks.pop(task_index)
-        print(f"Task '{deleted_task['description']}' deleted.")
-    else:
-        print("Invalid task number.")
-
-def main():
-    tasks = []
-    while True:
-        print("\n--- To-Do List Application ---")
-        print("1. View tasks")
-        print("2. Add task")
-        print("3. Mark task as completed")
-        print("4. Delete task")
-        print("5. Exit")
-
-        choice = input("Enter your choice: ")
-
-        if choice == '1':
-            display_tasks(tasks)
-        elif choice == '2':
-            description = input("Enter task description: ")
-            add_task(tasks, description)
-        elif choice == '3':
-            try:
-                task_num = int(input("Enter task number to mark as completed: ")) - 1
-                mark_completed(tasks, task_num)
-            except ValueError:
-                print("Invalid input. Please enter a number.")
-        elif choice == '4':
-            try:
-                task_num = int(input("Enter task number to delete: ")) - 1
-                delete_task(tasks, task_num)
-            except ValueError:
-                print("Invalid input. Please enter a number.")
-        elif choice == '5':
-            print("Exiting To-Do List application. Goodbye!")
-            break
-        else:
-            print("Invalid choice. Please try again.")
-
-if '_name_' == '_main_':
-    main()
\ No newline at end of file
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+PAGE_SIZE = 20
+
+class IdSet:
+    """A set of task ids, kept in id order as one flag byte per id.
+
+    Live ids are also counted per block of BLOCK ids, so adding or removing
+    an id is O(1) and finding the ids from the n-th on walks the block
+    counts and then one block's flags: a page costs O(N / BLOCK + page)
+    however deep it is.
+    """
+
+    BLOCK = 4096
+
+    def __init__(self):
+        self.flags = bytearray()
+        self.blocks = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, task_id):
+        if task_id >= len(self.flags):
+            grown = max(task_id + 1, 2 * len(self.flags))
+            self.flags.extend(bytes(grown - len(self.flags)))
+            self.blocks.extend([0] * (grown // self.BLOCK + 1 - len(self.blocks)))
+        if not self.flags[task_id]:
+            self.flags[task_id] = 1
+            self.blocks[task_id // self.BLOCK] += 1
+            self.size += 1
+
+    def discard(self, task_id):
+        if task_id < len(self.flags) and self.flags[task_id]:
+            self.flags[task_id] = 0
+            self.blocks[task_id // self.BLOCK] -= 1
+            self.size -= 1
+
+    def slice(self, offset, limit):
+        """Returns up to ``limit`` ids in id order, skipping the first ``offset``."""
+        for block, count in enumerate(self.blocks):
+            if offset < count:
+                break
+            offset -= count
+        else:
+            return []
+        # Skip whole runs of flags by counting them, then step through the rest
+        start = block * self.BLOCK
+        while True:
+            count = self.flags.count(1, start, start + 64)
+            if offset < count:
+                break
+            offset -= count
+            start += 64
+        ids = []
+        find = self.flags.find
+        position = find(1, start)
+        while position >= 0 and len(ids) < limit:
+            if offset:
+                offset -= 1
+            else:
+                ids.append(position)
+            position = find(1, position + 1)
+        return ids
+
+class TaskStore:
+    """Tasks with stable ids, kept in parallel slot lists and a JSON-lines journal.
+
+    Every change is appended to the journal as one line, so nothing is lost on
+    exit. An id -> slot map makes lookups, completes and deletes O(1); a delete
+    only tombstones its slot. Once tombstones make up half of the slots, the
+    slots are packed and the journal is rewritten with one line per live task,
+    which keeps the amortized cost of a delete O(1) as well.
+
+    The all, pending and completed views are IdSets kept up to date by
+    every change, so counts and updates are O(1) and a page of a view costs
+    O(page) plus a walk over per-block counts, in id order.
+    """
+
+    # Fewer tombstones than this are never worth a rewrite
+    COMPACT_MIN = 1024
+
+    def __init__(self, filename="tasks.jsonl"):
+        self.filename = filename
+        self.ids = []
+        self.descriptions = []  # None marks a deleted (tombstoned) slot
+        self.completed = []
+        self.slot_of = {}
+        self.next_id = 1
+        self.tombstones = 0
+        self.views = {"all": IdSet(), "pending": IdSet(), "completed": IdSet()}
+        self.journal = None
+        self.pending = None  # journal lines buffered by batch()
+        if filename:
+            self.load()
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def __iter__(self):
+        """Yields (id, description, completed) for every live task in insertion order."""
+        for task_id, description, completed in zip(self.ids, self.descriptions, self.completed):
+            if description is not None:
+                yield task_id, description, completed
+
+    def get(self, task_id):
+        """Returns a task as a dict, or None if there is no task with that id."""
+        slot = self.slot_of.get(task_id)
+        if slot is None:
+            return None
+        return {"id": task_id, "description": self.descriptions[slot], "completed": self.completed[slot]}
+
+    def counts(self):
+        """Returns the number of all, pending and completed tasks."""
+        return {status: len(ids) for status, ids in self.views.items()}
+
+    def page(self, status="all", offset=0, limit=PAGE_SIZE):
+        """Returns (id, description, completed) for one slice of the all/pending/completed view."""
+        slot_of = self.slot_of
+        rows = []
+        for task_id in self.views[status].slice(offset, limit):
+            slot = slot_of[task_id]
+            rows.append((task_id, self.descriptions[slot], self.completed[slot]))
+        return rows
+
+    def add(self, description):
+        """Adds a task and returns its id."""
+        task_id = self.next_id
+        self._insert(task_id, description, False)
+        self._log({"op": "add", "id": task_id, "description": description})
+        return task_id
+
+    def complete(self, task_id):
+        """Marks a task as completed; returns False if there is no such task."""
+        slot = self.slot_of.get(task_id)
+        if slot is None:
+            return False
+        if not self.completed[slot]:
+            self._mark_completed(task_id, slot)
+            self._log({"op": "complete", "id": task_id})
+        return True
+
+    def _mark_completed(self, task_id, slot):
+        self.completed[slot] = True
+        self.views["pending"].discard(task_id)
+        self.views["completed"].add(task_id)
+
+    def delete(self, task_id):
+        """Deletes a task and returns its description, or None if there is no such task."""
+        description = self._tombstone(task_id)
+        if description is not None:
+            self._log({"op": "delete", "id": task_id})
+            self._maybe_compact()
+        return description
+
+    def _maybe_compact(self):
+        if self.tombstones >= self.COMPACT_MIN and self.tombstones * 2 >= len(self.ids):
+            self.compact()
+
+    def _insert(self, task_id, description, completed):
+        self.slot_of[task_id] = len(self.ids)
+        self.ids.append(task_id)
+        self.descriptions.append(description)
+        self.completed.append(completed)
+        self.next_id = max(self.next_id, task_id + 1)
+        self.views["all"].add(task_id)
+        self.views["completed" if completed else "pending"].add(task_id)
+
+    def _tombstone(self, task_id):
+        slot = self.slot_of.pop(task_id, None)
+        if slot is None:
+            return None
+        description = self.descriptions[slot]
+        self.descriptions[slot] = None
+        self.tombstones += 1
+        self.views["all"].discard(task_id)
+        self.views["completed" if self.completed[slot] else "pending"].discard(task_id)
+        return description
+
+    @contextmanager
+    def batch(self):
+        """Buffers the journal lines of every change made inside the block and appends them in one write."""
+        if self.pending is not None:
+            yield self
+            return
+        self.pending = []
+        try:
+            yield self
+        finally:
+            lines, self.pending = self.pending, None
+            if lines:
+                self._write("".join(lines))
+
+    def _log(self, entry):
+        """Appends one journal line, or buffers it inside batch()."""
+        if not self.filename:
+            return
+        line = json.dumps(entry) + "\n"
+        if self.pending is not None:
+            self.pending.append(line)
+        else:
+            self._write(line)
+
+    def _write(self, text):
+        if self.journal is None:
+            self.journal = open(self.filename, "a", encoding="utf-8")
+        self.journal.write(text)
+        self.journal.flush()
+
+    def load(self):
+        """Replays the journal file, if there is one."""
+        if not os.path.exists(self.filename):
+            return
+        good = 0  # byte offset just past the last complete line
+        with open(self.filename, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated line")
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn write at the end of the journal
+                good += len(line)
+                if entry["op"] == "add":
+                    self._insert(entry["id"], entry["description"], entry.get("completed", False))
+                elif entry["op"] == "complete":
+                    slot = self.slot_of.get(entry["id"])
+                    if slot is not None and not self.completed[slot]:
+                        self._mark_completed(entry["id"], slot)
+                elif entry["op"] == "delete":
+                    self._tombstone(entry["id"])
+                elif entry["op"] == "next_id":
+                    self.next_id = max(self.next_id, entry["id"])
+            torn = os.fstat(f.fileno()).st_size != good
+        if torn:
+            # Cut the torn line off, or lines appended after it would be unreadable too
+            os.truncate(self.filename, good)
+        self._maybe_compact()
+
+    def compact(self):
+        """Drops tombstoned slots and rewrites the journal with one line per live task."""
+        live = [slot for slot, description in enumerate(self.descriptions) if description is not None]
+        self.ids = [self.ids[slot] for slot in live]
+        self.descriptions = [self.descriptions[slot] for slot in live]
+        self.completed = [self.completed[slot] for slot in live]
+        self.slot_of = dict(zip(self.ids, range(len(self.ids))))
+        self.tombstones = 0
+        if self.filename:
+            self.close()
+            if self.pending:
+                self.pending.clear()  # already part of the rewritten journal
+            directory = os.path.dirname(os.path.abspath(self.filename))
+            fd, temp_name = tempfile.mkstemp(suffix=".tmp", dir=directory)
+            # mkstemp creates the file 0600; keep the journal's own permissions
+            os.chmod(temp_name, _file_mode(self.filename))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                # Recorded so ids of deleted tasks are not handed out again
+                f.write(json.dumps({"op": "next_id", "id": self.next_id}) + "\n")
+                f.writelines(json.dumps({"op": "add", "id": task_id, "description": description,
+                                         "completed": completed}) + "\n"
+                             for task_id, description, completed in self)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_name, self.filename)
+
+    def close(self):
+        """Closes the journal file."""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+def _file_mode(filename):
+    """Permission bits of an existing file, or the umask default for a new one."""
+    try:
+        return os.stat(filename).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def display_tasks(tasks, status="all", page=1, page_size=PAGE_SIZE):
+    """Displays one page of the tasks in a view, written to the console in one piece.
+
+    Returns True if there are more tasks after this page.
+    """
+    counts = tasks.counts()
+    if not counts[status]:
+        print("Your To-Do list is empty." if status == "all" else f"You have no {status} tasks.")
+        return False
+    pages = (counts[status] + page_size - 1) // page_size
+    lines = [f"Your To-Do List ({counts['pending']} pending, {counts['completed']} completed)"
+             f" - {status} tasks, page {page} of {pages}:"]
+    for task_id, description, completed in tasks.page(status, (page - 1) * page_size, page_size):
+        mark = "✓" if completed else " "
+        lines.append(f"{task_id}. [{mark}] {description}")
+    print("\n".join(lines))
+    return page < pages
+
+def add_task(tasks, description):
+    """Adds a new task to the list."""
+    tasks.add(description)
+    print(f"Task '{description}' added.")
+
+def mark_completed(tasks, task_id):
+    """Marks a task as completed."""
+    if tasks.complete(task_id):
+        print(f"Task '{tasks.get(task_id)['description']}' marked as completed.")
+    else:
+        print("Invalid task number.")
+
+def delete_task(tasks, task_id):
+    """Deletes a task from the list."""
+    deleted_description = tasks.delete(task_id)
+    if deleted_description is not None:
+        print(f"Task '{deleted_description}' deleted.")
+    else:
+        print("Invalid task number.")
+
+def _command_description(command):
+    """The description of a batch add; it must be text, as None marks deleted tasks."""
+    description = command["description"]
+    if not isinstance(description, str):
+        raise TypeError(f"description must be text, not {description!r}")
+    return description
+
+def _command_id(command):
+    """The task id of a batch command; booleans and other non-integers are rejected."""
+    task_id = command["id"]
+    if not isinstance(task_id, int) or isinstance(task_id, bool):
+        raise TypeError(f"task id must be an integer, not {task_id!r}")
+    return task_id
+
+def run_batch(tasks, lines):
+    """Applies JSON-lines commands with a single journal write; returns (applied, failed).
+
+    Each line is {"op": "add", "description": ...}, {"op": "complete", "id": ...}
+    or {"op": "delete", "id": ...}. Lines that cannot be applied are reported
+    on stderr and skipped.
+    """
+    applied = failed = 0
+    with tasks.batch():
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                command = json.loads(line)
+                op = command["op"]
+                if op == "add":
+                    ok = tasks.add(_command_description(command)) is not None
+                elif op == "complete":
+                    ok = tasks.complete(_command_id(command))
+                elif op == "delete":
+                    ok = tasks.delete(_command_id(command)) is not None
+                else:
+                    ok = False
+            except (ValueError, KeyError, TypeError):
+                ok = False
+            if ok:
+                applied += 1
+            else:
+                failed += 1
+                print(f"Line {number}: could not apply {line.strip()}", file=sys.stderr)
+    return applied, failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="To-Do List Application")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="apply JSON-lines commands from FILE ('-' for stdin) instead of the menu")
+    args = parser.parse_args(argv)
+    tasks = TaskStore()
+    if args.batch:
+        start = time.perf_counter()
+        if args.batch == "-":
+            applied, failed = run_batch(tasks, sys.stdin)
+        else:
+            with open(args.batch, encoding="utf-8") as f:
+                applied, failed = run_batch(tasks, f)
+        tasks.close()
+        elapsed = time.perf_counter() - start
+        print(f"Applied {applied} commands ({failed} failed) in {elapsed:.2f}s"
+              f" - {(applied + failed) / max(elapsed, 1e-9):,.0f} commands/s")
+        return
+    while True:
+        print("\n--- To-Do List Application ---")
+        print("1. View tasks")
+        print("2. Add task")
+        print("3. Mark task as completed")
+        print("4. Delete task")
+        print("5. Exit")
+
+        choice = input("Enter your choice: ")
+
+        if choice == '1':
+            status = {"p": "pending", "c": "completed"}.get(
+                input("Show (a)ll, (p)ending or (c)ompleted tasks? ").strip().lower()[:1], "all")
+            page = 1
+            while display_tasks(tasks, status, page):
+                if input("Press Enter for the next page, or 'q' to stop: ").strip().lower() == 'q':
+                    break
+                page += 1
+        elif choice == '2':
+            description = input("Enter task description: ")
+            add_task(tasks, description)
+        elif choice == '3':
+            try:
+                task_id = int(input("Enter task number to mark as completed: "))
+                mark_completed(tasks, task_id)
+            except ValueError:
+                print("Invalid input. Please enter a number.")
+        elif choice == '4':
+            try:
+                task_id = int(input("Enter task number to delete: "))
+                delete_task(tasks, task_id)
+            except ValueError:
+                print("Invalid input. Please enter a number.")
+        elif choice == '5':
+            tasks.close()
+            print("Exiting To-Do List application. Goodbye!")
+            break
+        else:
+            print("Invalid choice. Please try again.")
+
+if __name__ == '__main__':
+    main()
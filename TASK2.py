@@ -1,104 +1,669 @@
-#CALCULATOR
-
-def get_number(prompt):
-    """Get a valid number from user input."""
-    while True:
-        try:
-            return float(input(prompt))
-        except ValueError:
-            print("Invalid input! Please enter a valid number.")
-
-def get_operation():
-    """Get a valid operation choice from user."""
-    valid_operations = ['+', '-', '*', '/', 'add', 'subtract', 'multiply', 'divide']
-    
-    while True:
-        operation = input("Enter operation (+, -, *, /, add, subtract, multiply, divide): ").strip().lower()
-        if operation in valid_operations:
-            return operation
-        print("Invalid operation! Please choose from: +, -, *, /, add, subtract, multiply, divide")
-
-def perform_calculation(num1, num2, operation):
-    """Perform the calculation based on the operation."""
-    # Normalize operation to symbols
-    if operation in ['add', 'addition']:
-        operation = '+'
-    elif operation in ['subtract', 'subtraction']:
-        operation = '-'
-    elif operation in ['multiply', 'multiplication']:
-        operation = '*'
-    elif operation in ['divide', 'division']:
-        operation = '/'
-    
-    if operation == '+':
-        return num1 + num2
-    elif operation == '-':
-        return num1 - num2
-    elif operation == '*':
-        return num1 * num2
-    elif operation == '/':
-        if num2 == 0:
-            raise ZeroDivisionError("Cannot divide by zero!")
-        return num1 / num2
-
-def display_result(num1, num2, operation, result):
-    """Display the calculation result in a formatted way."""
-    # Convert operation back to symbol for display
-    if operation in ['add', 'addition']:
-        op_symbol = '+'
-    elif operation in ['subtract', 'subtraction']:
-        op_symbol = '-'
-    elif operation in ['multiply', 'multiplication']:
-        op_symbol = '*'
-    elif operation in ['divide', 'division']:
-        op_symbol = '/'
-    else:
-        op_symbol = operation
-    
-    print(f"\n{'='*30}")
-    print(f"Calculation: {num1} {op_symbol} {num2} = {result}")
-    print(f"{'='*30}")
-
-def main():
-    """Main calculator function."""
-  
-    print("• Addition (+ or add)")
-    print("• Subtraction (- or subtract)")
-    print("• Multiplication (* or multiply)")
-    print("• Division (/ or divide)")
-    print()
-    
-    try:
-        # Get user inputs
-        num1 = get_number("Enter the first number: ")
-        num2 = get_number("Enter the second number: ")
-        operation = get_operation()
-        
-        # Perform calculation
-        result = perform_calculation(num1, num2, operation)
-        
-        # Display result
-        display_result(num1, num2, operation, result)
-        
-    except ZeroDivisionError as e:
-        print(f"\nError: {e}")
-    except Exception as e:
-        print(f"\nAn unexpected error occurred: {e}")
-
-def ask_continue():
-    """Ask if user wants to perform another calculation."""
-    while True:
-        choice = input("\nWould you like to perform another calculation? (y/n): ").strip().lower()
-        if choice in ['y', 'yes']:
-            return True
-        elif choice in ['n', 'no']:
-            return False
-        else:
-            print("Please enter 'y' for yes or 'n' for no.")
-
-if __name__ == "__main__":
-    while True:
-        main()
-        if not ask_continue():
-            print("\nThank you for using the calculator! Goodbye! 👋")
-            break
+#CALCULATOR
+
+import argparse
+import csv
+import decimal
+import itertools
+import math
+import operator
+import random
+import re
+import sys
+import time
+from array import array
+from contextlib import nullcontext
+from fractions import Fraction
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # the array-module fallback below is used instead
+    np = None
+
+def divide(num1, num2):
+    """Divide, with the calculator's own message for a zero divisor."""
+    if num2 == 0:
+        raise ZeroDivisionError("Cannot divide by zero!")
+    return num1 / num2
+
+class Operator:
+    """One calculator operation: how it is written, parsed, computed and displayed.
+    
+    Binary operators are written between their operands and unary ones in
+    front (as a sign or a function name). Precedence is used by the
+    expression parser; higher binds tighter.
+    """
+    
+    __slots__ = ('symbol', 'arity', 'function', 'display', 'precedence', 'right_associative',
+                 'aliases', 'ufunc', 'divides')
+    
+    def __init__(self, symbol, arity, function, display=None, precedence=1, right_associative=False,
+                 aliases=(), ufunc=None, divides=False):
+        self.symbol = symbol
+        self.arity = arity
+        self.function = function
+        self.display = display or symbol
+        self.precedence = precedence
+        self.right_associative = right_associative
+        self.aliases = tuple(aliases)
+        # numpy ufunc name for column calculations, and whether a zero right operand is masked there
+        self.ufunc = ufunc
+        self.divides = divides
+    
+    def __call__(self, *operands):
+        return self.function(*operands)
+    
+    def __repr__(self):
+        return f"Operator({self.symbol!r}, arity={self.arity})"
+
+# alias -> Operator, for operators written between their operands and in front of one
+BINARY_OPERATORS = {}
+PREFIX_OPERATORS = {}
+TOKEN_PATTERN = None
+
+def register_operator(op):
+    """Make an operator usable under its symbol and aliases (case-insensitive)."""
+    global TOKEN_PATTERN
+    table = BINARY_OPERATORS if op.arity == 2 else PREFIX_OPERATORS
+    for name in (op.symbol, *op.aliases):
+        table[name.lower()] = op
+    # Longest symbols first, so '**' is not read as two '*'
+    symbols = sorted({name for name in (*BINARY_OPERATORS, *PREFIX_OPERATORS) if not name[0].isalpha()},
+                     key=len, reverse=True)
+    TOKEN_PATTERN = re.compile(
+        r"\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(?P<name>[A-Za-z_]\w*)|(?P<symbol>"
+        + "|".join(map(re.escape, symbols)) + r"|\S))")
+    # Programs compiled earlier may have resolved these names differently
+    compile_expression.cache_clear()
+    return op
+
+def get_operator(operation, arity=2):
+    """Look up a registered operator by symbol or alias; raises ValueError if unknown."""
+    op = (BINARY_OPERATORS if arity == 2 else PREFIX_OPERATORS).get(operation.lower())
+    if op is None:
+        raise ValueError(f"Unknown operation '{operation}'")
+    return op
+
+def tokenize(source):
+    """Split an expression into ('number' | 'name' | 'symbol', text) tokens."""
+    tokens = []
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = TOKEN_PATTERN.match(source, position)
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+@lru_cache(maxsize=1024)
+def compile_expression(source, backend=None):
+    """Parse an expression into a reverse Polish program, cached by source text and backend.
+    
+    Uses the shunting-yard algorithm driven by the operator tables. The
+    program is a tuple of (arity, value) steps: arity 0 pushes a number,
+    arity 1 or 2 applies a function to that many values on the stack.
+    Numbers and functions are those of ``backend`` (floats by default).
+    """
+    backend = backend or FLOAT_BACKEND
+    output = []
+    pending = []  # operators and '(' waiting for their operands: (precedence, arity, function) or None
+    expect_operand = True
+    for kind, text in tokenize(source):
+        if kind == 'name' and text.lower() not in BINARY_OPERATORS and text.lower() not in PREFIX_OPERATORS:
+            raise ValueError(f"Unknown name '{text}'")
+        if kind == 'number':
+            if not expect_operand:
+                raise ValueError(f"Missing operator before '{text}'")
+            output.append((0, backend.parse(text)))
+            expect_operand = False
+        elif text == '(':
+            if not expect_operand:
+                raise ValueError("Missing operator before '('")
+            pending.append(None)
+        elif text == ')':
+            if expect_operand:
+                raise ValueError("Missing operand before ')'")
+            while pending and pending[-1] is not None:
+                output.append(pending.pop()[1:])
+            if not pending:
+                raise ValueError("Unbalanced ')'")
+            pending.pop()
+        elif expect_operand and text.lower() in PREFIX_OPERATORS:
+            op = PREFIX_OPERATORS[text.lower()]
+            pending.append((op.precedence, 1, backend.function(op)))
+        elif not expect_operand and text.lower() in BINARY_OPERATORS:
+            op = BINARY_OPERATORS[text.lower()]
+            while pending and pending[-1] is not None and (
+                    pending[-1][0] > op.precedence or (pending[-1][0] == op.precedence and not op.right_associative)):
+                output.append(pending.pop()[1:])
+            pending.append((op.precedence, 2, backend.function(op)))
+            expect_operand = True
+        else:
+            raise ValueError(f"Unexpected '{text}'")
+    if expect_operand:
+        raise ValueError("Incomplete expression")
+    while pending:
+        step = pending.pop()
+        if step is None:
+            raise ValueError("Unbalanced '('")
+        output.append(step[1:])
+    return tuple(output)
+
+# The core four operators, and signs, which bind tighter than * and /
+register_operator(Operator('+', 2, operator.add, precedence=1, aliases=('add', 'addition'), ufunc='add'))
+register_operator(Operator('-', 2, operator.sub, precedence=1, aliases=('subtract', 'subtraction'),
+                           ufunc='subtract'))
+register_operator(Operator('*', 2, operator.mul, precedence=2, aliases=('multiply', 'multiplication'),
+                           ufunc='multiply'))
+register_operator(Operator('/', 2, divide, precedence=2, aliases=('divide', 'division'), ufunc='divide',
+                           divides=True))
+register_operator(Operator('-', 1, operator.neg, precedence=3, ufunc='negative'))
+register_operator(Operator('+', 1, operator.pos, precedence=3, ufunc='positive'))
+
+def integer_divide(num1, num2):
+    """Floor division, with the calculator's own message for a zero divisor."""
+    if num2 == 0:
+        raise ZeroDivisionError("Cannot divide by zero!")
+    return num1 // num2
+
+def modulo(num1, num2):
+    """Remainder with the sign of the divisor, with the calculator's own message for zero."""
+    if num2 == 0:
+        raise ZeroDivisionError("Cannot divide by zero!")
+    return num1 % num2
+
+def power(num1, num2):
+    """num1 raised to num2; raises ValueError where the result is not a real number."""
+    result = num1 ** num2
+    if isinstance(result, complex):
+        raise ValueError(f"{num1} ^ {num2} has no real value")
+    return result
+
+# Extra operators, plugged in through the same registry; functions bind tightest
+EXTRA_OPERATORS = [
+    Operator('^', 2, power, precedence=4, right_associative=True, aliases=('**', 'power', 'pow'),
+             ufunc='power'),
+    Operator('%', 2, modulo, precedence=2, aliases=('mod', 'modulo'), ufunc='remainder', divides=True),
+    Operator('//', 2, integer_divide, precedence=2, aliases=('div',), ufunc='floor_divide', divides=True),
+    Operator('sqrt', 1, math.sqrt, display='√', precedence=5, ufunc='sqrt'),
+    Operator('sin', 1, math.sin, precedence=5, ufunc='sin'),
+    Operator('cos', 1, math.cos, precedence=5, ufunc='cos'),
+    Operator('tan', 1, math.tan, precedence=5, ufunc='tan')
+]
+for extra in EXTRA_OPERATORS:
+    register_operator(extra)
+
+class NumberBackend:
+    """A kind of number the calculator computes with: float, Decimal or Fraction.
+    
+    ``parse`` turns user text (or a number) into a value, ``digits`` is the
+    number of significant digits results are good for (infinite when
+    exact), and ``functions`` replaces operator functions, by symbol, where
+    the default one would return a float or cannot keep the precision.
+    Decimal backends compute inside their own context.
+    """
+    
+    __slots__ = ('name', 'parse', 'digits', 'context', 'functions')
+    
+    def __init__(self, name, parse, digits, context=None, functions=None):
+        self.name = name
+        self.parse = parse
+        self.digits = digits
+        self.context = context
+        self.functions = functions or {}
+    
+    def function(self, op):
+        """The function computing an operator with this backend's numbers."""
+        return self.functions.get(op.symbol, op.function)
+    
+    def compute(self):
+        """A context manager for calculations with this backend."""
+        return decimal.localcontext(self.context) if self.context else nullcontext()
+    
+    def __repr__(self):
+        return f"NumberBackend({self.name!r}, digits={self.digits})"
+
+def _inexact(name):
+    """An operator function for the exact backend that has no exact result."""
+    def unavailable(*operands):
+        raise ValueError(f"'{name}' has no exact result; use a precision instead of exact mode")
+    return unavailable
+
+def _fraction_power(base, exponent):
+    """Powers of fractions, which are exact only for whole exponents."""
+    if exponent.denominator != 1:
+        raise ValueError("Only whole powers have an exact result; use a precision instead of exact mode")
+    return base ** exponent
+
+def _parse_decimal(value):
+    """Parse user text (or a number) into a Decimal; raises ValueError if it is not a number."""
+    try:
+        return decimal.Decimal(value)
+    except decimal.InvalidOperation:
+        raise ValueError(f"could not convert string to Decimal: {value!r}") from None
+
+def _decimal_function(function):
+    """Run a float-only math function on a Decimal, giving a Decimal back (good to float precision)."""
+    def compute(value):
+        return decimal.Decimal(repr(function(float(value))))
+    return compute
+
+def _decimal_divmod(num1, num2):
+    """Floored quotient and remainder of Decimals, like divmod() on floats and Fractions.
+    
+    Decimal's own // and % truncate towards zero instead.
+    """
+    if num2 == 0:
+        raise ZeroDivisionError("Cannot divide by zero!")
+    quotient, remainder = num1 // num2, num1 % num2
+    if remainder and (remainder < 0) != (num2 < 0):
+        quotient -= 1
+        remainder += num2
+    return quotient, remainder
+
+def _decimal_integer_divide(num1, num2):
+    """Floor division of Decimals."""
+    return _decimal_divmod(num1, num2)[0]
+
+def _decimal_modulo(num1, num2):
+    """Remainder of Decimals with the sign of the divisor."""
+    return _decimal_divmod(num1, num2)[1]
+
+FLOAT_BACKEND = NumberBackend('float', float, sys.float_info.dig)
+FRACTION_BACKEND = NumberBackend('fraction', Fraction, math.inf,
+                                 functions={'^': _fraction_power, 'sqrt': _inexact('sqrt'), 'sin': _inexact('sin'),
+                                            'cos': _inexact('cos'), 'tan': _inexact('tan')})
+
+@lru_cache(maxsize=None)
+def decimal_backend(precision=28, rounding=decimal.ROUND_HALF_EVEN):
+    """A Decimal backend with ``precision`` significant digits, one per (precision, rounding)."""
+    context = decimal.Context(prec=precision, rounding=rounding)
+    return NumberBackend(f'decimal({precision})', _parse_decimal, precision, context,
+                         functions={'//': _decimal_integer_divide, '%': _decimal_modulo,
+                                    'sqrt': decimal.Decimal.sqrt, 'sin': _decimal_function(math.sin),
+                                    'cos': _decimal_function(math.cos), 'tan': _decimal_function(math.tan)})
+
+def choose_backend(digits=None, exact=False):
+    """Pick the cheapest backend giving ``digits`` significant digits, or exact results.
+    
+    Floats are fastest and good for 15 digits, Decimal costs more but keeps
+    any precision asked for, and Fraction is exact but its numbers grow
+    with every multiplication and division.
+    """
+    if exact:
+        return FRACTION_BACKEND
+    if digits is None or digits <= FLOAT_BACKEND.digits:
+        return FLOAT_BACKEND
+    return decimal_backend(digits)
+
+def run_program(program):
+    """Evaluate a compiled reverse Polish program."""
+    stack = []
+    for arity, value in program:
+        if arity == 0:
+            stack.append(value)
+        elif arity == 1:
+            stack.append(value(stack.pop()))
+        else:
+            right = stack.pop()
+            stack[-1] = value(stack[-1], right)
+    return stack[0]
+
+def evaluate(source, backend=None):
+    """Evaluate an expression such as '2 * (3 + 4) / -5', with floats or another backend's numbers."""
+    backend = backend or FLOAT_BACKEND
+    with backend.compute():
+        return run_program(compile_expression(source, backend))
+
+CHUNK_SIZE = 65536
+
+def mask_failures(function):
+    """Wrap an operator function so an undefined or non-real result is NaN instead of an error.
+    
+    The wrapper counts, in its ``masked`` attribute, the NaN results it
+    returned for operands that were not NaN themselves.
+    """
+    def masked(num1, num2):
+        try:
+            result = function(num1, num2)
+        except (ArithmeticError, ValueError):
+            result = math.nan
+        if result != result and num1 == num1 and num2 == num2:
+            masked.masked += 1
+        return result
+    masked.masked = 0
+    return masked
+
+def calculate_columns(left, right, operation):
+    """Apply one operation to a column and a column or scalar; returns (results, masked count).
+    
+    Uses the operator's numpy ufunc when numpy is installed and a loop over
+    array('d') otherwise. Undefined results, such as division by zero,
+    0 ^ -1 or a fractional power of a negative number, do not raise: they
+    are NaN and counted as masked.
+    """
+    op = get_operator(operation)
+    if op.ufunc is None:
+        raise ValueError(f"Operation '{operation}' has no column form")
+    scalar = not hasattr(right, '__len__')
+    if np is not None:
+        left = np.asarray(left, dtype=np.float64)
+        right = np.float64(right) if scalar else np.asarray(right, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            results = getattr(np, op.ufunc)(left, right)
+        if op.divides:
+            results[np.broadcast_to(right == 0, left.shape)] = np.nan
+        elif op.function is power:
+            # 0 ^ -1 and overflowing powers raise in Python; numpy gives inf
+            results[np.isinf(results) & np.isfinite(left) & np.isfinite(right)] = np.nan
+        masked = np.isnan(results) & ~np.isnan(left) & ~np.isnan(right)
+        return results, int(masked.sum())
+    function = mask_failures(op.function)
+    results = array('d', map(function, left, itertools.repeat(right) if scalar else right))
+    return results, function.masked
+
+def read_csv_chunks(f, chunk_size=CHUNK_SIZE):
+    """Yield (left, right) column chunks from CSV rows of one or two numbers; right is None for one.
+    
+    A first row that is not numeric is taken as a header and skipped, and
+    so are blank lines.
+    """
+    rows = filter(None, csv.reader(f))
+    first = next(rows, None)
+    if first is None:
+        return
+    try:
+        [float(value) for value in first]
+        rows = itertools.chain([first], rows)
+    except ValueError:
+        pass
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        try:
+            left = array('d', [float(row[0]) for row in chunk])
+            right = array('d', [float(row[1]) for row in chunk]) if len(chunk[0]) > 1 else None
+        except IndexError:
+            raise ValueError("CSV rows have different numbers of columns") from None
+        yield left, right
+
+def read_binary_chunks(f, chunk_size=CHUNK_SIZE):
+    """Yield chunks of little-endian float64 values from a raw binary file."""
+    while True:
+        data = f.read(chunk_size * 8)
+        if not data:
+            return
+        if len(data) % 8:
+            raise ValueError("Binary input is not a whole number of float64 values")
+        if np is not None:
+            yield np.frombuffer(data, dtype='<f8')
+        else:
+            chunk = array('d', data)
+            if sys.byteorder == 'big':
+                chunk.byteswap()
+            yield chunk
+
+def write_binary(f, results):
+    """Write results as little-endian float64 values."""
+    if np is not None:
+        f.write(np.asarray(results, dtype='<f8').tobytes())
+        return
+    if sys.byteorder == 'big':
+        results = array('d', results)
+        results.byteswap()
+    f.write(results.tobytes())
+
+def calculate_file(input_path, operation, output_path, scalar=None, right_path=None, chunk_size=CHUNK_SIZE):
+    """Stream a column calculation from a CSV or raw float64 file into an output file.
+    
+    The input is a CSV file (one column with ``scalar``, or two columns) or
+    a binary file of float64 values, whose right-hand side is ``scalar`` or
+    a second binary file ``right_path``. Results are written in the input's
+    format, one chunk at a time, so files larger than memory work. Returns
+    (rows, masked).
+    """
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be at least 1")
+    binary = not input_path.lower().endswith('.csv')
+    if right_path and not binary:
+        raise ValueError("A right-hand file needs binary input; put a CSV's right operands in its second column")
+    rows = masked = 0
+    with open(input_path, 'rb' if binary else 'r', newline=None if binary else '') as source, \
+            open(output_path, 'wb' if binary else 'w', newline=None if binary else '') as target:
+        if binary:
+            right_file = open(right_path, 'rb') if right_path else None
+            try:
+                lefts = read_binary_chunks(source, chunk_size)
+                if right_file:
+                    chunks = itertools.zip_longest(lefts, read_binary_chunks(right_file, chunk_size))
+                else:
+                    chunks = zip(lefts, itertools.repeat(None))
+                for left, right in chunks:
+                    if left is None or (right is None and right_file):
+                        raise ValueError("Left and right inputs have different lengths")
+                    results, count = calculate_columns(left, _operand(left, right, scalar), operation)
+                    write_binary(target, results)
+                    rows += len(left)
+                    masked += count
+            finally:
+                if right_file:
+                    right_file.close()
+        else:
+            for left, right in read_csv_chunks(source, chunk_size):
+                results, count = calculate_columns(left, _operand(left, right, scalar), operation)
+                target.write("\n".join(map(repr, map(float, results))) + "\n")
+                rows += len(left)
+                masked += count
+    return rows, masked
+
+def _operand(left, right, scalar):
+    """The right-hand side for a chunk: its own column or the scalar."""
+    if right is not None:
+        if len(right) != len(left):
+            raise ValueError("Left and right inputs have different lengths")
+        return right
+    if scalar is None:
+        raise ValueError("A second column, a right-hand file or a scalar is required")
+    return scalar
+
+def _ladder_calculation(num1, num2, operation):
+    """The original if/elif dispatch, kept as the benchmark baseline."""
+    if operation in ['add', 'addition']:
+        operation = '+'
+    elif operation in ['subtract', 'subtraction']:
+        operation = '-'
+    elif operation in ['multiply', 'multiplication']:
+        operation = '*'
+    elif operation in ['divide', 'division']:
+        operation = '/'
+    
+    if operation == '+':
+        return num1 + num2
+    elif operation == '-':
+        return num1 - num2
+    elif operation == '*':
+        return num1 * num2
+    elif operation == '/':
+        if num2 == 0:
+            raise ZeroDivisionError("Cannot divide by zero!")
+        return num1 / num2
+
+def benchmark_dispatch(evaluations=2_000_000):
+    """Compare the if/elif ladder with registry dispatch over a random mix of operations."""
+    rng = random.Random(42)
+    names = ['+', '-', '*', '/', 'add', 'subtract', 'multiply', 'divide']
+    calls = [(rng.uniform(1, 100), rng.uniform(1, 100), rng.choice(names)) for _ in range(evaluations)]
+    lookup = BINARY_OPERATORS.__getitem__
+    contenders = [
+        ("if/elif ladder", lambda: [_ladder_calculation(a, b, name) for a, b, name in calls]),
+        ("perform_calculation", lambda: [perform_calculation(a, b, name) for a, b, name in calls]),
+        ("registry lookup", lambda: [lookup(name).function(a, b) for a, b, name in calls])
+    ]
+    baseline = None
+    for label, run in contenders:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{label:<20} {elapsed / evaluations * 1e9:>8.1f} ns/call {baseline / elapsed:>6.2f}x")
+
+def benchmark_backends(steps=200_000, compound_steps=2_000):
+    """Time each backend on long chains of calculations and show how far its result drifts.
+    
+    The ledger workload adds and subtracts amounts with two decimal places;
+    the compound workload multiplies a balance by an interest factor and adds
+    a deposit at every step. Errors are relative to the exact Fraction result.
+    """
+    rng = random.Random(42)
+    ledger = [(rng.choice('+-'), f"{rng.uniform(0, 10_000):.2f}") for _ in range(steps)]
+    compound = [(op, text) for _ in range(compound_steps)
+                for op, text in (('*', f"1.{rng.randrange(1, 500):04d}"), ('+', f"{rng.uniform(0, 100):.2f}"))]
+    backends = [FLOAT_BACKEND, decimal_backend(28), decimal_backend(50), FRACTION_BACKEND]
+    for workload, chain in (("ledger", ledger), ("compound", compound)):
+        print(f"{workload}: {len(chain):,} chained operations")
+        exact = None
+        for backend in reversed(backends):  # Fraction first, as the reference
+            program = [(backend.function(get_operator(op)), backend.parse(text)) for op, text in chain]
+            start = time.perf_counter()
+            with backend.compute():
+                value = backend.parse("1000")
+                for function, operand in program:
+                    value = function(value, operand)
+            elapsed = time.perf_counter() - start
+            exact = exact if exact is not None else value
+            error = abs(Fraction(value) - exact) / abs(exact)
+            print(f"  {backend.name:<14} {len(chain) / elapsed:>12,.0f} ops/s   relative error {float(error):.1e}")
+
+def batch_main(argv=None):
+    """Command-line entry point: column calculations, benchmarks, or the interactive calculator."""
+    parser = argparse.ArgumentParser(description="Calculator; given an input file, applies one operation to "
+                                                 "whole columns of numbers")
+    parser.add_argument("input", nargs="?", help="CSV file with one or two numeric columns, or a raw float64 file")
+    parser.add_argument("--op", help="a binary operator such as +, -, *, /, ^, % or its name")
+    parser.add_argument("--scalar", type=float, help="right-hand operand for every row")
+    parser.add_argument("--right", help="raw float64 file with the right-hand operands (binary input only)")
+    parser.add_argument("--output", help="where to write the results (same format as the input)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows processed per chunk")
+    parser.add_argument("--digits", type=int, help="significant digits the interactive calculator must keep")
+    parser.add_argument("--exact", action="store_true", help="interactive calculator uses exact fractions")
+    parser.add_argument("--benchmark-dispatch", action="store_true",
+                        help="time operator dispatch against the old if/elif ladder and exit")
+    parser.add_argument("--benchmark-backends", action="store_true",
+                        help="time float, Decimal and Fraction arithmetic on long chained calculations and exit")
+    args = parser.parse_args(argv)
+    if args.benchmark_dispatch:
+        benchmark_dispatch()
+        return
+    if args.benchmark_backends:
+        benchmark_backends()
+        return
+    if not (args.input or args.op or args.output):
+        interactive(choose_backend(args.digits, args.exact))
+        return
+    if not (args.input and args.op and args.output):
+        parser.error("input, --op and --output are required")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    start = time.perf_counter()
+    try:
+        rows, masked = calculate_file(args.input, args.op.lower(), args.output, args.scalar, args.right,
+                                      args.chunk_size)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Error: {e}")
+    elapsed = time.perf_counter() - start
+    print(f"Calculated {rows} rows ({masked} undefined results masked as NaN) in {elapsed:.2f}s"
+          f" - {rows / max(elapsed, 1e-9):,.0f} rows/s using {'numpy' if np is not None else 'the array module'}")
+
+def get_number(prompt, backend=None):
+    """Get a valid number from user input, as a float or another backend's number."""
+    parse = (backend or FLOAT_BACKEND).parse
+    while True:
+        try:
+            return parse(input(prompt).strip())
+        except ValueError:
+            print("Invalid input! Please enter a valid number.")
+
+def get_operation():
+    """Get a valid operation choice from user."""
+    choices = ", ".join(BINARY_OPERATORS)
+    
+    while True:
+        operation = input(f"Enter operation ({choices}): ").strip().lower()
+        if operation in BINARY_OPERATORS:
+            return operation
+        print(f"Invalid operation! Please choose from: {choices}")
+
+def perform_calculation(num1, num2, operation, backend=None):
+    """Perform the calculation based on the operation, with floats or another backend's numbers."""
+    if backend is None:
+        return get_operator(operation).function(num1, num2)
+    with backend.compute():
+        return backend.function(get_operator(operation))(backend.parse(num1), backend.parse(num2))
+
+def display_result(num1, num2, operation, result):
+    """Display the calculation result in a formatted way."""
+    # Convert operation back to symbol for display
+    op = BINARY_OPERATORS.get(operation.lower())
+    op_symbol = op.display if op else operation
+    
+    print(f"\n{'='*30}")
+    print(f"Calculation: {num1} {op_symbol} {num2} = {result}")
+    print(f"{'='*30}")
+
+def main(backend=None):
+    """Main calculator function."""
+  
+    print("• Addition (+ or add)")
+    print("• Subtraction (- or subtract)")
+    print("• Multiplication (* or multiply)")
+    print("• Division (/ or divide)")
+    print("• In expressions also: " + ", ".join(op.symbol for op in EXTRA_OPERATORS))
+    print()
+    
+    try:
+        expression = input("Enter an expression (e.g. 2 * (3 + 4)), or press Enter to go step by step: ").strip()
+        if expression:
+            result = evaluate(expression, backend)
+            print(f"\n{'='*30}")
+            print(f"Calculation: {expression} = {result}")
+            print(f"{'='*30}")
+            return
+        
+        # Get user inputs
+        num1 = get_number("Enter the first number: ", backend)
+        num2 = get_number("Enter the second number: ", backend)
+        operation = get_operation()
+        
+        # Perform calculation
+        result = perform_calculation(num1, num2, operation, backend)
+        
+        # Display result
+        display_result(num1, num2, operation, result)
+        
+    except (ArithmeticError, ValueError) as e:
+        print(f"\nError: {e}")
+    except Exception as e:
+        print(f"\nAn unexpected error occurred: {e}")
+
+def ask_continue():
+    """Ask if user wants to perform another calculation."""
+    while True:
+        choice = input("\nWould you like to perform another calculation? (y/n): ").strip().lower()
+        if choice in ['y', 'yes']:
+            return True
+        elif choice in ['n', 'no']:
+            return False
+        else:
+            print("Please enter 'y' for yes or 'n' for no.")
+
+def interactive(backend=None):
+    """Run calculations until the user is done."""
+    while True:
+        main(backend)
+        if not ask_continue():
+            print("\nThank you for using the calculator! Goodbye! 👋")
+            break
+
+if __name__ == "__main__":
+    batch_main()
@@ -1,66 +1,392 @@
-import random
-import string
-
-def generate_password():
-    """
-    Generates a secure password based on user-specified length and complexity.
-    """
-    
-    letters = string.ascii_letters  
-    digits = string.digits          
-    symbols = string.punctuation    
-    while True:
-        try:
-            length = int(input("Enter the desired password length (minimum 8): "))
-            if length >= 8:
-                break
-            else:
-                print("Password length must be at least 8 characters.")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
-
-    
-    include_digits = input("Include digits? (y/n): ").lower() == 'y'
-    include_symbols = input("Include special symbols? (y/n): ").lower() == 'y'
-
-    
-    char_pool = letters
-    if include_digits:
-        char_pool += digits
-    if include_symbols:
-        char_pool += symbols
-
-    
-    password_list = []
-    
-    
-    password_list.append(random.choice(string.ascii_lowercase))
-    password_list.append(random.choice(string.ascii_uppercase))
-
-    if include_digits:
-        password_list.append(random.choice(digits))
-    if include_symbols:
-        password_list.append(random.choice(symbols))
-
-    
-    remaining_length = length - len(password_list)
-    for _ in range(remaining_length):
-        password_list.append(random.choice(char_pool))
-
-    
-    random.shuffle(password_list)
-
-    
-    password = "".join(password_list)
-
-    
-    print("\n" + "="*25)
-    print(" Your Generated Password Is")
-    print("="*25)
-    print(f"->  {password}")
-    print("="*25 + "\n")
-
-
-if __name__ == "__main__":
-
-    generate_password()
+import argparse
+import math
+import os
+import random
+import re
+import secrets
+import shutil
+import stat
+import string
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+MIN_LENGTH = 8
+
+# Random bytes drawn per request to the operating system's CSPRNG
+ENTROPY_CHUNK = 1 << 16
+
+# Passwords per unit of parallel work; fixed so seeded output does not depend on the worker count
+SHARD_SIZE = 100_000
+
+# Characters easily confused with one another when read or typed
+AMBIGUOUS = "Il1|O0o`'\""
+
+# Least share of random draws that must meet a policy; below it rejection sampling is too slow to use
+MIN_ACCEPTANCE = 1e-3
+
+class PasswordPolicy:
+    """What a password must look like, compiled once into lookup tables.
+    
+    ``lowercase``, ``uppercase``, ``digits`` and ``symbols`` are the least
+    number of characters of each class a password must contain; None
+    leaves the class out altogether. ``symbol_set`` is the symbols allowed,
+    ``exclude`` lists characters never to use (``exclude_ambiguous`` adds
+    AMBIGUOUS) and ``max_repeat`` caps how many times in a row the same
+    character may appear. Raises ValueError for a policy no password meets.
+    """
+    
+    __slots__ = ('length', 'classes', 'minimums', 'max_repeat', 'pool', 'table', 'rejected', 'pattern',
+                 '_entropy')
+    
+    def __init__(self, length=16, lowercase=1, uppercase=1, digits=1, symbols=1, symbol_set=string.punctuation,
+                 exclude="", exclude_ambiguous=False, max_repeat=None):
+        if length < 1:
+            raise ValueError("A password must be at least 1 character long")
+        excluded = set(exclude) | (set(AMBIGUOUS) if exclude_ambiguous else set())
+        classes = []
+        minimums = []
+        for name, chars, minimum in (("lowercase letters", string.ascii_lowercase, lowercase),
+                                     ("uppercase letters", string.ascii_uppercase, uppercase),
+                                     ("digits", string.digits, digits), ("symbols", symbol_set, symbols)):
+            if minimum is None:
+                continue
+            if minimum < 0:
+                raise ValueError(f"The least number of {name} cannot be negative")
+            chars = "".join(sorted(set(chars) - excluded - set("".join(classes))))
+            if not chars.isascii() or not chars.isprintable():
+                raise ValueError(f"Only printable ASCII characters can be used, not those in {name}")
+            if not chars:
+                if minimum:
+                    raise ValueError(f"No {name} are left to use")
+                continue
+            classes.append(chars)
+            minimums.append(minimum)
+        if not classes:
+            raise ValueError("The policy leaves no characters to use")
+        if sum(minimums) > length:
+            raise ValueError(f"A password of {length} characters cannot hold the {sum(minimums)} required ones")
+        if max_repeat is not None and max_repeat < 1:
+            raise ValueError("max_repeat must be at least 1")
+        self.length = length
+        self.classes = tuple(classes)
+        self.minimums = tuple(minimums)
+        self.max_repeat = max_repeat
+        self.pool = "".join(classes).encode("ascii")
+        # Byte -> pool character for the bytes below the largest multiple of the pool size;
+        # the rest are deleted, so every character is equally likely
+        self.table = bytes(self.pool[byte % len(self.pool)] for byte in range(256))
+        self.rejected = bytes(range(256 - 256 % len(self.pool), 256))
+        # The whole policy as one regex: a lookahead per class minimum, one against long runs of a
+        # character, then exactly ``length`` characters from the pool
+        rules = [b"(?=(?:[^%s]*[%s]){%d})" % (escaped, escaped, minimum)
+                 for escaped, minimum in ((re.escape(chars.encode("ascii")), minimum)
+                                          for chars, minimum in zip(classes, minimums)) if minimum]
+        if max_repeat is not None:
+            rules.append(b"(?!.*?(.)\\1{%d})" % max_repeat)
+        rules.append(b"[%s]{%d}\\Z" % (re.escape(self.pool), length))
+        self.pattern = re.compile(b"".join(rules), re.DOTALL)
+        self._entropy = None
+        if max_repeat is not None and len(self.pool) == 1 and length > max_repeat:
+            raise ValueError("A single character cannot be repeated that often")
+    
+    def check(self, password):
+        """True if a password (str or ASCII bytes) meets the policy, checked with one regex match."""
+        if isinstance(password, str):
+            if not password.isascii():
+                return False
+            password = password.encode("ascii")
+        return self.pattern.match(password) is not None
+    
+    def count_passwords(self):
+        """The number of different passwords the policy allows.
+        
+        Counted exactly by dynamic programming over the positions, tracking
+        the characters seen per class (capped at the class minimum) and,
+        with ``max_repeat``, the class of the last character and its run.
+        """
+        sizes = [len(chars) for chars in self.classes]
+        minimums = self.minimums
+        runs = self.max_repeat is not None
+        states = {((0,) * len(sizes), -1, 0): 1}
+        for _ in range(self.length):
+            following = defaultdict(int)
+            for (counts, previous, run), ways in states.items():
+                for index, size in enumerate(sizes):
+                    if counts[index] < minimums[index]:
+                        seen = counts[:index] + (counts[index] + 1,) + counts[index + 1:]
+                    else:
+                        seen = counts
+                    if not runs:
+                        following[seen, -1, 0] += ways * size
+                        continue
+                    if index == previous:
+                        if run < self.max_repeat:
+                            following[seen, index, run + 1] += ways  # the same character again
+                        size -= 1
+                    if size:
+                        following[seen, index, 1] += ways * size
+            states = following
+        return sum(ways for (counts, _, _), ways in states.items() if counts == minimums)
+    
+    @property
+    def entropy(self):
+        """Bits of entropy of a password drawn uniformly from all the policy allows."""
+        if self._entropy is None:
+            self._entropy = math.log2(self.count_passwords())
+        return self._entropy
+    
+    @property
+    def acceptance(self):
+        """The share of passwords drawn uniformly from the whole pool that meet the policy."""
+        return 2 ** (self.entropy - self.length * math.log2(len(self.pool)))
+    
+    def report(self):
+        """A short description of the policy's character pool and entropy."""
+        per_character = math.log2(len(self.pool))
+        lines = [f"{self.length} characters from a pool of {len(self.pool)}"
+                 f" ({per_character:.2f} bits per character)"]
+        for chars, minimum in zip(self.classes, self.minimums):
+            lines.append(f"  at least {minimum} of {chars}")
+        if self.max_repeat is not None:
+            lines.append(f"  at most {self.max_repeat} of the same character in a row")
+        lines.append(f"Entropy: {self.entropy:.1f} bits"
+                     f" ({self.length * per_character - self.entropy:.2f} bits lost to the rules,"
+                     f" {self.acceptance:.1%} of random draws accepted)")
+        return "\n".join(lines)
+
+DEFAULT_POLICY = PasswordPolicy()
+
+def check_acceptance(policy):
+    """Raises ValueError if too few random draws meet the policy to generate passwords for it."""
+    if policy.acceptance < MIN_ACCEPTANCE:
+        raise ValueError(f"Only {policy.acceptance:.2g} of random passwords meet this policy, too few to draw"
+                         f" them; lower the class minimums or lengthen the password")
+
+def iter_password_batches(count, policy=None, random_bytes=None):
+    """Yields lists of passwords, as ASCII bytes, until ``count`` passwords have been made.
+    
+    Entropy comes from the operating system's CSPRNG in large chunks, mapped
+    to the policy's character pool with one bytes.translate() call per
+    chunk (see PasswordPolicy). Passwords that break the policy are
+    rejected as a whole, which keeps the valid ones uniformly likely; a
+    policy too few draws meet raises ValueError (see check_acceptance).
+    ``random_bytes(n)`` replaces the CSPRNG, for reproducible test output.
+    """
+    policy = policy or DEFAULT_POLICY
+    check_acceptance(policy)
+    length = policy.length
+    table = policy.table
+    rejected = policy.rejected
+    check = policy.pattern.match
+    random_bytes = random_bytes or secrets.token_bytes
+    carry = b""
+    while count > 0:
+        chars = carry + random_bytes(ENTROPY_CHUNK).translate(table, rejected)
+        usable = len(chars) - len(chars) % length
+        carry = chars[usable:]
+        batch = [password for password in (chars[i:i + length] for i in range(0, usable, length))
+                 if check(password)][:count]
+        count -= len(batch)
+        yield batch
+
+def generate_passwords(count, policy=None):
+    """Returns ``count`` random passwords that meet the policy."""
+    return [password.decode("ascii") for batch in iter_password_batches(count, policy) for password in batch]
+
+def write_passwords(f, count, policy=None, random_bytes=None):
+    """Writes ``count`` passwords, one per line, to a binary file as they are made; returns the count."""
+    for batch in iter_password_batches(count, policy, random_bytes):
+        if batch:
+            f.write(b"\n".join(batch) + b"\n")
+    return count
+
+def open_private(path):
+    """Opens a file for writing that only its owner can read, as it will hold credentials."""
+    return os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb")
+
+def _write_shard(task):
+    """Worker: writes one shard of passwords to its own file and returns the file name."""
+    index, count, policy, seed, path = task
+    # Seeded shards draw from their own stream, so a shard's output does not depend on who makes it
+    random_bytes = random.Random(f"{seed}/{index}").randbytes if seed is not None else None
+    with open_private(path) as f:
+        write_passwords(f, count, policy, random_bytes)
+    return path
+
+def _shard_directory(f):
+    """The directory of the file ``f`` writes to, or None (the default temp dir) if it is not a named file.
+    
+    Names such as '<stdout>' are not paths, so the name must lead to the
+    very regular file ``f`` has open.
+    """
+    name = getattr(f, "name", None)
+    try:
+        status = os.fstat(f.fileno())
+        if isinstance(name, str) and stat.S_ISREG(status.st_mode) and os.path.samestat(os.stat(name), status):
+            return os.path.dirname(os.path.abspath(name))
+    except (OSError, ValueError):
+        pass
+    return None
+
+def write_passwords_parallel(f, count, policy=None, workers=None, seed=None, shard_size=SHARD_SIZE):
+    """Writes ``count`` passwords to a binary file, generated by a pool of worker processes.
+    
+    The count is split into shards of ``shard_size`` passwords. Each worker
+    writes its shard to a private temporary file, and the shards are copied
+    into ``f`` in order as they complete, so the parent never holds more
+    than a copy buffer. With a ``seed`` the output is reproducible and the
+    same for any number of workers; seeded passwords come from a
+    non-cryptographic generator and are for tests only. ``workers``
+    defaults to the number of CPUs. Returns the count.
+    """
+    # Checked here so the workers get the policy with its entropy already counted
+    check_acceptance(policy or DEFAULT_POLICY)
+    if count <= 0:
+        return 0
+    workers = workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory(dir=_shard_directory(f)) as shards_dir:
+        tasks = [(index, min(shard_size, count - start), policy, seed, os.path.join(shards_dir, f"{index}.part"))
+                 for index, start in enumerate(range(0, count, shard_size))]
+        if workers == 1 or len(tasks) == 1:
+            paths = map(_write_shard, tasks)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(min(workers, len(tasks)))
+            paths = pool.map(_write_shard, tasks)
+        try:
+            for path in paths:
+                with open(path, "rb") as shard:
+                    shutil.copyfileobj(shard, f)
+                os.remove(path)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+    return count
+
+def benchmark_scaling(count=2_000_000, length=16):
+    """Reports throughput, speedup and parallel efficiency for 1 up to the CPU count of workers."""
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, cpus, *(2 ** i for i in range(1, cpus.bit_length()) if 2 ** i < cpus)})
+    policy = PasswordPolicy(length)
+    print(f"{count:,} passwords of length {length} on {cpus} CPUs")
+    baseline = None
+    with open(os.devnull, "wb") as f:
+        for workers in counts:
+            start = time.perf_counter()
+            write_passwords_parallel(f, count, policy, workers=workers)
+            rate = count / (time.perf_counter() - start)
+            baseline = baseline or rate
+            print(f"  {workers:>3} workers {rate:>12,.0f} passwords/s  speedup {rate / baseline:5.2f}x"
+                  f"  efficiency {rate / baseline / workers:6.1%}")
+
+def benchmark(count=200_000, length=16):
+    """Compares bulk generation with one secrets.choice() call per character."""
+    policy = PasswordPolicy(length)
+    pool = policy.pool.decode("ascii")
+    start = time.perf_counter()
+    for _ in range(count // 10):
+        "".join(secrets.choice(pool) for _ in range(length))
+    per_char = count // 10 / (time.perf_counter() - start)
+    start = time.perf_counter()
+    with open(os.devnull, "wb") as f:
+        write_passwords(f, count, policy)
+    bulk = count / (time.perf_counter() - start)
+    print(f"secrets.choice per character: {per_char:>12,.0f} passwords/s")
+    print(f"bulk rejection sampling:      {bulk:>12,.0f} passwords/s ({bulk / per_char:.0f}x)")
+
+def generate_password():
+    """
+    Generates a secure password based on user-specified length and complexity.
+    """
+    
+    while True:
+        try:
+            length = int(input("Enter the desired password length (minimum 8): "))
+            if length >= 8:
+                break
+            else:
+                print("Password length must be at least 8 characters.")
+        except ValueError:
+            print("Invalid input. Please enter a number.")
+
+    
+    include_digits = input("Include digits? (y/n): ").lower() == 'y'
+    include_symbols = input("Include special symbols? (y/n): ").lower() == 'y'
+
+    
+    policy = PasswordPolicy(length, digits=1 if include_digits else None, symbols=1 if include_symbols else None)
+    password = generate_passwords(1, policy)[0]
+
+    
+    print("\n" + "="*25)
+    print(" Your Generated Password Is")
+    print("="*25)
+    print(f"->  {password}")
+    print("="*25)
+    print(f"Entropy: {policy.entropy:.1f} bits\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Password generator; interactive when no count is given")
+    parser.add_argument("--count", type=int, help="number of passwords to generate")
+    parser.add_argument("--length", type=int, default=16, help="characters per password (default 16)")
+    parser.add_argument("--no-digits", action="store_true", help="leave digits out")
+    parser.add_argument("--no-symbols", action="store_true", help="leave special symbols out")
+    parser.add_argument("--min-lowercase", type=int, default=1, help="least number of lowercase letters")
+    parser.add_argument("--min-uppercase", type=int, default=1, help="least number of uppercase letters")
+    parser.add_argument("--min-digits", type=int, default=1, help="least number of digits")
+    parser.add_argument("--min-symbols", type=int, default=1, help="least number of special symbols")
+    parser.add_argument("--symbol-set", default=string.punctuation, help="special symbols to choose from")
+    parser.add_argument("--exclude", default="", help="characters never to use")
+    parser.add_argument("--no-ambiguous", action="store_true", help=f"leave out look-alikes such as {AMBIGUOUS}")
+    parser.add_argument("--max-repeat", type=int, help="most times the same character may appear in a row")
+    parser.add_argument("--entropy", action="store_true", help="describe the policy and its entropy and exit")
+    parser.add_argument("--output", default="-", help="file to write the passwords to (default stdout)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: number of CPUs)")
+    parser.add_argument("--seed", help="reproducible output for testing; NOT for real credentials")
+    parser.add_argument("--benchmark", action="store_true", help="measure passwords per second and exit")
+    parser.add_argument("--benchmark-scaling", action="store_true",
+                        help="measure parallel speedup against the number of workers and exit")
+    args = parser.parse_args(argv)
+    if args.benchmark:
+        benchmark()
+        return
+    if args.benchmark_scaling:
+        benchmark_scaling()
+        return
+    if args.count is None and not args.entropy:
+        generate_password()
+        return
+    if args.length < MIN_LENGTH:
+        parser.error(f"Password length must be at least {MIN_LENGTH} characters.")
+    if args.count is not None and args.count < 0:
+        parser.error("--count cannot be negative")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    try:
+        policy = PasswordPolicy(args.length, args.min_lowercase, args.min_uppercase,
+                                None if args.no_digits else args.min_digits,
+                                None if args.no_symbols else args.min_symbols,
+                                args.symbol_set, args.exclude, args.no_ambiguous, args.max_repeat)
+        if not args.entropy:
+            check_acceptance(policy)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.entropy:
+        print(policy.report())
+        return
+    options = (args.count, policy, args.workers, args.seed)
+    if args.output == "-":
+        write_passwords_parallel(sys.stdout.buffer, *options)
+        sys.stdout.buffer.flush()
+    else:
+        with open_private(args.output) as f:
+            write_passwords_parallel(f, *options)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -1,99 +1,428 @@
-#Rock-Paper-Scissors Game
-
-
-import random
-
-
-VALID_CHOICES = {"rock": "r", "paper": "p", "scissors": "s", "r": "r", "p": "p", "s": "s"}
-CHOICE_NAMES = {"r": "rock", "p": "paper", "s": "scissors"}
-
-
-OUTCOME = {
-	("r", "s"): 1,
-	("s", "p"): 1,
-	("p", "r"): 1,
-	("s", "r"): -1,
-	("p", "s"): -1,
-	("r", "p"): -1,
-}
-
-
-def get_player_choice() -> str:
-	"""Prompt user for rock/paper/scissors. Returns canonical short code: r/p/s."""
-	while True:
-		user_input = input("Choose rock, paper, or scissors (r/p/s): ").strip().lower()
-		if user_input in VALID_CHOICES:
-			return VALID_CHOICES[user_input]
-		print("Invalid choice. Please enter rock, paper, scissors, or r/p/s.")
-
-
-def get_computer_choice() -> str:
-	"""Randomly choose r/p/s for the computer."""
-	return random.choice(["r", "p", "s"])
-
-
-def determine_result(player: str, computer: str) -> int:
-	"""Return 1 if player wins, 0 if tie, -1 if player loses."""
-	if player == computer:
-		return 0
-	return OUTCOME.get((player, computer), -OUTCOME.get((computer, player), 0))
-
-
-def display_round(player: str, computer: str, result: int) -> None:
-	print(f"You chose: {CHOICE_NAMES[player]}")
-	print(f"Computer chose: {CHOICE_NAMES[computer]}")
-	if result == 1:
-		print("Result: You win! 🎉")
-	elif result == -1:
-		print("Result: You lose.  TRY THE BETTER LUCK NEXT TIME 👎!")
-	else:
-		print("Result: It's a tie. 😐")
-
-
-def ask_play_again() -> bool:
-	while True:
-		answer = input("Play again? (y/n): ").strip().lower()
-		if answer in ("y", "yes"):
-			return True
-		if answer in ("n", "no"):
-			return False
-		print("Please answer with y/yes or n/no.")
-
-
-def play_game() -> None:
-	print("=== Rock • Paper • Scissors ===")
-	print("Instructions: Type rock, paper, or scissors (or r/p/s). First to 5 wins optional; just keep playing as you like.")
-	player_score = 0
-	computer_score = 0
-	round_number = 1
-	while True:
-		print(f"\n-- Round {round_number} --")
-		player = get_player_choice()
-		computer = get_computer_choice()
-		result = determine_result(player, computer)
-		display_round(player, computer, result)
-
-		if result == 1:
-			player_score += 1
-		elif result == -1:
-			computer_score += 1
-
-		print(f"Score — You: {player_score} | Computer: {computer_score}")
-
-		if not ask_play_again():
-			print("\nThanks for playing! Final Score:")
-			print(f"You: {player_score} | Computer: {computer_score}")
-			if player_score > computer_score:
-				print("Overall: You win the session! 🏆")
-			elif player_score < computer_score:
-				print("Overall: Computer wins the session. 🤖")
-			else:
-				print("Overall: It's a draw.")
-			break
-
-		round_number += 1
-
-
-if __name__ == "__main__":
-
-	play_game() 
+#Rock-Paper-Scissors Game
+
+
+import argparse
+import random
+import time
+
+try:
+	import numpy as np
+except ImportError:  # simulations combine whole chunks with big-integer arithmetic instead
+	np = None
+
+
+VALID_CHOICES = {"rock": "r", "paper": "p", "scissors": "s", "r": "r", "p": "p", "s": "s"}
+CHOICE_NAMES = {"r": "rock", "p": "paper", "s": "scissors"}
+
+# Choices as small ints: each one beats the one before it, cyclically
+ROCK, PAPER, SCISSORS = 0, 1, 2
+CHOICE_CODES = "rps"
+CHOICE_INDEX = {code: index for index, code in enumerate(CHOICE_CODES)}
+
+# Result for the first player, indexed by first * 3 + second: 1 win, 0 tie, -1 loss
+RESULT_TABLE = tuple((1, 0, -1)[(second - first + 1) % 3] for first in range(3) for second in range(3))
+
+
+def get_player_choice() -> str:
+	"""Prompt user for rock/paper/scissors. Returns canonical short code: r/p/s."""
+	while True:
+		user_input = input("Choose rock, paper, or scissors (r/p/s): ").strip().lower()
+		if user_input in VALID_CHOICES:
+			return VALID_CHOICES[user_input]
+		print("Invalid choice. Please enter rock, paper, scissors, or r/p/s.")
+
+
+def get_computer_choice(strategy=None, rng=random) -> str:
+	"""Choose r/p/s for the computer: at random, or with a Strategy."""
+	if strategy is None:
+		return random.choice(["r", "p", "s"])
+	return CHOICE_CODES[strategy.choose(rng)]
+
+
+def determine_result(player: str, computer: str) -> int:
+	"""Return 1 if player wins, 0 if tie, -1 if player loses."""
+	return RESULT_TABLE[CHOICE_INDEX[player] * 3 + CHOICE_INDEX[computer]]
+
+
+# Rounds simulated per batch, which bounds the memory a simulation needs
+SIMULATION_CHUNK = 1 << 20
+
+# Byte value of a first player's choice times three, so adding the second's gives the pair index
+_TIMES_THREE = bytes((byte * 3) % 256 for byte in range(256))
+
+
+class Strategy:
+	"""A way of choosing moves, encoded as ROCK, PAPER or SCISSORS.
+
+	Strategies that ignore the game so far implement ``moves`` and are
+	simulated a chunk at a time. Adaptive ones set ``adaptive``, implement
+	``choose`` and learn from each round through ``observe``; they are
+	simulated round by round.
+	"""
+
+	name = "strategy"
+	adaptive = False
+
+	def moves(self, count: int, rng: random.Random) -> bytes:
+		"""Return ``count`` moves, one byte each."""
+		raise NotImplementedError
+
+	def choose(self, rng: random.Random) -> int:
+		"""Return the next move."""
+		return self.moves(1, rng)[0]
+
+	def observe(self, own: int, opponent: int) -> None:
+		"""Learn from a round in which this strategy played ``own`` against ``opponent``."""
+
+
+class RandomStrategy(Strategy):
+	"""Random moves, uniform or weighted.
+
+	Random bytes map to moves through a 256-entry table in which each
+	move fills a share of 255 slots proportional to its weight; byte 255
+	is dropped so equal weights are exactly uniform. Weights are
+	therefore honoured to within 1/255.
+	"""
+
+	def __init__(self, weights: tuple = (1, 1, 1)) -> None:
+		if len(weights) != 3 or min(weights) < 0 or not sum(weights):
+			raise ValueError("Give three non-negative weights for rock, paper and scissors")
+		self.name = "random" if len(set(weights)) == 1 else "random:" + ",".join(f"{weight:g}" for weight in weights)
+		shares = [weight * 255 / sum(weights) for weight in weights]
+		slots = [int(share) for share in shares]
+		# Largest remainders get the slots lost to rounding down
+		for index in sorted(range(3), key=lambda i: slots[i] - shares[i])[:255 - sum(slots)]:
+			slots[index] += 1
+		self.table = bytes([ROCK] * slots[0] + [PAPER] * slots[1] + [SCISSORS] * slots[2] + [0])
+		self.dropped = bytes([255])
+
+	def moves(self, count: int, rng: random.Random) -> bytes:
+		moves = b""
+		while len(moves) < count:
+			moves += rng.randbytes(count - len(moves) + 16).translate(self.table, self.dropped)
+		return moves[:count]
+
+
+class ConstantStrategy(Strategy):
+	"""The same move every round."""
+
+	def __init__(self, move: int) -> None:
+		self.move = move
+		self.name = CHOICE_NAMES[CHOICE_CODES[move]]
+
+	def moves(self, count: int, rng: random.Random) -> bytes:
+		return bytes([self.move]) * count
+
+
+class CycleStrategy(Strategy):
+	"""A fixed sequence of moves, repeated."""
+
+	def __init__(self, sequence: str) -> None:
+		if not sequence or any(code not in CHOICE_INDEX for code in sequence):
+			raise ValueError("A cycle is a sequence of r, p and s")
+		self.sequence = bytes(CHOICE_INDEX[code] for code in sequence)
+		self.name = "cycle:" + sequence
+		self.position = 0
+
+	def moves(self, count: int, rng: random.Random) -> bytes:
+		period = len(self.sequence)
+		repeated = self.sequence * ((self.position + count) // period + 1)
+		moves = repeated[self.position:self.position + count]
+		self.position = (self.position + count) % period
+		return moves
+
+
+def _counter(counts: list, offset: int, rng: random.Random) -> int:
+	"""The move beating the likeliest of the three moves counted at ``offset``; ties are broken at random."""
+	rock, paper, scissors = counts[offset:offset + 3]
+	if rock > paper and rock > scissors:
+		return PAPER
+	if paper > rock and paper > scissors:
+		return SCISSORS
+	if scissors > rock and scissors > paper:
+		return ROCK
+	best = max(rock, paper, scissors)
+	likeliest = [move for move, count in enumerate((rock, paper, scissors)) if count == best]
+	predicted = likeliest[0] if len(likeliest) == 1 else rng.choice(likeliest)
+	return (predicted + 1) % 3
+
+
+class FrequencyStrategy(Strategy):
+	"""Beats the opponent's most frequent move, over all rounds or the last ``window``.
+
+	A count table holds how often each move was played; with a window, a
+	ring buffer of the last moves lets the one leaving it be subtracted, so
+	every update is O(1).
+	"""
+
+	adaptive = True
+
+	def __init__(self, window=None) -> None:
+		if window is not None and window < 1:
+			raise ValueError("The window must hold at least one round")
+		self.name = "frequency" if window is None else f"frequency:{window}"
+		self.counts = [0, 0, 0]
+		self.window = window
+		self.history = bytearray(window or 0)
+		self.seen = 0
+
+	def choose(self, rng: random.Random) -> int:
+		return _counter(self.counts, 0, rng)
+
+	def observe(self, own: int, opponent: int) -> None:
+		if self.window is not None:
+			slot = self.seen % self.window
+			if self.seen >= self.window:
+				self.counts[self.history[slot]] -= 1
+			self.history[slot] = opponent
+		self.counts[opponent] += 1
+		self.seen += 1
+
+
+class MarkovStrategy(Strategy):
+	"""Beats the move the opponent most often played after their last ``order`` moves.
+
+	The last ``order`` moves are kept as one base-3 number, updated by a
+	multiply and a modulo, and index a flat table of 3 ** order rows of
+	next-move counts. With a window, a ring buffer of the table cells
+	counted lately lets the oldest be subtracted again, which keeps
+	updates O(1) and lets the model follow an opponent who changes style.
+	"""
+
+	adaptive = True
+
+	def __init__(self, order: int = 1, window=None) -> None:
+		if order < 1:
+			raise ValueError("The order must be at least 1")
+		if window is not None and window < 1:
+			raise ValueError("The window must hold at least one round")
+		self.name = f"markov:{order}" if window is None else f"markov:{order},{window}"
+		self.order = order
+		self.contexts = 3 ** order
+		self.counts = [0] * (self.contexts * 3)
+		self.context = 0
+		self.window = window
+		self.history = [0] * (window or 0)
+		self.seen = 0
+
+	def choose(self, rng: random.Random) -> int:
+		if self.seen < self.order:
+			return rng.randrange(3)
+		return _counter(self.counts, self.context * 3, rng)
+
+	def observe(self, own: int, opponent: int) -> None:
+		if self.seen >= self.order:
+			cell = self.context * 3 + opponent
+			if self.window is not None:
+				counted = self.seen - self.order
+				slot = counted % self.window
+				if counted >= self.window:
+					self.counts[self.history[slot]] -= 1
+				self.history[slot] = cell
+			self.counts[cell] += 1
+		self.context = (self.context * 3 + opponent) % self.contexts
+		self.seen += 1
+
+
+class EnsembleStrategy(Strategy):
+	"""Plays the suggestion of whichever member strategy has lately done best.
+
+	Every member suggests a move each round and is scored as if it had
+	played it: +1 for a win, -1 for a loss, with older rounds fading by
+	``decay``. Updates cost O(1) per member.
+	"""
+
+	adaptive = True
+
+	def __init__(self, members=None, decay: float = 0.9) -> None:
+		self.members = list(members) if members else [
+			FrequencyStrategy(), FrequencyStrategy(20), MarkovStrategy(1), MarkovStrategy(2), MarkovStrategy(3)]
+		self.name = "ensemble"
+		self.decay = decay
+		self.scores = [0.0] * len(self.members)
+		self.suggestions = [0] * len(self.members)
+
+	def choose(self, rng: random.Random) -> int:
+		self.suggestions = [member.choose(rng) for member in self.members]
+		scores = self.scores
+		return self.suggestions[scores.index(max(scores))]
+
+	def observe(self, own: int, opponent: int) -> None:
+		decay = self.decay
+		for index, (member, suggestion) in enumerate(zip(self.members, self.suggestions)):
+			self.scores[index] = self.scores[index] * decay + RESULT_TABLE[suggestion * 3 + opponent]
+			member.observe(suggestion, opponent)
+
+
+def parse_strategy(spec: str) -> Strategy:
+	"""Build a strategy from a spec.
+
+	Specs are 'random', 'random:5,3,2', 'rock' (or r/p/s...), 'cycle:rps',
+	'frequency[:WINDOW]', 'markov[:ORDER[,WINDOW]]' or 'ensemble'.
+	"""
+	name, _, argument = spec.strip().lower().partition(":")
+	if name in ("frequency", "markov", "ensemble"):
+		try:
+			numbers = [int(number) for number in argument.split(",")] if argument else []
+		except ValueError:
+			raise ValueError(f"Invalid numbers in strategy '{spec}'") from None
+		if name == "frequency" and len(numbers) <= 1:
+			return FrequencyStrategy(*numbers)
+		if name == "markov" and len(numbers) <= 2:
+			return MarkovStrategy(*numbers)
+		if name == "ensemble" and not numbers:
+			return EnsembleStrategy()
+		raise ValueError(f"Too many numbers in strategy '{spec}'")
+	if name == "random":
+		try:
+			return RandomStrategy(tuple(float(weight) for weight in argument.split(",")) if argument else (1, 1, 1))
+		except ValueError:
+			raise ValueError(f"Invalid weights in strategy '{spec}'") from None
+	if name == "cycle":
+		return CycleStrategy(argument)
+	if name in VALID_CHOICES and not argument:
+		return ConstantStrategy(CHOICE_INDEX[VALID_CHOICES[name]])
+	raise ValueError(f"Unknown strategy '{spec}'")
+
+
+def count_pairs(first: bytes, second: bytes) -> list:
+	"""Count how often each (first, second) pair of moves occurs, indexed by first * 3 + second."""
+	if np is not None:
+		pairs = np.frombuffer(first, dtype=np.uint8) * 3 + np.frombuffer(second, dtype=np.uint8)
+		return np.bincount(pairs, minlength=9).tolist()
+	# One byte per round never carries into the next, so a single big-integer addition
+	# computes first * 3 + second for every round at once
+	pairs = (int.from_bytes(first.translate(_TIMES_THREE), "big") + int.from_bytes(second, "big")).to_bytes(
+		len(first), "big")
+	return [pairs.count(pair) for pair in range(9)]
+
+
+def simulate(player: Strategy, computer: Strategy, rounds: int, seed=None) -> dict:
+	"""Play ``rounds`` rounds between two strategies without any I/O.
+
+	Moves are drawn a chunk at a time and scored through RESULT_TABLE, so
+	no Python code runs per round, unless a strategy is adaptive; then the
+	rounds are played one at a time, each strategy observing the last.
+	Returns the player's wins, losses and ties.
+	"""
+	rng = random.Random(seed)
+	totals = [0] * 9
+	remaining = rounds
+	while remaining > 0:
+		count = min(remaining, SIMULATION_CHUNK)
+		if player.adaptive or computer.adaptive:
+			_play_rounds(player, computer, count, rng, totals)
+		else:
+			for pair, occurrences in enumerate(count_pairs(player.moves(count, rng), computer.moves(count, rng))):
+				totals[pair] += occurrences
+		remaining -= count
+	tally = {1: 0, 0: 0, -1: 0}
+	for pair, occurrences in enumerate(totals):
+		tally[RESULT_TABLE[pair]] += occurrences
+	return {"wins": tally[1], "losses": tally[-1], "ties": tally[0]}
+
+
+def _play_rounds(player: Strategy, computer: Strategy, count: int, rng: random.Random, totals: list) -> None:
+	"""Play ``count`` rounds one at a time, adding each (player, computer) pair to ``totals``."""
+	# A side that does not adapt still draws its moves a chunk at a time
+	player_moves = None if player.adaptive else player.moves(count, rng)
+	computer_moves = None if computer.adaptive else computer.moves(count, rng)
+	for round_index in range(count):
+		first = player.choose(rng) if player_moves is None else player_moves[round_index]
+		second = computer.choose(rng) if computer_moves is None else computer_moves[round_index]
+		totals[first * 3 + second] += 1
+		player.observe(first, second)
+		computer.observe(second, first)
+
+
+def report_simulation(player: Strategy, computer: Strategy, rounds: int, seed=None) -> None:
+	start = time.perf_counter()
+	result = simulate(player, computer, rounds, seed)
+	elapsed = time.perf_counter() - start
+	backend = "numpy" if np is not None else "big integers"
+	print(f"{player.name} vs {computer.name}: {rounds:,} rounds in {elapsed:.3f}s"
+		f" ({rounds / max(elapsed, 1e-9):,.0f} rounds/s using {backend})")
+	for outcome in ("wins", "losses", "ties"):
+		print(f"  {outcome:<7}{result[outcome]:>12,} ({result[outcome] / max(rounds, 1):.2%})")
+
+
+def display_round(player: str, computer: str, result: int) -> None:
+	print(f"You chose: {CHOICE_NAMES[player]}")
+	print(f"Computer chose: {CHOICE_NAMES[computer]}")
+	if result == 1:
+		print("Result: You win! 🎉")
+	elif result == -1:
+		print("Result: You lose.  TRY THE BETTER LUCK NEXT TIME 👎!")
+	else:
+		print("Result: It's a tie. 😐")
+
+
+def ask_play_again() -> bool:
+	while True:
+		answer = input("Play again? (y/n): ").strip().lower()
+		if answer in ("y", "yes"):
+			return True
+		if answer in ("n", "no"):
+			return False
+		print("Please answer with y/yes or n/no.")
+
+
+def play_game(strategy=None) -> None:
+	print("=== Rock • Paper • Scissors ===")
+	print("Instructions: Type rock, paper, or scissors (or r/p/s). First to 5 wins optional; just keep playing as you like.")
+	player_score = 0
+	computer_score = 0
+	round_number = 1
+	while True:
+		print(f"\n-- Round {round_number} --")
+		player = get_player_choice()
+		computer = get_computer_choice(strategy)
+		result = determine_result(player, computer)
+		if strategy is not None:
+			strategy.observe(CHOICE_INDEX[computer], CHOICE_INDEX[player])
+		display_round(player, computer, result)
+
+		if result == 1:
+			player_score += 1
+		elif result == -1:
+			computer_score += 1
+
+		print(f"Score — You: {player_score} | Computer: {computer_score}")
+
+		if not ask_play_again():
+			print("\nThanks for playing! Final Score:")
+			print(f"You: {player_score} | Computer: {computer_score}")
+			if player_score > computer_score:
+				print("Overall: You win the session! 🏆")
+			elif player_score < computer_score:
+				print("Overall: Computer wins the session. 🤖")
+			else:
+				print("Overall: It's a draw.")
+			break
+
+		round_number += 1
+
+
+def main(argv=None) -> None:
+	parser = argparse.ArgumentParser(description="Rock-Paper-Scissors; interactive unless --simulate is given")
+	parser.add_argument("--simulate", type=int, metavar="ROUNDS", help="play ROUNDS rounds between two strategies")
+	parser.add_argument("--player", default="random", help=(
+		"player strategy: random, random:5,3,2, rock, cycle:rps, frequency[:WINDOW], markov[:ORDER[,WINDOW]]"
+		" or ensemble"))
+	parser.add_argument("--computer", default="random",
+		help="computer strategy (same forms as --player); used in interactive games too")
+	parser.add_argument("--seed", type=int, help="seed for a reproducible simulation")
+	args = parser.parse_args(argv)
+	try:
+		player, computer = parse_strategy(args.player), parse_strategy(args.computer)
+	except ValueError as e:
+		parser.error(str(e))
+	if args.simulate is None:
+		play_game(None if args.computer == "random" else computer)
+		return
+	report_simulation(player, computer, args.simulate, args.seed)
+
+
+if __name__ == "__main__":
+
+	main()
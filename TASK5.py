@@ -1,482 +1,3084 @@
-import json
-import os
-import re
-from datetime import datetime
-from typing import List, Dict, Optional
-
-class Contact:
-    """Represents a single contact with all necessary information."""
-    
-    def __init__(self, name: str, phone: str, email: str = "", address: str = ""):
-        self.id = self._generate_id()
-        self.name = name.strip()
-        self.phone = phone.strip()
-        self.email = email.strip()
-        self.address = address.strip()
-        self.created_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.updated_date = self.created_date
-    
-    def _generate_id(self) -> int:
-        """Generate a unique ID for the contact."""
-        return int(datetime.now().timestamp() * 1000) % 100000
-    
-    def to_dict(self) -> Dict:
-        """Convert contact to dictionary for JSON serialization."""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'phone': self.phone,
-            'email': self.email,
-            'address': self.address,
-            'created_date': self.created_date,
-            'updated_date': self.updated_date
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict) -> 'Contact':
-        """Create contact from dictionary."""
-        contact = cls(data['name'], data['phone'], data['email'], data['address'])
-        contact.id = data['id']
-        contact.created_date = data['created_date']
-        contact.updated_date = data['updated_date']
-        return contact
-    
-    def update_details(self, name: str = None, phone: str = None, email: str = None, address: str = None):
-        """Update contact details and timestamp."""
-        if name is not None:
-            self.name = name.strip()
-        if phone is not None:
-            self.phone = phone.strip()
-        if email is not None:
-            self.email = email.strip()
-        if address is not None:
-            self.address = address.strip()
-        self.updated_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    def __str__(self) -> str:
-        """String representation of the contact."""
-        return f"""
-ID: {self.id}
-Name: {self.name}
-Phone: {self.phone}
-Email: {self.email if self.email else 'Not provided'}
-Address: {self.address if self.address else 'Not provided'}
-Created: {self.created_date}
-Updated: {self.updated_date}
-{'─' * 50}"""
-
-class ContactManager:
-    """Main contact management class with all CRUD operations."""
-    
-    def __init__(self, filename: str = "contacts.json"):
-        self.filename = filename
-        self.contacts: List[Contact] = []
-        self.load_contacts()
-    
-    def add_contact(self, name: str, phone: str, email: str = "", address: str = "") -> Contact:
-        """Add a new contact to the list."""
-        # Validate required fields
-        if not name.strip():
-            raise ValueError("Name cannot be empty")
-        if not phone.strip():
-            raise ValueError("Phone number cannot be empty")
-        
-        # Check for duplicate phone numbers
-        if self.get_contact_by_phone(phone.strip()):
-            raise ValueError("A contact with this phone number already exists")
-        
-        contact = Contact(name, phone, email, address)
-        self.contacts.append(contact)
-        self.save_contacts()
-        return contact
-    
-    def get_contact_by_id(self, contact_id: int) -> Optional[Contact]:
-        """Get a contact by its ID."""
-        for contact in self.contacts:
-            if contact.id == contact_id:
-                return contact
-        return None
-    
-    def get_contact_by_phone(self, phone: str) -> Optional[Contact]:
-        """Get a contact by phone number."""
-        for contact in self.contacts:
-            if contact.phone == phone.strip():
-                return contact
-        return None
-    
-    def search_contacts(self, query: str) -> List[Contact]:
-        """Search contacts by name or phone number."""
-        query = query.strip().lower()
-        results = []
-        
-        for contact in self.contacts:
-            if (query in contact.name.lower() or 
-                query in contact.phone or 
-                query in contact.email.lower() or 
-                query in contact.address.lower()):
-                results.append(contact)
-        
-        return results
-    
-    def update_contact(self, contact_id: int, name: str = None, phone: str = None, 
-                      email: str = None, address: str = None) -> bool:
-        """Update contact details."""
-        contact = self.get_contact_by_id(contact_id)
-        if not contact:
-            return False
-        
-        # Check for duplicate phone if phone is being updated
-        if phone and phone.strip() != contact.phone:
-            existing_contact = self.get_contact_by_phone(phone.strip())
-            if existing_contact and existing_contact.id != contact_id:
-                raise ValueError("A contact with this phone number already exists")
-        
-        contact.update_details(name, phone, email, address)
-        self.save_contacts()
-        return True
-    
-    def delete_contact(self, contact_id: int) -> bool:
-        """Delete a contact from the list."""
-        contact = self.get_contact_by_id(contact_id)
-        if contact:
-            self.contacts.remove(contact)
-            self.save_contacts()
-            return True
-        return False
-    
-    def get_all_contacts(self) -> List[Contact]:
-        """Get all contacts sorted by name."""
-        return sorted(self.contacts, key=lambda x: x.name.lower())
-    
-    def get_contact_count(self) -> int:
-        """Get total number of contacts."""
-        return len(self.contacts)
-    
-    def save_contacts(self):
-        """Save contacts to JSON file."""
-        try:
-            with open(self.filename, 'w') as f:
-                json.dump([contact.to_dict() for contact in self.contacts], f, indent=2)
-        except Exception as e:
-            print(f"Error saving contacts: {e}")
-    
-    def load_contacts(self):
-        """Load contacts from JSON file."""
-        try:
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r') as f:
-                    data = json.load(f)
-                    self.contacts = [Contact.from_dict(contact_data) for contact_data in data]
-        except Exception as e:
-            print(f"Error loading contacts: {e}")
-            self.contacts = []
-
-class ContactApp:
-    """Main application class with user interface."""
-    
-    def __init__(self):
-        self.contact_manager = ContactManager()
-    
-    def display_menu(self):
-        """Display the main menu."""
-        print("\n" + "="*60)
-        print("📞 CONTACT MANAGEMENT SYSTEM")
-        print("="*60)
-        print("1. 👤 Add New Contact")
-        print("2. 📋 View All Contacts")
-        print("3. 🔍 Search Contacts")
-        print("4. ✏️  Update Contact")
-        print("5. 🗑️  Delete Contact")
-        print("6. 📊 Contact Statistics")
-        print("7. 💾 Save Contacts")
-        print("8. ❌ Exit")
-        print("="*60)
-    
-    def validate_phone(self, phone: str) -> bool:
-        """Validate phone number format."""
-        # Remove all non-digit characters for validation
-        digits_only = re.sub(r'\D', '', phone)
-        return len(digits_only) >= 10
-    
-    def validate_email(self, email: str) -> bool:
-        """Validate email format."""
-        if not email:
-            return True  # Email is optional
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
-    
-    def get_contact_input(self) -> Dict[str, str]:
-        """Get contact information from user with validation."""
-        print("\n📝 CONTACT INFORMATION")
-        print("-" * 30)
-        
-        # Get name (required)
-        while True:
-            name = input("Enter contact name: ").strip()
-            if name:
-                break
-            print("❌ Name cannot be empty!")
-        
-        # Get phone (required)
-        while True:
-            phone = input("Enter phone number: ").strip()
-            if phone and self.validate_phone(phone):
-                break
-            print("❌ Please enter a valid phone number (at least 10 digits)!")
-        
-        # Get email (optional)
-        while True:
-            email = input("Enter email address (optional): ").strip()
-            if not email or self.validate_email(email):
-                break
-            print("❌ Please enter a valid email address!")
-        
-        # Get address (optional)
-        address = input("Enter address (optional): ").strip()
-        
-        return {
-            'name': name,
-            'phone': phone,
-            'email': email,
-            'address': address
-        }
-    
-    def add_contact_interactive(self):
-        """Interactive contact addition."""
-        print("\n👤 ADD NEW CONTACT")
-        print("-" * 30)
-        
-        try:
-            contact_data = self.get_contact_input()
-            contact = self.contact_manager.add_contact(**contact_data)
-            print(f"\n✅ Contact added successfully!")
-            print(f"Contact ID: {contact.id}")
-            print(f"Name: {contact.name}")
-            print(f"Phone: {contact.phone}")
-        except ValueError as e:
-            print(f"❌ Error: {e}")
-    
-    def view_all_contacts(self):
-        """Display all contacts."""
-        contacts = self.contact_manager.get_all_contacts()
-        if not contacts:
-            print("\n📭 No contacts found!")
-            return
-        
-        print(f"\n📋 ALL CONTACTS ({len(contacts)} total)")
-        print("="*60)
-        
-        # Display in a compact format for the list view
-        print(f"{'ID':<6} {'Name':<20} {'Phone':<15} {'Email':<25}")
-        print("-" * 70)
-        
-        for contact in contacts:
-            email_display = contact.email[:22] + "..." if len(contact.email) > 25 else contact.email
-            print(f"{contact.id:<6} {contact.name:<20} {contact.phone:<15} {email_display:<25}")
-        
-        print(f"\n💡 Use 'Search Contacts' to view detailed information")
-    
-    def search_contacts_interactive(self):
-        """Interactive contact search."""
-        print("\n🔍 SEARCH CONTACTS")
-        print("-" * 30)
-        
-        query = input("Enter search term (name, phone, email, or address): ").strip()
-        if not query:
-            print("❌ Search term cannot be empty!")
-            return
-        
-        results = self.contact_manager.search_contacts(query)
-        if not results:
-            print(f"\n📭 No contacts found matching '{query}'")
-            return
-        
-        print(f"\n🔍 SEARCH RESULTS ({len(results)} found)")
-        print("="*60)
-        
-        for contact in results:
-            print(contact)
-    
-    def update_contact_interactive(self):
-        """Interactive contact update."""
-        print("\n✏️ UPDATE CONTACT")
-        print("-" * 30)
-        
-        try:
-            contact_id = int(input("Enter contact ID to update: "))
-        except ValueError:
-            print("❌ Invalid contact ID!")
-            return
-        
-        contact = self.contact_manager.get_contact_by_id(contact_id)
-        if not contact:
-            print("❌ Contact not found!")
-            return
-        
-        print(f"\nCurrent contact details:")
-        print(contact)
-        
-        print("\nWhat would you like to update?")
-        print("1. Name")
-        print("2. Phone")
-        print("3. Email")
-        print("4. Address")
-        print("5. All Details")
-        
-        choice = input("Select option (1-5): ").strip()
-        
-        try:
-            if choice == "1":
-                new_name = input("Enter new name: ").strip()
-                if new_name:
-                    if self.contact_manager.update_contact(contact_id, name=new_name):
-                        print("✅ Contact name updated successfully!")
-                    else:
-                        print("❌ Failed to update contact name!")
-                else:
-                    print("❌ Name cannot be empty!")
-            
-            elif choice == "2":
-                while True:
-                    new_phone = input("Enter new phone number: ").strip()
-                    if new_phone and self.validate_phone(new_phone):
-                        if self.contact_manager.update_contact(contact_id, phone=new_phone):
-                            print("✅ Contact phone updated successfully!")
-                        else:
-                            print("❌ Failed to update contact phone!")
-                        break
-                    print("❌ Please enter a valid phone number!")
-            
-            elif choice == "3":
-                while True:
-                    new_email = input("Enter new email address: ").strip()
-                    if not new_email or self.validate_email(new_email):
-                        if self.contact_manager.update_contact(contact_id, email=new_email):
-                            print("✅ Contact email updated successfully!")
-                        else:
-                            print("❌ Failed to update contact email!")
-                        break
-                    print("❌ Please enter a valid email address!")
-            
-            elif choice == "4":
-                new_address = input("Enter new address: ").strip()
-                if self.contact_manager.update_contact(contact_id, address=new_address):
-                    print("✅ Contact address updated successfully!")
-                else:
-                    print("❌ Failed to update contact address!")
-            
-            elif choice == "5":
-                contact_data = self.get_contact_input()
-                if self.contact_manager.update_contact(contact_id, **contact_data):
-                    print("✅ All contact details updated successfully!")
-                else:
-                    print("❌ Failed to update contact details!")
-            
-            else:
-                print("❌ Invalid choice!")
-        
-        except ValueError as e:
-            print(f"❌ Error: {e}")
-    
-    def delete_contact_interactive(self):
-        """Interactive contact deletion."""
-        print("\n🗑️ DELETE CONTACT")
-        print("-" * 30)
-        
-        try:
-            contact_id = int(input("Enter contact ID to delete: "))
-        except ValueError:
-            print("❌ Invalid contact ID!")
-            return
-        
-        contact = self.contact_manager.get_contact_by_id(contact_id)
-        if not contact:
-            print("❌ Contact not found!")
-            return
-        
-        print(f"\nContact to delete:")
-        print(contact)
-        
-        confirm = input("\nAre you sure you want to delete this contact? (y/n): ").strip().lower()
-        if confirm in ['y', 'yes']:
-            if self.contact_manager.delete_contact(contact_id):
-                print("✅ Contact deleted successfully!")
-            else:
-                print("❌ Failed to delete contact!")
-        else:
-            print("❌ Contact deletion cancelled.")
-    
-    def show_statistics(self):
-        """Display contact statistics."""
-        total_contacts = self.contact_manager.get_contact_count()
-        
-        print("\n📊 CONTACT STATISTICS")
-        print("="*40)
-        print(f"Total Contacts: {total_contacts}")
-        
-        if total_contacts > 0:
-            contacts = self.contact_manager.get_all_contacts()
-            
-            # Count contacts with complete information
-            with_email = sum(1 for c in contacts if c.email)
-            with_address = sum(1 for c in contacts if c.address)
-            
-            print(f"Contacts with email: {with_email} ({with_email/total_contacts*100:.1f}%)")
-            print(f"Contacts with address: {with_address} ({with_address/total_contacts*100:.1f}%)")
-            
-            # Show recent contacts
-            recent_contacts = sorted(contacts, key=lambda x: x.created_date, reverse=True)[:3]
-            print(f"\n📅 Recent Contacts:")
-            for contact in recent_contacts:
-                print(f"  • {contact.name} ({contact.created_date})")
-    
-    def save_contacts_manual(self):
-        """Manually save contacts."""
-        self.contact_manager.save_contacts()
-        print("✅ Contacts saved successfully!")
-    
-    def run(self):
-        """Main application loop."""
-        print("🚀 Welcome to the Contact Management System!")
-        print("Manage your contacts efficiently and securely!")
-        
-        while True:
-            self.display_menu()
-            
-            try:
-                choice = input("\nEnter your choice (1-8): ").strip()
-                
-                if choice == "1":
-                    self.add_contact_interactive()
-                elif choice == "2":
-                    self.view_all_contacts()
-                elif choice == "3":
-                    self.search_contacts_interactive()
-                elif choice == "4":
-                    self.update_contact_interactive()
-                elif choice == "5":
-                    self.delete_contact_interactive()
-                elif choice == "6":
-                    self.show_statistics()
-                elif choice == "7":
-                    self.save_contacts_manual()
-                elif choice == "8":
-                    print("\n👋 Thank you for using the Contact Management System!")
-                    print("Your contacts have been automatically saved.")
-                    break
-                else:
-                    print("❌ Invalid choice! Please enter a number between 1-8.")
-                
-                input("\nPress Enter to continue...")
-                
-            except KeyboardInterrupt:
-                print("\n\n👋 Application interrupted. Goodbye!")
-                break
-            except Exception as e:
-                print(f"\n❌ An error occurred: {e}")
-                input("Press Enter to continue...")
-
-if __name__ == "__main__":
-    app = ContactApp()
-    app.run()
-
+import argparse
+import csv
+import gc
+import heapq
+import itertools
+import json
+import os
+import queue
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from functools import lru_cache, wraps
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Set
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+@lru_cache(maxsize=4096)
+def format_timestamp(timestamp: int) -> str:
+    """Format epoch seconds the way contact dates are displayed and saved."""
+    return time.strftime(DATE_FORMAT, time.localtime(timestamp))
+
+def parse_timestamp(value: str) -> int:
+    """Parse a saved contact date back into epoch seconds."""
+    return int(datetime.fromisoformat(value).timestamp())
+
+NON_DIGITS = re.compile(r"\D+")
+WORDS = re.compile(r"\w+")
+PHONE_EXTENSION = re.compile(r"\s*(?:ext\.?|extension|x|#)\s*\d+\s*$", re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+DEFAULT_COUNTRY_CODE = "1"
+
+def canonical_phone(phone: str, country_code: str = DEFAULT_COUNTRY_CODE) -> str:
+    """Reduce a phone number to an E.164-style key such as '+15551234567'.
+    
+    Punctuation, spaces and a trailing extension are ignored. Numbers with a
+    leading '+' or '00' already carry their country code; other numbers are
+    national ones in ``country_code``, so a trunk '0' is dropped and, for
+    North American numbers, a leading '1' is not doubled. Text without any
+    digits is only stripped, so it still compares exactly.
+    """
+    phone = phone.strip()
+    number = PHONE_EXTENSION.sub("", phone)
+    digits = NON_DIGITS.sub("", number)
+    if not digits:
+        return phone
+    if number.startswith("+"):
+        return "+" + digits
+    if digits.startswith("00"):
+        return "+" + digits[2:]
+    if country_code == "1":
+        if len(digits) == 11 and digits.startswith("1"):
+            return "+" + digits
+        if len(digits) != 10:
+            return digits
+    elif digits.startswith("0"):
+        digits = digits[1:]
+    return "+" + country_code + digits
+
+def check_text_fields(**fields):
+    """Raise ValueError unless every contact field given is a string."""
+    for field, value in fields.items():
+        if not isinstance(value, str):
+            raise ValueError(f"The {field} must be text, not {type(value).__name__}")
+
+class IdAllocator:
+    """Monotonic, collision-free id allocator that is safe to share between threads.
+    
+    allocate() is a single next() on an itertools.count, which CPython runs
+    atomically, so the hot path needs no lock and sustains millions of ids
+    per second. seed() moves the counter past ids that already exist and
+    never moves it backwards: small jumps consume the counter in C, large
+    ones swap in a new counter far enough ahead that a next() racing on the
+    old one cannot produce a duplicate.
+    """
+    
+    SWAP_THRESHOLD = 1 << 16
+    
+    def __init__(self, next_id: int = 1):
+        self._counter = itertools.count(next_id)
+        self._lock = threading.Lock()
+        self._seeded = next_id - 1  # highest id already known to be taken
+    
+    def allocate(self) -> int:
+        """Return a new id."""
+        return next(self._counter)
+    
+    def allocate_block(self, count: int) -> range:
+        """Reserve ``count`` consecutive ids in one step."""
+        with self._lock:
+            start = next(self._counter)
+            if count > 1:
+                self._skip(count - 1)
+        return range(start, start + count)
+    
+    def seed(self, used_id: int):
+        """Make sure ids up to and including ``used_id`` are never handed out."""
+        if used_id <= self._seeded:
+            return
+        with self._lock:
+            current = next(self._counter)
+            if used_id >= current:
+                self._skip(used_id - current)
+            self._seeded = max(self._seeded, used_id)
+    
+    def _skip(self, count: int):
+        """Advance the counter by ``count`` ids; the caller holds the lock."""
+        if count < self.SWAP_THRESHOLD:
+            deque(itertools.islice(self._counter, count), maxlen=0)
+        else:
+            self._counter = itertools.count(next(self._counter) + count)
+
+DEFAULT_ID_ALLOCATOR = IdAllocator()
+
+class BaseContact:
+    """Behaviour shared by every contact representation.
+    
+    Subclasses provide id, name, phone, email, address and the integer
+    created_at/updated_at timestamps; dates are only formatted on output.
+    """
+    
+    __slots__ = ()
+    
+    @property
+    def created_date(self) -> str:
+        """Creation time formatted for display."""
+        return format_timestamp(self.created_at)
+    
+    @property
+    def updated_date(self) -> str:
+        """Last update time formatted for display."""
+        return format_timestamp(self.updated_at)
+    
+    def to_dict(self) -> Dict:
+        """Convert contact to dictionary for JSON serialization."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'phone': self.phone,
+            'email': self.email,
+            'address': self.address,
+            'created_date': self.created_date,
+            'updated_date': self.updated_date
+        }
+    
+    def update_details(self, name: str = None, phone: str = None, email: str = None, address: str = None):
+        """Update contact details and timestamp."""
+        if name is not None:
+            self.name = name.strip()
+        if phone is not None:
+            self.phone = phone.strip()
+        if email is not None:
+            self.email = email.strip()
+        if address is not None:
+            self.address = address.strip()
+        self.updated_at = int(time.time())
+    
+    def __str__(self) -> str:
+        """String representation of the contact."""
+        return f"""
+ID: {self.id}
+Name: {self.name}
+Phone: {self.phone}
+Email: {self.email if self.email else 'Not provided'}
+Address: {self.address if self.address else 'Not provided'}
+Created: {self.created_date}
+Updated: {self.updated_date}
+{'─' * 50}"""
+
+class Contact(BaseContact):
+    """Represents a single contact with all necessary information."""
+    
+    __slots__ = ('id', 'name', 'phone', 'email', 'address', 'created_at', 'updated_at')
+    
+    def __init__(self, name: str, phone: str, email: str = "", address: str = "",
+                 contact_id: Optional[int] = None):
+        self.id = contact_id if contact_id is not None else DEFAULT_ID_ALLOCATOR.allocate()
+        self.name = name.strip()
+        self.phone = phone.strip()
+        self.email = email.strip()
+        self.address = address.strip()
+        self.created_at = int(time.time())
+        self.updated_at = self.created_at
+    
+    @classmethod
+    def from_dict(cls, data: Dict, ids: Optional[IdAllocator] = None) -> 'Contact':
+        """Create contact from dictionary and re-seed the id allocator past its id."""
+        contact = cls.__new__(cls)
+        contact.id = data['id']
+        contact.name = data['name']
+        contact.phone = data['phone']
+        contact.email = data['email']
+        contact.address = data['address']
+        contact.created_at = parse_timestamp(data['created_date'])
+        contact.updated_at = parse_timestamp(data['updated_date'])
+        (ids or DEFAULT_ID_ALLOCATOR).seed(contact.id)
+        return contact
+
+def _text_column(field: int) -> property:
+    """Property reading and writing one text column of a ContactStore row."""
+    return property(lambda self: self._store.get_text(self.id, field),
+                    lambda self, value: self._store.set_text(self.id, field, value))
+
+class ContactRecord(BaseContact):
+    """A contact stored as one row of a ContactStore."""
+    
+    __slots__ = ('_store', 'id')
+    
+    def __init__(self, store: 'ContactStore', contact_id: int):
+        self._store = store
+        self.id = contact_id
+    
+    name = _text_column(0)
+    phone = _text_column(1)
+    email = _text_column(2)
+    address = _text_column(3)
+    
+    @property
+    def created_at(self) -> int:
+        return self._store.created[self._store.row_of(self.id)]
+    
+    @property
+    def updated_at(self) -> int:
+        return self._store.updated[self._store.row_of(self.id)]
+    
+    @updated_at.setter
+    def updated_at(self, value: int):
+        self._store.updated[self._store.row_of(self.id)] = value
+
+class ContactStore:
+    """Columnar contact storage: parallel arrays over a shared string heap.
+    
+    Each contact is one row across fixed-width arrays. Text fields are
+    UTF-8 slices of a single bytearray heap addressed by (start, length)
+    cells, so no per-string objects are kept. A bounded intern table lets
+    repeated values (common streets, cities, domains) share one heap slice,
+    and empty values take no heap space at all. Deleted rows and replaced
+    values become garbage that compaction reclaims. Iterating the store
+    yields ContactRecord views, so ContactManager can use it in place of a
+    list of Contact objects.
+    """
+    
+    TEXT_FIELDS = 4
+    INTERN_LIMIT = 4096
+    
+    def __init__(self, contacts=()):
+        self._reset()
+        for contact in contacts:
+            self.append(contact)
+    
+    def _reset(self):
+        """Start with no rows and an empty heap."""
+        self._heap = bytearray()
+        self._interned: Dict[str, int] = {}
+        self.ids = array('q')
+        self.starts = array('q')  # TEXT_FIELDS heap cells per row
+        self.lengths = array('l')
+        self.created = array('q')
+        self.updated = array('q')
+        self._rows: Dict[int, int] = {}
+        self._garbage = 0
+    
+    def _store_text(self, cell: int, value: str):
+        """Point a heap cell at the UTF-8 bytes of a value."""
+        encoded = value.encode()
+        start = self._interned.get(value)
+        if start is None:
+            start = len(self._heap)
+            self._heap += encoded
+            if len(self._interned) < self.INTERN_LIMIT:
+                self._interned[value] = start
+        if cell == len(self.starts):
+            self.starts.append(start)
+            self.lengths.append(len(encoded))
+        else:
+            self.starts[cell] = start
+            self.lengths[cell] = len(encoded)
+    
+    def row_of(self, contact_id: int) -> int:
+        """Row number of a stored contact."""
+        return self._rows[contact_id]
+    
+    def get_text(self, contact_id: int, field: int) -> str:
+        """Read one text column of a contact."""
+        cell = self._rows[contact_id] * self.TEXT_FIELDS + field
+        start = self.starts[cell]
+        return self._heap[start:start + self.lengths[cell]].decode()
+    
+    def set_text(self, contact_id: int, field: int, value: str):
+        """Write one text column of a contact."""
+        self._store_text(self._rows[contact_id] * self.TEXT_FIELDS + field, value)
+        self._garbage += 1
+    
+    def append(self, contact: BaseContact) -> ContactRecord:
+        """Copy a contact into a new row and return its view."""
+        row = len(self.ids)
+        if contact.id in self._rows:
+            self._garbage += self.TEXT_FIELDS
+        self._rows[contact.id] = row
+        self.ids.append(contact.id)
+        cell = row * self.TEXT_FIELDS
+        for offset, value in enumerate((contact.name, contact.phone, contact.email, contact.address)):
+            self._store_text(cell + offset, value)
+        self.created.append(contact.created_at)
+        self.updated.append(contact.updated_at)
+        return ContactRecord(self, contact.id)
+    
+    def remove(self, contact: BaseContact):
+        """Tombstone the row of a contact, compacting once garbage dominates."""
+        del self._rows[contact.id]
+        self._garbage += self.TEXT_FIELDS
+        if self._garbage > len(self._rows) * self.TEXT_FIELDS:
+            self.compact()
+    
+    def compact(self):
+        """Drop tombstoned rows and unreferenced heap bytes."""
+        width = self.TEXT_FIELDS
+        ids, heap, starts, lengths = self.ids, self._heap, self.starts, self.lengths
+        created, updated = self.created, self.updated
+        live_rows = sorted(self._rows.values())
+        self._reset()
+        for row in live_rows:
+            self._rows[ids[row]] = len(self.ids)
+            self.ids.append(ids[row])
+            for cell in range(row * width, (row + 1) * width):
+                start = starts[cell]
+                self._store_text(len(self.starts), heap[start:start + lengths[cell]].decode())
+            self.created.append(created[row])
+            self.updated.append(updated[row])
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def __iter__(self):
+        ids = self.ids
+        rows = self._rows
+        for row in range(len(ids)):
+            contact_id = ids[row]
+            if rows.get(contact_id) == row:
+                yield ContactRecord(self, contact_id)
+
+class ContactList:
+    """Contacts in insertion order, keyed by id so that removing one is O(1)."""
+    
+    __slots__ = ('_contacts',)
+    
+    def __init__(self, contacts=()):
+        self._contacts: Dict[int, BaseContact] = {contact.id: contact for contact in contacts}
+    
+    def append(self, contact: BaseContact):
+        """Add a contact after all the others."""
+        self._contacts[contact.id] = contact
+    
+    def remove(self, contact: BaseContact):
+        """Drop a contact."""
+        del self._contacts[contact.id]
+    
+    def __len__(self) -> int:
+        return len(self._contacts)
+    
+    def __iter__(self):
+        return iter(self._contacts.values())
+
+def _file_mode(filename: str) -> int:
+    """Permission bits of an existing file, or the umask default for a new one."""
+    try:
+        return os.stat(filename).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def _replace_file(filename: str, write: Callable) -> int:
+    """Write a file through a temporary sibling that is renamed over it.
+    
+    Readers and crashed writers only ever see the old or the new contents,
+    never a half-written file. Returns the size of the new file in bytes.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_name = tempfile.mkstemp(prefix=os.path.basename(filename) + '.', suffix='.tmp', dir=directory)
+    try:
+        # mkstemp creates the file 0600; give it the mode a plain open() would have
+        os.chmod(temp_name, _file_mode(filename))
+        with os.fdopen(fd, 'w') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+            size = os.fstat(f.fileno()).st_size
+        os.replace(temp_name, filename)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+    return size
+
+class JsonFileStorage:
+    """Storage backend that keeps the whole address book in one JSON file."""
+    
+    # Whether a logged batch costs its own size (True) or a rewrite of the whole book (False)
+    appends = False
+    
+    def __init__(self, filename: str = "contacts.json"):
+        self.filename = filename
+        # One past the highest id ever stored, so deleted ids are not reused
+        self.next_id = 1
+        # Running total of bytes handed to the file system, for metrics
+        self.bytes_written = 0
+    
+    def load(self) -> List[Dict]:
+        """Load all contact records from the JSON file."""
+        if not os.path.exists(self.filename):
+            return []
+        with open(self.filename, 'r') as f:
+            return self._unpack(json.load(f))
+    
+    def _unpack(self, data) -> List[Dict]:
+        """Read the {'next_id', 'contacts'} layout or a bare list of records."""
+        if isinstance(data, list):
+            return data
+        self.next_id = max(self.next_id, data.get('next_id', 1))
+        return data['contacts']
+    
+    def _pack(self, records: List[Dict]) -> Dict:
+        """Bundle records with the id high-water mark for saving."""
+        return {'next_id': self.next_id, 'contacts': records}
+    
+    def save(self, records: List[Dict]):
+        """Atomically rewrite the JSON file with the given contact records."""
+        packed = self._pack(records)
+        self.bytes_written += _replace_file(self.filename, lambda f: json.dump(packed, f, indent=2))
+    
+    def log(self, op: str, data: Dict, snapshot: Callable[[], List[Dict]]):
+        """Persist a single mutation; a plain JSON file can only be rewritten."""
+        self.save(snapshot())
+    
+    def log_many(self, op: str, items: List[Dict], snapshot: Callable[[], List[Dict]]):
+        """Persist a batch of mutations of the same kind with one write."""
+        self.log_batch([(op, data) for data in items], snapshot)
+    
+    def log_batch(self, entries: List[tuple], snapshot: Callable[[], List[Dict]]):
+        """Persist a batch of (op, data) mutations of any kind with one write."""
+        self.save(snapshot())
+    
+    def close(self):
+        """Release any open resources."""
+
+class JournalStorage(JsonFileStorage):
+    """Storage backend that appends one JSON-lines record per mutation.
+    
+    The JSON file written by JsonFileStorage acts as the snapshot and
+    mutations are appended to '<filename>.journal'. Once the journal holds
+    as many operations as the snapshot holds contacts (and at least
+    ``compact_every``) it is folded back into a fresh snapshot, so the
+    amortized cost of a single write does not grow with the book size.
+    """
+    
+    appends = True
+    
+    def __init__(self, filename: str = "contacts.json", compact_every: int = 1000):
+        super().__init__(filename)
+        self.journal_filename = filename + ".journal"
+        self.compact_every = compact_every
+        self._journal = None
+        self._journal_ops = 0
+        self._snapshot_size = 0
+    
+    def load(self) -> List[Dict]:
+        """Load the snapshot and replay the journal on top of it."""
+        records = {}
+        duplicates = []  # files written before ids were unique may repeat them
+        for record in super().load():
+            if record['id'] in records:
+                duplicates.append(record)
+            else:
+                records[record['id']] = record
+        self._snapshot_size = len(records) + len(duplicates)
+        self._journal_ops = 0
+        if os.path.exists(self.journal_filename):
+            good = 0  # byte offset just past the last complete record
+            with open(self.journal_filename, 'rb') as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError("unterminated record")
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn write at the tail of the journal
+                    if entry['op'] == 'delete':
+                        records.pop(entry['id'], None)
+                    else:
+                        records[entry['contact']['id']] = entry['contact']
+                        self.next_id = max(self.next_id, entry['contact']['id'] + 1)
+                    self._journal_ops += 1
+                    good += len(line)
+                torn = os.fstat(f.fileno()).st_size != good
+            if torn:
+                # Cut the torn record off, or records appended after it would be unreadable too
+                os.truncate(self.journal_filename, good)
+        return list(records.values()) + duplicates
+    
+    def save(self, records: List[Dict]):
+        """Atomically write a fresh snapshot, then truncate the journal.
+        
+        A crash between the two steps leaves a journal whose operations are
+        already in the snapshot; replaying them again is harmless.
+        """
+        self.close()
+        # dumps (unlike dump) runs entirely in the C encoder
+        snapshot = json.dumps(self._pack(records), separators=(',', ':'))
+        self.bytes_written += _replace_file(self.filename, lambda f: f.write(snapshot))
+        with open(self.journal_filename, 'w'):
+            pass
+        self._journal_ops = 0
+        self._snapshot_size = len(records)
+    
+    def log(self, op: str, data: Dict, snapshot: Callable[[], List[Dict]]):
+        """Append one operation record, compacting when the journal gets long."""
+        self.log_batch([(op, data)], snapshot)
+    
+    def log_batch(self, entries: List[tuple], snapshot: Callable[[], List[Dict]]):
+        """Append a batch of (op, data) operation records with a single flush."""
+        if self._journal is None:
+            self._journal = open(self.journal_filename, 'a')
+        encode = json.JSONEncoder(separators=(',', ':')).encode
+        lines = [encode({'op': op, 'id': data['id']}) if op == 'delete' else encode({'op': op, 'contact': data})
+                 for op, data in entries]
+        text = "\n".join(lines) + "\n"
+        self._journal.write(text)
+        self._journal.flush()
+        self.bytes_written += len(text)  # the encoder escapes non-ASCII, so chars == bytes
+        self._journal_ops += len(entries)
+        if self._journal_ops >= max(self.compact_every, self._snapshot_size):
+            self.save(snapshot())
+    
+    def close(self):
+        """Close the journal file handle."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+class MemoryStorage(JsonFileStorage):
+    """Storage backend that keeps records in memory only (benchmarks, tests)."""
+    
+    def __init__(self, records: Optional[List[Dict]] = None):
+        super().__init__(filename="")
+        self.records = records if records is not None else []
+    
+    def load(self) -> List[Dict]:
+        """Return the in-memory records."""
+        return self.records
+    
+    def save(self, records: List[Dict]):
+        """Replace the in-memory records."""
+        self.records = records
+    
+    def log(self, op: str, data: Dict, snapshot: Callable[[], List[Dict]]):
+        """Mutations are already reflected in memory; nothing to persist."""
+    
+    def log_batch(self, entries: List[tuple], snapshot: Callable[[], List[Dict]]):
+        """Mutations are already reflected in memory; nothing to persist."""
+
+class NGramIndex:
+    """Incremental trigram inverted index over the searchable contact fields.
+    
+    Each contact's lowercased name, phone, email and address are stored once
+    as a single NUL-separated string, and every trigram of those fields maps
+    to the ids of the contacts that contain it. A substring query of three
+    or more characters only has to check the contacts in the shortest
+    posting among its trigrams.
+    
+    Postings are append-only lists: deletes and updates leave stale entries
+    behind (queries re-check the stored text anyway) and the postings are
+    rebuilt once stale entries outnumber live ones. Appending to a list is
+    far cheaper than growing large sets, which keeps bulk loads fast.
+    """
+    
+    N = 3
+    
+    def __init__(self):
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._texts: Dict[int, str] = {}
+        self._order: Dict[int, int] = {}
+        self._next_order = 0
+        self._entries = 0
+        self._stale = 0
+        # False once an update appends out of insertion order (until compaction)
+        self._in_order = True
+    
+    @staticmethod
+    def _text_of(contact: Contact) -> str:
+        """Searchable text of a contact; the separator keeps matches inside one field."""
+        return "\0".join((contact.name.lower(), contact.phone, contact.email.lower(), contact.address.lower()))
+    
+    def _grams(self, text: str) -> Set[str]:
+        """All n-grams of the given text that do not span two fields."""
+        n = self.N
+        return {field[i:i + n] for field in text.split("\0") for i in range(len(field) - n + 1)}
+    
+    def add(self, contact: Contact):
+        """Index a contact, replacing its previous entry if it has one."""
+        contact_id = contact.id
+        text = self._text_of(contact)
+        old_text = self._texts.get(contact_id)
+        self._texts[contact_id] = text
+        grams = self._grams(text)
+        if old_text is None:
+            self._order[contact_id] = self._next_order
+            self._next_order += 1
+        else:
+            old_grams = self._grams(old_text)
+            self._stale += len(old_grams - grams)
+            grams -= old_grams
+            if grams:
+                self._in_order = False
+        postings = self._postings
+        for gram in grams:
+            postings[gram].append(contact_id)
+        self._entries += len(grams)
+        self._maybe_compact()
+    
+    def remove(self, contact_id: int):
+        """Remove a contact from the index."""
+        text = self._texts.pop(contact_id, None)
+        if text is not None:
+            del self._order[contact_id]
+            self._stale += len(self._grams(text))
+            self._maybe_compact()
+    
+    def _maybe_compact(self):
+        """Rebuild the postings once most of their entries are stale."""
+        if self._stale > 1024 and self._stale * 2 > self._entries:
+            self._postings = defaultdict(list)
+            self._entries = 0
+            self._stale = 0
+            self._in_order = True
+            postings = self._postings
+            for contact_id, text in self._texts.items():
+                grams = self._grams(text)
+                for gram in grams:
+                    postings[gram].append(contact_id)
+                self._entries += len(grams)
+    
+    def search(self, query: str) -> List[int]:
+        """Return ids of contacts with a field containing the lowercased query, in insertion order."""
+        return list(self.iter_search(query))
+    
+    def iter_search(self, query: str) -> Iterator[int]:
+        """Yield matching ids in insertion order, verifying candidates only as they are consumed.
+        
+        The index must not change while the iterator is in use.
+        """
+        n = self.N
+        texts = self._texts
+        if len(query) >= n:
+            shortest = None
+            for i in range(len(query) - n + 1):
+                posting = self._postings.get(query[i:i + n])
+                if not posting:
+                    return
+                if shortest is None or len(posting) < len(shortest):
+                    shortest = posting
+            # A query whose rarest n-gram is still common matches a large part of
+            # the book; scanning the texts directly is just as cheap then.
+            if len(shortest) * 4 < len(texts):
+                if not self._in_order:
+                    yield from sorted({cid for cid in shortest if query in texts.get(cid, "")},
+                                      key=self._order.__getitem__)
+                    return
+                for cid in shortest:
+                    if query in texts.get(cid, ""):
+                        yield cid
+                return
+        for cid, text in texts.items():
+            if query in text:
+                yield cid
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two strings.
+    
+    Uses Myers' bit-parallel algorithm: one column of the edit-distance
+    table is held as bit vectors in Python ints, so each character of ``b``
+    costs a handful of integer operations instead of a loop over ``a``.
+    """
+    if not a:
+        return len(b)
+    peq: Dict[str, int] = {}
+    bit = 1
+    for char in a:
+        peq[char] = peq.get(char, 0) | bit
+        bit <<= 1
+    mask = bit - 1
+    last = bit >> 1
+    pv, mv, score = mask, 0, len(a)
+    for char in b:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+# Vowels (and y) separate repeated codes; h and w are dropped entirely
+SOUNDEX_CODES = str.maketrans("aeiouybfpvcgjkqsxzdtlmnr", "000000111122222222334556", "hw")
+
+def soundex(word: str) -> str:
+    """American Soundex code of a word, e.g. 'Robert' -> 'R163'."""
+    word = word.lower()
+    codes = [code for code, _ in itertools.groupby(word.translate(SOUNDEX_CODES))]
+    if codes and codes[0] == word[0].translate(SOUNDEX_CODES):
+        codes = codes[1:]
+    digits = "".join(code for code in codes if code.isdigit() and code != "0")
+    return (word[0].upper() + digits + "000")[:4]
+
+class BKTree:
+    """Burkhard-Keller tree of words under edit distance.
+    
+    Every child edge is labelled with its distance to the parent, so by the
+    triangle inequality a query within ``max_distance`` only has to descend
+    into edges labelled d - max_distance .. d + max_distance. Small radii
+    visit a small fraction of the words.
+    """
+    
+    def __init__(self):
+        self._root: Optional[tuple] = None  # (word, {distance: child})
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def add(self, word: str):
+        """Insert a word; words already present are ignored."""
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            distance = edit_distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                self._size += 1
+                return
+            node = child
+    
+    def search(self, word: str, max_distance: int) -> List[tuple]:
+        """All (distance, word) pairs within max_distance of the given word."""
+        results = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node_word, children = stack.pop()
+            distance = edit_distance(word, node_word)
+            if distance <= max_distance:
+                results.append((distance, node_word))
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for edge, child in children.items() if low <= edge <= high)
+        return results
+
+class FuzzyIndex:
+    """Typo-tolerant, phonetic index over contact names.
+    
+    Each name is split into lowercase word tokens once, when the contact is
+    indexed. Tokens go into a BKTree for edit-distance lookups and are
+    grouped by Soundex code for sound-alike lookups, and both map back to
+    the ids of the contacts that use them. Distinct name tokens grow far
+    more slowly than the book, and a query only touches the tokens near it.
+    Removed tokens stay in the tree with no contacts, which is harmless.
+    """
+    
+    TOKEN = re.compile(r"[^\W\d_]{2,}")
+    # Score given to a sound-alike token that is not also a close spelling
+    PHONETIC_SCORE = 0.6
+    
+    def __init__(self):
+        self._tree = BKTree()
+        self._ids_by_token: Dict[str, Set[int]] = defaultdict(set)
+        self._tokens_by_code: Dict[str, Set[str]] = defaultdict(set)
+        self._tokens_of: Dict[int, List[str]] = {}
+    
+    def tokens(self, text: str) -> List[str]:
+        """Word tokens of a name, lowercased, without duplicates."""
+        return list(dict.fromkeys(self.TOKEN.findall(text.lower())))
+    
+    def add(self, contact: BaseContact):
+        """Index a contact's name tokens and their phonetic keys."""
+        tokens = self.tokens(contact.name)
+        self._tokens_of[contact.id] = tokens
+        for token in tokens:
+            ids = self._ids_by_token[token]
+            if not ids:
+                self._tree.add(token)
+                self._tokens_by_code[soundex(token)].add(token)
+            ids.add(contact.id)
+    
+    def remove(self, contact_id: int):
+        """Drop a contact from the token postings."""
+        for token in self._tokens_of.pop(contact_id, ()):
+            self._ids_by_token[token].discard(contact_id)
+    
+    @staticmethod
+    def default_distance(token: str) -> int:
+        """Typos tolerated for a query token of this length."""
+        return 0 if len(token) <= 2 else 1 if len(token) <= 5 else 2
+    
+    def search(self, query: str, limit: int = 10, max_distance: Optional[int] = None) -> List[tuple]:
+        """Top (score, contact id) pairs for a query, best first.
+        
+        Each query token scores every name token it matches: 1 - distance /
+        length for close spellings, PHONETIC_SCORE for a sound-alike, keeping
+        the best. A contact's score is the mean over query tokens of its best
+        token score, so 1.0 means every query word matched exactly.
+        """
+        query_tokens = self.tokens(query)
+        if not query_tokens:
+            return []
+        scores: Dict[int, float] = defaultdict(float)
+        for query_token in query_tokens:
+            radius = self.default_distance(query_token) if max_distance is None else max_distance
+            token_scores = {token: self.PHONETIC_SCORE for token in self._tokens_by_code.get(soundex(query_token), ())}
+            for distance, token in self._tree.search(query_token, radius):
+                score = 1 - distance / max(len(token), len(query_token))
+                if score > token_scores.get(token, 0):
+                    token_scores[token] = score
+            best: Dict[int, float] = {}
+            for token, score in token_scores.items():
+                for contact_id in self._ids_by_token.get(token, ()):
+                    if score > best.get(contact_id, 0):
+                        best[contact_id] = score
+            for contact_id, score in best.items():
+                scores[contact_id] += score
+        count = len(query_tokens)
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(round(score / count, 3), contact_id) for contact_id, score in top]
+
+CONTACT_FIELDS = ('name', 'phone', 'email', 'address')
+
+def _read_csv(f) -> Iterator[Dict[str, str]]:
+    """Stream contact fields from a CSV file with a name,phone,email,address header."""
+    for row in csv.DictReader(f):
+        yield {field: (row.get(field) or "") for field in CONTACT_FIELDS}
+
+def _read_jsonl(f) -> Iterator[Dict[str, str]]:
+    """Stream contact fields from a JSON Lines file, one object per line."""
+    for line in f:
+        if line.strip():
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(f"Expected a JSON object per line, not {line.strip()[:40]!r}")
+            yield {field: _json_text(record.get(field)) for field in CONTACT_FIELDS}
+
+def _json_text(value):
+    """A JSON field as contact text: null is empty and an integer (a bare phone number) its digits.
+    
+    Other values are passed through, for the importer to reject.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+VCARD_ESCAPE = re.compile(r'\\([\\,;nN])')
+VCARD_COMPONENT_SPLIT = re.compile(r'(?<!\\);')
+
+def _vcard_unescape(value: str) -> str:
+    """Undo vCard text escaping."""
+    return VCARD_ESCAPE.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+def _vcard_escape(value: str) -> str:
+    """Escape text for a vCard property value."""
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace(";", "\\;").replace("\n", "\\n")
+
+def _unfold_vcard(f) -> Iterator[str]:
+    """Yield vCard lines with folded continuation lines joined back on."""
+    current = None
+    for raw in f:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+def _read_vcard(f) -> Iterator[Dict[str, str]]:
+    """Stream contact fields from a vCard file (FN, TEL, EMAIL and ADR properties)."""
+    card = None
+    for line in _unfold_vcard(f):
+        key, _, value = line.partition(":")
+        name = key.split(";", 1)[0].upper()
+        if name == "BEGIN":
+            card = {field: "" for field in CONTACT_FIELDS}
+        elif card is None:
+            continue
+        elif name == "END":
+            yield card
+            card = None
+        elif name == "FN":
+            card['name'] = _vcard_unescape(value)
+        elif name == "TEL" and not card['phone']:
+            card['phone'] = _vcard_unescape(value)
+        elif name == "EMAIL" and not card['email']:
+            card['email'] = _vcard_unescape(value)
+        elif name == "ADR" and not card['address']:
+            parts = VCARD_COMPONENT_SPLIT.split(value)
+            card['address'] = ", ".join(_vcard_unescape(part) for part in parts if part)
+
+def _write_csv(f, contacts: Iterable[BaseContact]):
+    """Write contacts as CSV with a name,phone,email,address header."""
+    writer = csv.writer(f)
+    writer.writerow(CONTACT_FIELDS)
+    writer.writerows((c.name, c.phone, c.email, c.address) for c in contacts)
+
+def _write_jsonl(f, contacts: Iterable[BaseContact]):
+    """Write one JSON object per contact."""
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    f.writelines(encode(contact.to_dict()) + "\n" for contact in contacts)
+
+def _write_vcard(f, contacts: Iterable[BaseContact]):
+    """Write contacts as vCard 3.0 entries."""
+    for contact in contacts:
+        lines = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{_vcard_escape(contact.name)}",
+                 f"TEL:{_vcard_escape(contact.phone)}"]
+        if contact.email:
+            lines.append(f"EMAIL:{_vcard_escape(contact.email)}")
+        if contact.address:
+            lines.append(f"ADR:;;{_vcard_escape(contact.address)};;;;")
+        lines.append("END:VCARD")
+        f.write("\r\n".join(lines) + "\r\n")
+
+CONTACT_FORMATS = {
+    'csv': (_read_csv, _write_csv),
+    'jsonl': (_read_jsonl, _write_jsonl),
+    'vcard': (_read_vcard, _write_vcard),
+}
+FORMAT_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.vcf': 'vcard', '.vcard': 'vcard'}
+
+def _resolve_format(path: str, format: Optional[str]) -> str:
+    """Pick an import/export format explicitly or from the file extension."""
+    if format is None:
+        format = FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if format not in CONTACT_FORMATS:
+        raise ValueError(f"Unsupported contact format: {format or path}")
+    return format
+
+class SortedKeys:
+    """A sorted sequence of keys held in buckets of a few hundred sorted keys.
+    
+    The bucket for a key is found by binary search over the bucket maxima,
+    so adding or removing a key moves at most one bucket's worth of entries
+    instead of everything after it. Positional access bisects running
+    totals of the bucket sizes, which are recomputed lazily after a change.
+    fork() makes a copy that shares the buckets until one side changes them.
+    """
+    
+    LOAD = 512
+    
+    def __init__(self, keys: Iterable = ()):
+        keys = sorted(keys)
+        self._buckets = [keys[i:i + self.LOAD] for i in range(0, len(keys), self.LOAD)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(keys)
+        self._offsets: Optional[List[int]] = None
+        # ids of the buckets this instance may change in place, or None for all of them
+        self._owned: Optional[Set[int]] = None
+    
+    def fork(self) -> 'SortedKeys':
+        """A copy in O(N / LOAD); each side copies a shared bucket the first time it changes it."""
+        clone = SortedKeys()
+        clone._buckets = list(self._buckets)
+        clone._maxes = list(self._maxes)
+        clone._len = self._len
+        clone._offsets = self._offsets
+        clone._owned = set()
+        self._owned = set()
+        return clone
+    
+    def _bucket(self, index: int) -> List:
+        """The bucket at ``index``, copied first if it is shared with a fork."""
+        bucket = self._buckets[index]
+        if self._owned is not None and id(bucket) not in self._owned:
+            bucket = self._buckets[index] = list(bucket)
+            self._owned.add(id(bucket))
+        return bucket
+    
+    def __len__(self) -> int:
+        return self._len
+    
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._buckets)
+    
+    def add(self, key):
+        """Insert a key in order."""
+        self._offsets = None
+        self._len += 1
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            return
+        index = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+        bucket = self._bucket(index)
+        insort(bucket, key)
+        self._maxes[index] = bucket[-1]
+        if len(bucket) > 2 * self.LOAD:
+            halves = [bucket[:self.LOAD], bucket[self.LOAD:]]
+            self._buckets[index:index + 1] = halves
+            self._maxes[index:index + 1] = [bucket[self.LOAD - 1], bucket[-1]]
+            if self._owned is not None:
+                self._owned.update(map(id, halves))
+    
+    def remove(self, key):
+        """Remove one occurrence of a key, if present."""
+        index = bisect_left(self._maxes, key)
+        if index == len(self._maxes):
+            return
+        position = bisect_left(self._buckets[index], key)
+        if position == len(self._buckets[index]) or self._buckets[index][position] != key:
+            return
+        bucket = self._bucket(index)
+        del bucket[position]
+        self._offsets = None
+        self._len -= 1
+        if bucket:
+            self._maxes[index] = bucket[-1]
+        else:
+            del self._buckets[index]
+            del self._maxes[index]
+    
+    def _start_of_buckets(self) -> List[int]:
+        if self._offsets is None:
+            self._offsets = [0, *itertools.accumulate(map(len, self._buckets))]
+        return self._offsets
+    
+    def bisect_right(self, key) -> int:
+        """Position after the last key less than or equal to ``key``."""
+        index = bisect_right(self._maxes, key)
+        if index == len(self._maxes):
+            return self._len
+        return self._start_of_buckets()[index] + bisect_right(self._buckets[index], key)
+    
+    def __getitem__(self, position: int):
+        if position < 0:
+            position += self._len
+        if not 0 <= position < self._len:
+            raise IndexError("SortedKeys index out of range")
+        offsets = self._start_of_buckets()
+        index = bisect_right(offsets, position) - 1
+        return self._buckets[index][position - offsets[index]]
+    
+    def iter_from(self, position: int) -> Iterator:
+        """Yield the keys in order, starting at ``position``."""
+        if position >= self._len:
+            return iter(())
+        offsets = self._start_of_buckets()
+        index = bisect_right(offsets, position) - 1
+        return itertools.chain(itertools.islice(self._buckets[index], position - offsets[index], None),
+                               itertools.chain.from_iterable(itertools.islice(self._buckets, index + 1, None)))
+
+class ChunkedMap:
+    """Dict-like map split into chunks, whose copies share every chunk they have not changed.
+    
+    copy() duplicates only the table of chunks, and each side copies a
+    shared chunk the first time it writes to it. Integer keys are chunked by
+    range, so items() follows key order; other keys are chunked by hash.
+    """
+    
+    CHUNK = 256
+    
+    __slots__ = ('_chunks', '_owned', '_len')
+    
+    def __init__(self):
+        self._chunks: Dict[int, Dict] = {}
+        # Numbers of the chunks this map may change in place
+        self._owned: Set[int] = set()
+        self._len = 0
+    
+    def _chunk_of(self, key) -> int:
+        return key // self.CHUNK if isinstance(key, int) else hash(key) % self.CHUNK
+    
+    def _writable(self, number: int) -> Dict:
+        chunk = self._chunks.get(number)
+        if chunk is None or number not in self._owned:
+            chunk = self._chunks[number] = dict(chunk or ())
+            self._owned.add(number)
+        return chunk
+    
+    def copy(self) -> 'ChunkedMap':
+        """A copy in O(chunks) rather than O(N)."""
+        clone = ChunkedMap()
+        clone._chunks = dict(self._chunks)
+        clone._len = self._len
+        self._owned = set()
+        return clone
+    
+    def __len__(self) -> int:
+        return self._len
+    
+    def __getitem__(self, key):
+        return self._chunks[self._chunk_of(key)][key]
+    
+    def get(self, key, default=None):
+        chunk = self._chunks.get(self._chunk_of(key))
+        return default if chunk is None else chunk.get(key, default)
+    
+    def __setitem__(self, key, value):
+        chunk = self._writable(self._chunk_of(key))
+        self._len += key not in chunk
+        chunk[key] = value
+    
+    def pop(self, key, default=None):
+        number = self._chunk_of(key)
+        if key not in self._chunks.get(number, ()):
+            return default
+        self._len -= 1
+        return self._writable(number).pop(key)
+    
+    def items(self) -> Iterator[tuple]:
+        for number in sorted(self._chunks):
+            yield from self._chunks[number].items()
+
+class OperationMetrics:
+    """Per-operation call counts, errors, latency histograms and bytes written.
+    
+    Latencies are counted in log-linear buckets, four per power of two of
+    nanoseconds, so recording is O(1), memory stays fixed however many
+    calls are made and percentiles come out within about 12%.
+    """
+    
+    BUCKETS = 256
+    
+    def __init__(self):
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.bytes_written: Dict[str, int] = defaultdict(int)
+        self._histograms: Dict[str, List[int]] = {}
+    
+    @staticmethod
+    def _bucket(seconds: float) -> int:
+        nanoseconds = max(1, int(seconds * 1e9))
+        exponent = nanoseconds.bit_length() - 1
+        if exponent < 2:
+            return exponent * 4
+        return exponent * 4 + ((nanoseconds >> (exponent - 2)) & 3)
+    
+    @staticmethod
+    def _bucket_seconds(index: int) -> float:
+        """Midpoint of a bucket's range, in seconds."""
+        exponent, sub = divmod(index, 4)
+        if exponent < 2:
+            return (1 << exponent) / 1e9
+        low = (4 + sub) << (exponent - 2)
+        return (low + ((1 << (exponent - 3)) if exponent >= 3 else 0)) / 1e9
+    
+    def record(self, op: str, seconds: float, error: bool = False, bytes_written: int = 0):
+        """Count one call of an operation."""
+        histogram = self._histograms.get(op)
+        if histogram is None:
+            histogram = self._histograms[op] = [0] * self.BUCKETS
+        histogram[min(self._bucket(seconds), self.BUCKETS - 1)] += 1
+        self.counts[op] += 1
+        self.seconds[op] += seconds
+        if error:
+            self.errors[op] += 1
+        if bytes_written:
+            self.bytes_written[op] += bytes_written
+    
+    @contextmanager
+    def measure(self, op: str):
+        """Time the enclosed block as one call of ``op``."""
+        start = time.perf_counter()
+        error = True
+        try:
+            yield
+            error = False
+        finally:
+            self.record(op, time.perf_counter() - start, error)
+    
+    def percentile(self, op: str, fraction: float) -> float:
+        """Approximate latency in seconds below which ``fraction`` of the calls fall."""
+        histogram = self._histograms.get(op)
+        if not histogram:
+            return 0.0
+        rank = max(1, int(round(fraction * self.counts[op])))
+        seen = 0
+        for index, count in enumerate(histogram):
+            seen += count
+            if seen >= rank:
+                return self._bucket_seconds(index)
+        return self._bucket_seconds(self.BUCKETS - 1)
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, throughput, p50/p99 latency (ms) and bytes per call of every operation."""
+        return {op: {
+            'count': count,
+            'errors': self.errors[op],
+            'ops_per_sec': count / self.seconds[op] if self.seconds[op] else 0.0,
+            'p50_ms': self.percentile(op, 0.50) * 1000,
+            'p99_ms': self.percentile(op, 0.99) * 1000,
+            'bytes_per_call': self.bytes_written[op] / count
+        } for op, count in sorted(self.counts.items())}
+    
+    def report(self) -> str:
+        """The summary as a fixed-width table."""
+        lines = [f"{'Operation':<14} {'Calls':>8} {'Errors':>7} {'Ops/s':>12} "
+                 f"{'p50 ms':>10} {'p99 ms':>10} {'Bytes/call':>11}"]
+        for op, row in self.summary().items():
+            lines.append(f"{op:<14} {row['count']:>8} {row['errors']:>7} {row['ops_per_sec']:>12.1f} "
+                         f"{row['p50_ms']:>10.3f} {row['p99_ms']:>10.3f} {row['bytes_per_call']:>11.0f}")
+        return "\n".join(lines)
+    
+    def reset(self):
+        """Forget everything recorded so far."""
+        self.__init__()
+
+def instrumented(op: str):
+    """Record calls of a ContactManager method in ``self.metrics`` when metrics are enabled.
+    
+    With metrics off the wrapper costs one attribute check per call.
+    """
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            written = self.storage.bytes_written
+            start = time.perf_counter()
+            error = True
+            try:
+                result = method(self, *args, **kwargs)
+                error = False
+                return result
+            finally:
+                metrics.record(op, time.perf_counter() - start, error, self.storage.bytes_written - written)
+        return wrapper
+    return decorate
+
+def instrumented_iterator(op: str):
+    """Like instrumented, for ContactManager methods that return an iterator.
+    
+    Only the time spent producing items counts, not the time the caller
+    spends between them (such as waiting for the next page to be asked
+    for); it is recorded as one call when the iterator is exhausted or
+    discarded.
+    """
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                iterator = iter(method(self, *args, **kwargs))
+            except BaseException:
+                metrics.record(op, time.perf_counter() - start, True)
+                raise
+            return _timed_iteration(iterator, metrics, op, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+def _timed_iteration(iterator: Iterator, metrics: OperationMetrics, op: str, elapsed: float) -> Iterator:
+    """Yield from ``iterator``, adding the time each item takes to ``elapsed`` and recording it at the end."""
+    error = True
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                error = False
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    except GeneratorExit:
+        error = False
+        raise
+    finally:
+        metrics.record(op, elapsed, error)
+
+class ContactManager:
+    """Main contact management class with all CRUD operations."""
+    
+    def __init__(self, filename: str = "contacts.json", storage: Optional[JsonFileStorage] = None,
+                 columnar: bool = False, metrics: Optional[OperationMetrics] = None):
+        self.filename = filename
+        # Opt-in instrumentation of the @instrumented methods
+        self.metrics = metrics
+        # Single changes are appended to a journal instead of rewriting the whole file
+        self.storage = storage if storage is not None else JournalStorage(filename)
+        # A ContactStore trades attribute access speed for a smaller footprint
+        self.columnar = columnar
+        self.contacts = ContactStore() if columnar else ContactList()
+        self.id_allocator = IdAllocator()
+        # Primary (id) and unique (phone) indexes kept in step with self.contacts
+        self._by_id: Dict[int, Contact] = {}
+        self._by_phone: Dict[str, Contact] = {}
+        # Sorted views and statistics counters, maintained on every mutation
+        self._name_order = SortedKeys()    # (lowercased name, id)
+        self._recent_order = SortedKeys()  # (created_at, id)
+        self._with_email = 0
+        self._with_address = 0
+        # Built on the first search so loads and bulk imports do not pay for it
+        self._search_index: Optional[NGramIndex] = None
+        self._fuzzy_index: Optional[FuzzyIndex] = None
+        # Mutations buffered by batch() until the outermost block exits
+        self._pending: Optional[List[tuple]] = None
+        # Sorted-view keys collected during a bulk import, sorted in once at the end
+        self._view_backlog: Optional[tuple] = None
+        self.load_contacts()
+    
+    @staticmethod
+    def _phone_key(phone: str) -> str:
+        """Normalize a phone number into its index key."""
+        return canonical_phone(phone)
+    
+    def _index_contact(self, contact: Contact, phone_key: Optional[str] = None):
+        """Add a contact to the lookup indexes, sorted views and counters."""
+        self._by_id[contact.id] = contact
+        self._by_phone[phone_key or self._phone_key(contact.phone)] = contact
+        if self._view_backlog is not None:
+            self._view_backlog[0].append((contact.name.lower(), contact.id))
+            self._view_backlog[1].append((contact.created_at, contact.id))
+        else:
+            self._name_order.add((contact.name.lower(), contact.id))
+            self._recent_order.add((contact.created_at, contact.id))
+        self._count_contact(contact, 1)
+        if self._search_index is not None:
+            self._search_index.add(contact)
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.add(contact)
+    
+    def _unindex_contact(self, contact: Contact):
+        """Remove a contact from the lookup indexes, sorted views and counters.
+        
+        The search index is left alone: it replaces entries in place on update
+        and is cleared separately on delete, which keeps result order stable.
+        """
+        if self._by_id.get(contact.id) is contact:
+            del self._by_id[contact.id]
+        key = self._phone_key(contact.phone)
+        if self._by_phone.get(key) is contact:
+            del self._by_phone[key]
+        self._name_order.remove((contact.name.lower(), contact.id))
+        self._recent_order.remove((contact.created_at, contact.id))
+        self._count_contact(contact, -1)
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.remove(contact.id)
+    
+    def _count_contact(self, contact: Contact, delta: int):
+        """Apply a contact to the live statistics counters."""
+        if contact.email:
+            self._with_email += delta
+        if contact.address:
+            self._with_address += delta
+    
+    def _rebuild_indexes(self):
+        """Rebuild all lookup indexes, sorted views and counters from the contact list."""
+        self._by_id = {}
+        self._by_phone = {}
+        self._search_index = None
+        self._fuzzy_index = None
+        self._with_email = 0
+        self._with_address = 0
+        name_order = []
+        recent_order = []
+        for contact in self.contacts:
+            self._by_id[contact.id] = contact
+            self._by_phone[self._phone_key(contact.phone)] = contact
+            name_order.append((contact.name.lower(), contact.id))
+            recent_order.append((contact.created_at, contact.id))
+            self._count_contact(contact, 1)
+        self._name_order = SortedKeys(name_order)
+        self._recent_order = SortedKeys(recent_order)
+    
+    @instrumented('add')
+    def add_contact(self, name: str, phone: str, email: str = "", address: str = "") -> Contact:
+        """Add a new contact to the list."""
+        contact = self._insert_contact(name, phone, email, address)
+        self._persist('add', contact.to_dict())
+        return contact
+    
+    def _insert_contact(self, name: str, phone: str, email: str = "", address: str = "",
+                        phone_key: Optional[str] = None) -> Contact:
+        """Validate, store and index a new contact without persisting it."""
+        # Validate required fields
+        check_text_fields(name=name, phone=phone, email=email, address=address)
+        if not name.strip():
+            raise ValueError("Name cannot be empty")
+        if not phone.strip():
+            raise ValueError("Phone number cannot be empty")
+        
+        # Check for duplicate phone numbers, in any formatting
+        phone_key = phone_key or self._phone_key(phone)
+        if phone_key in self._by_phone:
+            raise ValueError("A contact with this phone number already exists")
+        
+        contact = Contact(name, phone, email, address, contact_id=self.id_allocator.allocate())
+        if self.columnar:
+            contact = self.contacts.append(contact)
+        else:
+            self.contacts.append(contact)
+        self._index_contact(contact, phone_key)
+        return contact
+    
+    @instrumented('import')
+    def import_contacts(self, path: str, format: Optional[str] = None, batch_size: int = 10_000) -> Dict[str, int]:
+        """Stream contacts from a CSV, JSON Lines or vCard file into the book.
+        
+        Rows are validated and checked against the phone index as they are
+        read, so duplicates inside the file are caught too, and rows with a
+        field that is not text count as invalid. On appending
+        storage, accepted contacts are persisted with one write per batch,
+        keeping the buffered records bounded by the batch size; storage that
+        rewrites the whole book is written once, after the last row. The
+        format is taken from the file extension unless given.
+        """
+        reader = CONTACT_FORMATS[_resolve_format(path, format)][0]
+        counts = {'imported': 0, 'duplicates': 0, 'invalid': 0}
+        batch = []
+        # Storage that rewrites the whole book is written once, when the import is done
+        with nullcontext() if self.storage.appends else self.batch():
+            try:
+                with open(path, 'r', newline='', encoding='utf-8') as f, self._bulk_views():
+                    for fields in reader(f):
+                        try:
+                            check_text_fields(**fields)
+                            phone_key = self._phone_key(fields['phone'])
+                            if phone_key in self._by_phone:
+                                counts['duplicates'] += 1
+                                continue
+                            contact = self._insert_contact(**fields, phone_key=phone_key)
+                        except ValueError:
+                            counts['invalid'] += 1
+                            continue
+                        batch.append(contact.to_dict())
+                        if len(batch) >= batch_size:
+                            counts['imported'] += len(batch)
+                            self._persist_many('add', batch)
+                            batch = []
+            finally:
+                # Contacts already taken in are persisted even if the file turns out to be bad further on
+                if batch:
+                    counts['imported'] += len(batch)
+                    self._persist_many('add', batch)
+        return counts
+    
+    @contextmanager
+    def _bulk_views(self):
+        """Collect sorted-view keys of contacts added inside the block and sort them in once.
+        
+        Only for blocks that add contacts: removals would miss keys still
+        in the backlog.
+        """
+        if self._view_backlog is not None:
+            yield
+            return
+        self._view_backlog = ([], [])
+        try:
+            yield
+        finally:
+            names, recents = self._view_backlog
+            self._view_backlog = None
+            if names:
+                self._name_order = SortedKeys(itertools.chain(self._name_order, names))
+                self._recent_order = SortedKeys(itertools.chain(self._recent_order, recents))
+    
+    @instrumented('export')
+    def export_contacts(self, path: str, format: Optional[str] = None) -> int:
+        """Stream every contact to a CSV, JSON Lines or vCard file; returns the count."""
+        writer = CONTACT_FORMATS[_resolve_format(path, format)][1]
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer(f, self.contacts)
+        return len(self.contacts)
+    
+    def get_contact_by_id(self, contact_id: int) -> Optional[Contact]:
+        """Get a contact by its ID."""
+        return self._by_id.get(contact_id)
+    
+    def get_contact_by_phone(self, phone: str) -> Optional[Contact]:
+        """Get a contact by phone number."""
+        return self._by_phone.get(self._phone_key(phone))
+    
+    def search_contacts(self, query: str) -> List[Contact]:
+        """Search contacts by name or phone number."""
+        return list(self.iter_search(query))
+    
+    @instrumented_iterator('search')
+    def iter_search(self, query: str, offset: int = 0, limit: Optional[int] = None) -> Iterator[Contact]:
+        """Yield search matches lazily in insertion order, skipping ``offset`` and stopping after ``limit``.
+        
+        Candidates are checked only as results are consumed, so the first
+        page of a broad query does not pay for the whole book.
+        """
+        if self._search_index is None:
+            self._search_index = NGramIndex()
+            for contact in self.contacts:
+                self._search_index.add(contact)
+        matches = self._search_index.iter_search(query.strip().lower())
+        by_id = self._by_id
+        for contact_id in itertools.islice(matches, offset, None if limit is None else offset + limit):
+            yield by_id[contact_id]
+    
+    @instrumented('fuzzy_search')
+    def fuzzy_search_contacts(self, query: str, limit: int = 10,
+                              max_distance: Optional[int] = None) -> List[tuple]:
+        """Rank contacts whose names are close to the query in spelling or sound.
+        
+        Returns up to ``limit`` (contact, score) pairs, best first, with
+        scores between 0 and 1. ``max_distance`` overrides the number of
+        typos tolerated per word, which otherwise grows with word length.
+        """
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex()
+            for contact in self.contacts:
+                self._fuzzy_index.add(contact)
+        return [(self._by_id[contact_id], score)
+                for score, contact_id in self._fuzzy_index.search(query, limit, max_distance)]
+    
+    @instrumented('update')
+    def update_contact(self, contact_id: int, name: str = None, phone: str = None, 
+                      email: str = None, address: str = None) -> bool:
+        """Update contact details."""
+        # Checked before the contact leaves its indexes, so a bad field cannot strand it there
+        check_text_fields(**{field: value for field, value in zip(CONTACT_FIELDS, (name, phone, email, address))
+                             if value is not None})
+        contact = self.get_contact_by_id(contact_id)
+        if not contact:
+            return False
+        
+        # Check for duplicate phone if phone is being updated
+        if phone and phone.strip() != contact.phone:
+            existing_contact = self.get_contact_by_phone(phone)
+            if existing_contact and existing_contact.id != contact_id:
+                raise ValueError("A contact with this phone number already exists")
+        
+        self._unindex_contact(contact)
+        contact.update_details(name, phone, email, address)
+        self._index_contact(contact)
+        self._persist('update', contact.to_dict())
+        return True
+    
+    @instrumented('delete')
+    def delete_contact(self, contact_id: int) -> bool:
+        """Delete a contact from the list."""
+        contact = self.get_contact_by_id(contact_id)
+        if contact:
+            self._unindex_contact(contact)
+            if self._search_index is not None:
+                self._search_index.remove(contact_id)
+            self.contacts.remove(contact)
+            self._persist('delete', {'id': contact_id})
+            return True
+        return False
+    
+    def _duplicate_keys(self, contact: BaseContact) -> Iterator[tuple]:
+        """Blocking keys under which two contacts count as the same person."""
+        yield ('phone', self._phone_key(contact.phone))
+        email = contact.email.strip().lower()
+        if email:
+            yield ('email', email)
+        address = " ".join(WORDS.findall(contact.address.lower()))
+        if address:
+            yield ('name', " ".join(WORDS.findall(contact.name.lower())), address)
+    
+    def find_duplicates(self) -> List[List[Contact]]:
+        """Group contacts sharing a canonical phone, an email, or a name and address.
+        
+        Each contact is filed under its duplicate keys in one pass and a
+        union-find joins contacts that share any key, so the cost is linear
+        in the book size instead of comparing every pair. Groups are ordered
+        oldest contact first.
+        """
+        parent: Dict[int, int] = {}
+        
+        def find(contact_id: int) -> int:
+            while parent[contact_id] != contact_id:
+                parent[contact_id] = parent[parent[contact_id]]
+                contact_id = parent[contact_id]
+            return contact_id
+        
+        first_with_key: Dict[tuple, int] = {}
+        for contact in self._by_id.values():
+            parent[contact.id] = contact.id
+            for key in self._duplicate_keys(contact):
+                other = first_with_key.setdefault(key, contact.id)
+                if other != contact.id:
+                    parent[find(contact.id)] = find(other)
+        groups: Dict[int, List[Contact]] = defaultdict(list)
+        for contact in self._by_id.values():
+            groups[find(contact.id)].append(contact)
+        return [sorted(group, key=lambda contact: (contact.created_at, contact.id))
+                for group in groups.values() if len(group) > 1]
+    
+    @instrumented('merge')
+    def merge_duplicates(self) -> int:
+        """Fold the contacts in each duplicate group that share a phone; returns the number removed.
+        
+        Contacts of a group whose canonical phones differ are different
+        people sharing an email or an address, such as a family, and are
+        all kept. Email and address fields the survivor lacks are taken
+        from the newest duplicate that has them. The whole pass is
+        persisted once.
+        """
+        removed = 0
+        with self.batch():
+            for group in self.find_duplicates():
+                same_phone: Dict[str, List[Contact]] = defaultdict(list)
+                for contact in group:
+                    same_phone[self._phone_key(contact.phone)].append(contact)
+                for keeper, *duplicates in same_phone.values():
+                    if duplicates:
+                        removed += self._merge_into(keeper, duplicates)
+        return removed
+    
+    def _merge_into(self, keeper: Contact, duplicates: List[Contact]) -> int:
+        """Delete the duplicates of a contact, filling in its missing fields from them; returns how many."""
+        fill = {}
+        for field in ('email', 'address'):
+            if not getattr(keeper, field):
+                values = [getattr(contact, field) for contact in duplicates if getattr(contact, field)]
+                if values:
+                    fill[field] = values[-1]
+        for contact in duplicates:
+            self.delete_contact(contact.id)
+        # Files saved before canonical keys can hold several contacts per key
+        self._by_phone[self._phone_key(keeper.phone)] = keeper
+        if fill:
+            self.update_contact(keeper.id, **fill)
+        return len(duplicates)
+    
+    @instrumented('list_all')
+    def get_all_contacts(self) -> List[Contact]:
+        """Get all contacts sorted by name."""
+        by_id = self._by_id
+        return [by_id[contact_id] for _, contact_id in self._name_order]
+    
+    @instrumented_iterator('list')
+    def iter_contacts(self, offset: int = 0, limit: Optional[int] = None,
+                      after: Optional[BaseContact] = None) -> Iterator[Contact]:
+        """Yield contacts sorted by name, one at a time.
+        
+        ``after`` is a cursor: the last contact of the previous page, from
+        which the listing resumes even if contacts were added or deleted in
+        between. ``offset`` skips further rows. Each row costs O(log N)
+        however deep the page is.
+        """
+        name_order = self._name_order
+        start = offset
+        if after is not None:
+            start += name_order.bisect_right((after.name.lower(), after.id))
+        stop = len(name_order) if limit is None else min(len(name_order), start + limit)
+        by_id = self._by_id
+        for i in range(start, stop):
+            if i >= len(name_order):
+                return
+            yield by_id[name_order[i][1]]
+    
+    def get_recent_contacts(self, count: int = 3) -> List[Contact]:
+        """Get the most recently created contacts, newest first."""
+        by_id = self._by_id
+        recent_order = self._recent_order
+        return [by_id[recent_order[i][1]] for i in range(len(recent_order) - 1, len(recent_order) - 1 - count, -1)
+                if i >= 0]
+    
+    def get_contact_count(self) -> int:
+        """Get total number of contacts."""
+        return len(self.contacts)
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """Get contact totals from the live counters."""
+        return {
+            'total': len(self.contacts),
+            'with_email': self._with_email,
+            'with_address': self._with_address
+        }
+    
+    def _snapshot(self) -> List[Dict]:
+        """Serialize every contact for a full save."""
+        return [contact.to_dict() for contact in self.contacts]
+    
+    @contextmanager
+    def batch(self):
+        """Buffer every mutation made inside the block and persist them with one write.
+        
+        Blocks may nest; only the outermost one flushes to storage.
+        """
+        if self._pending is not None:
+            yield self
+            return
+        self._pending = []
+        try:
+            yield self
+        finally:
+            pending, self._pending = self._pending, None
+            if pending:
+                try:
+                    self.storage.log_batch(pending, self._snapshot)
+                except Exception as e:
+                    print(f"Error saving contacts: {e}")
+    
+    def _persist(self, op: str, data: Dict):
+        """Hand a single mutation to the storage backend."""
+        self.storage.next_id = max(self.storage.next_id, data['id'] + 1)
+        if self._pending is not None:
+            self._pending.append((op, data))
+            return
+        try:
+            self.storage.log(op, data, self._snapshot)
+        except Exception as e:
+            print(f"Error saving contacts: {e}")
+    
+    def _persist_many(self, op: str, items: List[Dict]):
+        """Hand a batch of mutations to the storage backend in one write."""
+        self.storage.next_id = max([self.storage.next_id] + [data['id'] + 1 for data in items])
+        if self._pending is not None:
+            self._pending.extend((op, data) for data in items)
+            return
+        try:
+            self.storage.log_many(op, items, self._snapshot)
+        except Exception as e:
+            print(f"Error saving contacts: {e}")
+    
+    @instrumented('save')
+    def save_contacts(self):
+        """Save all contacts through the storage backend."""
+        try:
+            records = self._snapshot()
+            self.storage.next_id = max([self.storage.next_id] + [record['id'] + 1 for record in records])
+            self.storage.save(records)
+        except Exception as e:
+            print(f"Error saving contacts: {e}")
+    
+    @instrumented('load')
+    def load_contacts(self):
+        """Load contacts from the storage backend."""
+        repaired = False
+        try:
+            data = self.storage.load()
+            self.id_allocator.seed(max([self.storage.next_id - 1] + [record['id'] for record in data]))
+            repaired = self._repair_duplicate_ids(data)
+            contacts = (Contact.from_dict(contact_data, self.id_allocator) for contact_data in data)
+            self.contacts = ContactStore(contacts) if self.columnar else ContactList(contacts)
+        except Exception as e:
+            print(f"Error loading contacts: {e}")
+            self.contacts = ContactStore() if self.columnar else ContactList()
+        self._rebuild_indexes()
+        if repaired:
+            self.save_contacts()
+    
+    def _repair_duplicate_ids(self, data: List[Dict]) -> bool:
+        """Give fresh ids to records whose id is already taken (older files could repeat them)."""
+        seen = set()
+        repaired = False
+        for record in data:
+            if record['id'] in seen:
+                record['id'] = self.id_allocator.allocate()
+                repaired = True
+            seen.add(record['id'])
+        return repaired
+
+class ContactSnapshot:
+    """Immutable point-in-time view of a ContactManager, shared by readers.
+    
+    Contacts are held as plain dicts (the same records that are persisted),
+    so nothing a reader holds is ever mutated. A new snapshot shares the
+    previous one's maps (ChunkedMap) and name order (a SortedKeys fork),
+    copying only the chunks and buckets the changed contacts fall in, so
+    publishing a write batch costs O(changes) chunk copies plus O(N / chunk
+    size) to copy the chunk tables.
+    """
+    
+    __slots__ = ('version', 'records', 'statistics', '_by_phone', '_name_order', '_texts')
+    
+    def __init__(self, version: int, records: ChunkedMap, by_phone: ChunkedMap,
+                 name_order: SortedKeys, texts: ChunkedMap, statistics: Dict[str, int]):
+        self.version = version
+        self.records = records
+        self.statistics = statistics
+        self._by_phone = by_phone
+        self._name_order = name_order
+        self._texts = texts
+    
+    @classmethod
+    def capture(cls, manager: ContactManager) -> 'ContactSnapshot':
+        """Take a full snapshot of the manager's current state."""
+        snapshot = cls(0, ChunkedMap(), ChunkedMap(), SortedKeys(manager._name_order), ChunkedMap(),
+                       manager.get_statistics())
+        for contact in manager.contacts:
+            snapshot._put(contact)
+        return snapshot
+    
+    def advance(self, manager: ContactManager, changed_ids: Iterable[int]) -> 'ContactSnapshot':
+        """Derive the next snapshot after the given contacts were added, updated or deleted."""
+        snapshot = ContactSnapshot(self.version + 1, self.records.copy(), self._by_phone.copy(),
+                                   self._name_order.fork(), self._texts.copy(), manager.get_statistics())
+        for contact_id in changed_ids:
+            old = snapshot.records.pop(contact_id, None)
+            if old is not None:
+                key = ContactManager._phone_key(old['phone'])
+                if snapshot._by_phone.get(key) == contact_id:
+                    snapshot._by_phone.pop(key)
+                snapshot._name_order.remove((old['name'].lower(), contact_id))
+            contact = manager.get_contact_by_id(contact_id)
+            if contact is not None:
+                snapshot._put(contact)
+                snapshot._name_order.add((contact.name.lower(), contact_id))
+            else:
+                snapshot._texts.pop(contact_id, None)
+        return snapshot
+    
+    def _put(self, contact: BaseContact):
+        """Record a contact while the snapshot is still being built."""
+        self.records[contact.id] = contact.to_dict()
+        self._by_phone[ContactManager._phone_key(contact.phone)] = contact.id
+        self._texts[contact.id] = NGramIndex._text_of(contact)
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def get(self, contact_id: int) -> Optional[Dict]:
+        """Get a contact by its ID."""
+        return self.records.get(contact_id)
+    
+    def get_by_phone(self, phone: str) -> Optional[Dict]:
+        """Get a contact by phone number."""
+        contact_id = self._by_phone.get(ContactManager._phone_key(phone))
+        return self.records[contact_id] if contact_id is not None else None
+    
+    def list(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """Get a page of contacts sorted by name."""
+        records = self.records
+        return [records[contact_id] for _, contact_id in itertools.islice(self._name_order.iter_from(offset), limit)]
+    
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """Search contacts by any field with a scan of the snapshot's search text."""
+        query = query.strip().lower()
+        records = self.records
+        matches = (records[contact_id] for contact_id, text in self._texts.items() if query in text)
+        return list(itertools.islice(matches, limit))
+
+class ContactService:
+    """Thread-safe front for a ContactManager shared by many clients.
+    
+    Every mutation is queued to a single writer thread, which applies
+    whatever has queued up as one batch, persists the batch with a single
+    storage write and then publishes a new ContactSnapshot. Reads only
+    dereference the current snapshot, so they never lock, never wait for
+    writers and always see a consistent address book. A write call returns
+    once its batch is persisted and visible to subsequent reads.
+    """
+    
+    def __init__(self, manager: Optional[ContactManager] = None, max_batch: int = 1024):
+        self.manager = manager if manager is not None else ContactManager(storage=JournalStorage())
+        self.max_batch = max_batch
+        self._snapshot = ContactSnapshot.capture(self.manager)
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="contact-writer", daemon=True)
+        self._writer.start()
+    
+    def snapshot(self) -> ContactSnapshot:
+        """The latest published snapshot; hold on to it for several consistent reads."""
+        return self._snapshot
+    
+    def get_contact(self, contact_id: int) -> Optional[Dict]:
+        """Get a contact by its ID."""
+        return self._snapshot.get(contact_id)
+    
+    def list_contacts(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """Get a page of contacts sorted by name."""
+        return self._snapshot.list(offset, limit)
+    
+    def search_contacts(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """Search contacts by name, phone, email or address."""
+        return self._snapshot.search(query, limit)
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """Get contact totals as of the latest snapshot."""
+        return self._snapshot.statistics
+    
+    def add_contact(self, name: str, phone: str, email: str = "", address: str = "") -> Dict:
+        """Add a new contact and return its record."""
+        return self._submit('add_contact', name, phone, email, address)
+    
+    def update_contact(self, contact_id: int, name: str = None, phone: str = None,
+                       email: str = None, address: str = None) -> bool:
+        """Update contact details."""
+        return self._submit('update_contact', contact_id, name, phone, email, address)
+    
+    def delete_contact(self, contact_id: int) -> bool:
+        """Delete a contact."""
+        return self._submit('delete_contact', contact_id)
+    
+    def _submit(self, method: str, *args):
+        """Queue a mutation for the writer thread and wait for its result."""
+        if self._closed:
+            raise RuntimeError("Contact service is closed")
+        future = Future()
+        self._queue.put((method, args, future))
+        return future.result()
+    
+    def _run(self):
+        """Writer loop: drain the queue in batches until close() is called."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            requests = [request for request in batch if request is not None]
+            if requests:
+                self._apply(requests)
+            if len(requests) < len(batch):
+                return
+    
+    def _apply(self, requests: List[tuple]):
+        """Apply a batch of mutations, persist it once and publish the new snapshot."""
+        manager = self.manager
+        outcomes = []
+        changed = set()
+        with manager.batch():
+            for method, args, future in requests:
+                try:
+                    result = getattr(manager, method)(*args)
+                except Exception as e:
+                    outcomes.append((future, None, e))
+                    continue
+                changed.add(result.id if isinstance(result, BaseContact) else args[0])
+                outcomes.append((future, result, None))
+        snapshot = self._snapshot.advance(manager, changed) if changed else self._snapshot
+        self._snapshot = snapshot
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            elif isinstance(result, BaseContact):
+                future.set_result(snapshot.get(result.id))
+            else:
+                future.set_result(result)
+    
+    def close(self):
+        """Finish queued writes, stop the writer thread and release storage."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._writer.join()
+            self.manager.storage.close()
+
+class ContactRequestHandler(BaseHTTPRequestHandler):
+    """JSON-over-HTTP front end for a ContactService.
+    
+    GET /contacts?offset=&limit=, GET /contacts/<id>, GET /search?q=&limit=,
+    GET /stats, POST /contacts, PATCH /contacts/<id>, DELETE /contacts/<id>.
+    """
+    
+    service: ContactService = None
+    
+    # Query parameters that must be whole numbers
+    INTEGER_PARAMS = ('offset', 'limit')
+    
+    def do_GET(self):
+        route = self._route()
+        if route is None:
+            return
+        path, params = route
+        service = self.service
+        if path == ['contacts']:
+            self._reply(200, service.list_contacts(params.get('offset', 0), params.get('limit')))
+        elif len(path) == 2 and path[0] == 'contacts':
+            contact = service.get_contact(path[1])
+            self._reply(200, contact) if contact else self._reply(404, {'error': "Contact not found"})
+        elif path == ['search']:
+            self._reply(200, service.search_contacts(params.get('q', ''), params.get('limit')))
+        elif path == ['stats']:
+            self._reply(200, service.get_statistics())
+        else:
+            self._reply(404, {'error': "Not found"})
+    
+    def do_POST(self):
+        route = self._route()
+        if route is None:
+            return
+        if route[0] != ['contacts']:
+            return self._reply(404, {'error': "Not found"})
+        body = self._body()
+        if body is None:
+            return
+        self._write(201, lambda: self.service.add_contact(
+            body.get('name', ''), body.get('phone', ''), body.get('email', ''), body.get('address', '')))
+    
+    def do_PATCH(self):
+        route = self._route()
+        if route is None:
+            return
+        path, _ = route
+        if len(path) != 2 or path[0] != 'contacts':
+            return self._reply(404, {'error': "Not found"})
+        contact_id = path[1]
+        body = self._body()
+        if body is None:
+            return
+        fields = [body.get(field) for field in ('name', 'phone', 'email', 'address')]
+        self._write(200, lambda: self.service.update_contact(contact_id, *fields) and self.service.get_contact(contact_id))
+    
+    def do_DELETE(self):
+        route = self._route()
+        if route is None:
+            return
+        path, _ = route
+        if len(path) != 2 or path[0] != 'contacts':
+            return self._reply(404, {'error': "Not found"})
+        contact_id = path[1]
+        self._write(200, lambda: self.service.delete_contact(contact_id) and {'id': contact_id})
+    
+    def _route(self):
+        """Split the request path into segments and flatten the query string.
+        
+        The id in /contacts/<id> and the INTEGER_PARAMS are converted to int;
+        if one is not a number, replies 400 and returns None.
+        """
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = [segment for segment in url.path.split('/') if segment]
+        try:
+            for key in self.INTEGER_PARAMS:
+                if key in params:
+                    params[key] = int(params[key])
+            if len(path) == 2 and path[0] == 'contacts':
+                path[1] = int(path[1])
+        except ValueError:
+            self._reply(400, {'error': "Contact ids, offset and limit must be whole numbers"})
+            return None
+        return path, params
+    
+    def _body(self) -> Optional[Dict]:
+        """The request's JSON object; replies 400 and returns None if it is not one or a field is not text."""
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            self._reply(400, {'error': f"Invalid request body: {e}"})
+            return None
+        if not isinstance(body, dict):
+            self._reply(400, {'error': "The request body must be a JSON object"})
+            return None
+        try:
+            # null leaves a field out, as if it were not given
+            check_text_fields(**{field: body[field] for field in CONTACT_FIELDS if body.get(field) is not None})
+        except ValueError as e:
+            self._reply(400, {'error': str(e)})
+            return None
+        return body
+    
+    def _write(self, status: int, action: Callable):
+        """Run a mutation and map its outcome onto an HTTP response."""
+        try:
+            result = action()
+        except ValueError as e:
+            return self._reply(400, {'error': str(e)})
+        if not result:
+            return self._reply(404, {'error': "Contact not found"})
+        self._reply(status, result)
+    
+    def _reply(self, status: int, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        """Keep request logging off the console."""
+
+def serve_contacts(service: ContactService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Create a threaded HTTP server exposing the service; call serve_forever() on it."""
+    handler = type('BoundContactRequestHandler', (ContactRequestHandler,), {'service': service})
+    return ThreadingHTTPServer((host, port), handler)
+
+class SQLiteContactManager:
+    """ContactManager alternative that keeps the address book in SQLite.
+    
+    Nothing is loaded into memory up front: lookups use the primary key and
+    the unique index on phone_key, the canonical_phone() form of the phone
+    number, so one number written two ways is still a duplicate; listings page through an index on name with
+    ORDER BY, and search_contacts runs against an FTS5 trigram table. Updates
+    and deletes reach the FTS table through triggers; inserts are indexed
+    explicitly so a bulk import can index a whole batch with one
+    INSERT ... SELECT, several times faster than a per-row trigger. The
+    database runs in WAL mode, and bulk imports insert each batch in one
+    transaction. The public methods mirror ContactManager
+    so ContactApp can use either.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS contacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            phone TEXT NOT NULL,
+            email TEXT NOT NULL DEFAULT '',
+            address TEXT NOT NULL DEFAULT '',
+            created_at INTEGER NOT NULL,
+            updated_at INTEGER NOT NULL,
+            phone_key TEXT NOT NULL DEFAULT ''
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS contacts_phone_key ON contacts (phone_key);
+        CREATE INDEX IF NOT EXISTS contacts_name ON contacts (name COLLATE NOCASE, id);
+        CREATE INDEX IF NOT EXISTS contacts_created ON contacts (created_at, id);
+        CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5 (
+            name, phone, email, address, content='contacts', content_rowid='id', tokenize='trigram'
+        );
+        CREATE TRIGGER IF NOT EXISTS contacts_ad AFTER DELETE ON contacts BEGIN
+            INSERT INTO contacts_fts (contacts_fts, rowid, name, phone, email, address)
+            VALUES ('delete', old.id, old.name, old.phone, old.email, old.address);
+        END;
+        CREATE TRIGGER IF NOT EXISTS contacts_au AFTER UPDATE ON contacts BEGIN
+            INSERT INTO contacts_fts (contacts_fts, rowid, name, phone, email, address)
+            VALUES ('delete', old.id, old.name, old.phone, old.email, old.address);
+            INSERT INTO contacts_fts (rowid, name, phone, email, address)
+            VALUES (new.id, new.name, new.phone, new.email, new.address);
+        END;
+    """
+    COLUMNS = "id, name, phone, email, address, created_at, updated_at"
+    INDEX_NEW_ROWS = ("INSERT INTO contacts_fts (rowid, name, phone, email, address) "
+                      "SELECT id, name, phone, email, address FROM contacts WHERE id > ?")
+    PAGE_SIZE = 1000
+    
+    def __init__(self, filename: str = "contacts.db"):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._in_batch = False
+        self.load_contacts()
+    
+    @staticmethod
+    def _contact_from_row(row) -> Contact:
+        """Build a Contact from a row selected with COLUMNS."""
+        contact = Contact.__new__(Contact)
+        (contact.id, contact.name, contact.phone, contact.email,
+         contact.address, contact.created_at, contact.updated_at) = row
+        return contact
+    
+    def _select(self, where: str = "", params=()) -> List[Contact]:
+        rows = self.conn.execute(f"SELECT {self.COLUMNS} FROM contacts {where}", params)
+        return [self._contact_from_row(row) for row in rows]
+    
+    def _iter_select(self, where: str = "", params=()) -> Iterator[Contact]:
+        """Like _select, but builds each contact only as its row is stepped to."""
+        for row in self.conn.execute(f"SELECT {self.COLUMNS} FROM contacts {where}", params):
+            yield self._contact_from_row(row)
+    
+    @staticmethod
+    def _validate(name: str, phone: str, email: str = "", address: str = ""):
+        check_text_fields(name=name, phone=phone, email=email, address=address)
+        if not name.strip():
+            raise ValueError("Name cannot be empty")
+        if not phone.strip():
+            raise ValueError("Phone number cannot be empty")
+    
+    def add_contact(self, name: str, phone: str, email: str = "", address: str = "") -> Contact:
+        """Add a new contact to the database."""
+        self._validate(name, phone, email, address)
+        now = int(time.time())
+        try:
+            with self._transaction():
+                cursor = self.conn.execute(
+                    "INSERT INTO contacts (name, phone, email, address, created_at, updated_at, phone_key) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (name.strip(), phone.strip(), email.strip(), address.strip(), now, now, canonical_phone(phone)))
+                self.conn.execute(self.INDEX_NEW_ROWS, (cursor.lastrowid - 1,))
+        except sqlite3.IntegrityError:
+            raise ValueError("A contact with this phone number already exists")
+        return self.get_contact_by_id(cursor.lastrowid)
+    
+    def get_contact_by_id(self, contact_id: int) -> Optional[Contact]:
+        """Get a contact by its ID."""
+        found = self._select("WHERE id = ?", (contact_id,))
+        return found[0] if found else None
+    
+    def get_contact_by_phone(self, phone: str) -> Optional[Contact]:
+        """Get a contact by phone number, however it is punctuated."""
+        found = self._select("WHERE phone_key = ?", (canonical_phone(phone),))
+        return found[0] if found else None
+    
+    def search_contacts(self, query: str) -> List[Contact]:
+        """Search contacts by name, phone, email or address (substring, case-insensitive)."""
+        return list(self.iter_search(query))
+    
+    def iter_search(self, query: str, offset: int = 0, limit: Optional[int] = None) -> Iterator[Contact]:
+        """Yield search matches in id order as rows are stepped, with LIMIT/OFFSET applied by SQLite."""
+        query = query.strip()
+        page = (-1 if limit is None else limit, offset)
+        if len(query) < 3:
+            # The trigram tokenizer needs three characters; short queries scan
+            pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            return self._iter_select(
+                "WHERE name LIKE ?1 ESCAPE '\\' OR phone LIKE ?1 ESCAPE '\\' "
+                "OR email LIKE ?1 ESCAPE '\\' OR address LIKE ?1 ESCAPE '\\' ORDER BY id LIMIT ?2 OFFSET ?3",
+                (pattern, *page))
+        phrase = '"' + query.replace('"', '""') + '"'
+        return self._iter_select(
+            "WHERE id IN (SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH ?) ORDER BY id LIMIT ? OFFSET ?",
+            (phrase, *page))
+    
+    def update_contact(self, contact_id: int, name: str = None, phone: str = None,
+                       email: str = None, address: str = None) -> bool:
+        """Update contact details."""
+        changes = {field: value for field, value in zip(CONTACT_FIELDS, (name, phone, email, address))
+                   if value is not None}
+        check_text_fields(**changes)
+        changes = {field: value.strip() for field, value in changes.items()}
+        if phone is not None:
+            changes['phone_key'] = canonical_phone(phone)
+        changes['updated_at'] = int(time.time())
+        assignments = ", ".join(f"{field} = ?" for field in changes)
+        try:
+            with self._transaction():
+                cursor = self.conn.execute(f"UPDATE contacts SET {assignments} WHERE id = ?",
+                                           (*changes.values(), contact_id))
+        except sqlite3.IntegrityError:
+            raise ValueError("A contact with this phone number already exists")
+        return cursor.rowcount > 0
+    
+    def delete_contact(self, contact_id: int) -> bool:
+        """Delete a contact from the database."""
+        with self._transaction():
+            cursor = self.conn.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
+        return cursor.rowcount > 0
+    
+    def iter_sorted_contacts(self, page_size: int = PAGE_SIZE) -> Iterator[Contact]:
+        """Yield all contacts ordered by name, one keyset-paginated query per page."""
+        page = self._select("ORDER BY name COLLATE NOCASE, id LIMIT ?", (page_size,))
+        while page:
+            yield from page
+            last = page[-1]
+            page = self._select(
+                "WHERE name COLLATE NOCASE >= ?1 AND (name COLLATE NOCASE > ?1 OR id > ?2) "
+                "ORDER BY name COLLATE NOCASE, id LIMIT ?3", (last.name, last.id, page_size))
+    
+    def get_all_contacts(self) -> List[Contact]:
+        """Get all contacts sorted by name."""
+        return list(self.iter_sorted_contacts())
+    
+    def iter_contacts(self, offset: int = 0, limit: Optional[int] = None,
+                      after: Optional[BaseContact] = None) -> Iterator[Contact]:
+        """Yield contacts sorted by name; ``after`` resumes after a previous page's last contact."""
+        where, params = "", ()
+        if after is not None:
+            where = "WHERE name COLLATE NOCASE >= ? AND (name COLLATE NOCASE > ? OR id > ?) "
+            params = (after.name, after.name, after.id)
+        return self._iter_select(f"{where}ORDER BY name COLLATE NOCASE, id LIMIT ? OFFSET ?",
+                                 (*params, -1 if limit is None else limit, offset))
+    
+    def get_recent_contacts(self, count: int = 3) -> List[Contact]:
+        """Get the most recently created contacts, newest first."""
+        return self._select("ORDER BY created_at DESC, id DESC LIMIT ?", (count,))
+    
+    def get_contact_count(self) -> int:
+        """Get total number of contacts."""
+        return self.conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """Get contact totals in one aggregate query."""
+        total, with_email, with_address = self.conn.execute(
+            "SELECT COUNT(*), COUNT(NULLIF(email, '')), COUNT(NULLIF(address, '')) FROM contacts").fetchone()
+        return {'total': total, 'with_email': with_email, 'with_address': with_address}
+    
+    def import_contacts(self, path: str, format: Optional[str] = None, batch_size: int = 10_000) -> Dict[str, int]:
+        """Stream contacts from a CSV, JSON Lines or vCard file, one transaction per batch."""
+        reader = CONTACT_FORMATS[_resolve_format(path, format)][0]
+        counts = {'imported': 0, 'duplicates': 0, 'invalid': 0}
+        batch = []
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            for fields in reader(f):
+                try:
+                    self._validate(**fields)
+                except ValueError:
+                    counts['invalid'] += 1
+                    continue
+                batch.append(fields)
+                if len(batch) >= batch_size:
+                    self._insert_batch(batch, counts)
+                    batch = []
+        if batch:
+            self._insert_batch(batch, counts)
+        return counts
+    
+    def _insert_batch(self, batch: List[Dict[str, str]], counts: Dict[str, int]):
+        """Insert a batch in one transaction, skipping phones that already exist."""
+        now = int(time.time())
+        rows = [(f['name'].strip(), f['phone'].strip(), f['email'].strip(), f['address'].strip(), now, now,
+                 canonical_phone(f['phone'])) for f in batch]
+        with self._transaction():
+            last_id = self._last_id()
+            inserted = self.conn.executemany(
+                "INSERT OR IGNORE INTO contacts (name, phone, email, address, created_at, updated_at, phone_key) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows).rowcount
+            self.conn.execute(self.INDEX_NEW_ROWS, (last_id,))
+        counts['imported'] += inserted
+        counts['duplicates'] += len(rows) - inserted
+    
+    def _last_id(self) -> int:
+        """Highest id in the table; new rows always get larger ids (AUTOINCREMENT)."""
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM contacts").fetchone()[0]
+    
+    def export_contacts(self, path: str, format: Optional[str] = None) -> int:
+        """Stream every contact to a CSV, JSON Lines or vCard file; returns the count."""
+        writer = CONTACT_FORMATS[_resolve_format(path, format)][1]
+        rows = self.conn.execute(f"SELECT {self.COLUMNS} FROM contacts ORDER BY id")
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer(f, map(self._contact_from_row, rows))
+        return self.get_contact_count()
+    
+    def migrate_from_json(self, json_filename: str = "contacts.json") -> int:
+        """Copy a contacts.json address book into an empty database, keeping ids and dates."""
+        if self.get_contact_count():
+            raise ValueError("Can only migrate into an empty database")
+        source = ContactManager(json_filename)
+        records = [(c.id, c.name, c.phone, c.email, c.address, c.created_at, c.updated_at, canonical_phone(c.phone))
+                   for c in source.contacts]
+        with self.conn:
+            self.conn.executemany(f"INSERT INTO contacts ({self.COLUMNS}, phone_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                  records)
+            self.conn.execute(self.INDEX_NEW_ROWS, (0,))
+            # Keep ids of contacts deleted before the migration from being reused
+            self.conn.execute("UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = 'contacts'",
+                              (source.storage.next_id - 1,))
+        return len(records)
+    
+    def save_contacts(self):
+        """Changes are committed as they happen; checkpoint the WAL into the database."""
+        self.conn.commit()
+        self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+    
+    @contextmanager
+    def batch(self):
+        """Run every change made inside the block as one transaction, committed once at the end."""
+        if self._in_batch:
+            yield self
+            return
+        self._in_batch = True
+        try:
+            with self.conn:
+                yield self
+        finally:
+            self._in_batch = False
+    
+    def _transaction(self):
+        """The connection as a per-call transaction, or a no-op inside batch()."""
+        return nullcontext() if self._in_batch else self.conn
+    
+    def load_contacts(self):
+        """Create the schema if the database is new, and add phone_key to one made before it."""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(contacts)")]
+        if columns and 'phone_key' not in columns:
+            self._add_phone_key()
+        with self.conn:
+            self.conn.executescript(self.SCHEMA)
+    
+    def _add_phone_key(self):
+        """Fill in phone_key and move the unique index onto it, in one transaction."""
+        self.conn.create_function('canonical_phone', 1, canonical_phone, deterministic=True)
+        try:
+            with self.conn:
+                self.conn.execute("BEGIN")
+                self.conn.execute("ALTER TABLE contacts ADD COLUMN phone_key TEXT NOT NULL DEFAULT ''")
+                self.conn.execute("UPDATE contacts SET phone_key = canonical_phone(phone)")
+                self.conn.execute("DROP INDEX IF EXISTS contacts_phone")
+                self.conn.execute("CREATE UNIQUE INDEX contacts_phone_key ON contacts (phone_key)")
+        except sqlite3.IntegrityError:
+            raise ValueError("Some contacts share a phone number written in different ways; "
+                             "merge them before opening this database") from None
+    
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+class ContactApp:
+    """Main application class with user interface."""
+    
+    # Rows per screen in the list view and contacts per screen in search results
+    LIST_PAGE_SIZE = 50
+    SEARCH_PAGE_SIZE = 10
+    
+    def __init__(self, contact_manager=None):
+        self.contact_manager = contact_manager if contact_manager is not None else ContactManager()
+    
+    def display_menu(self):
+        """Display the main menu."""
+        print("\n" + "="*60)
+        print("📞 CONTACT MANAGEMENT SYSTEM")
+        print("="*60)
+        print("1. 👤 Add New Contact")
+        print("2. 📋 View All Contacts")
+        print("3. 🔍 Search Contacts")
+        print("4. ✏️  Update Contact")
+        print("5. 🗑️  Delete Contact")
+        print("6. 📊 Contact Statistics")
+        print("7. 💾 Save Contacts")
+        print("8. ❌ Exit")
+        print("="*60)
+    
+    def validate_phone(self, phone: str) -> bool:
+        """Validate phone number format."""
+        # Remove all non-digit characters for validation
+        digits_only = NON_DIGITS.sub('', phone)
+        return len(digits_only) >= 10
+    
+    def validate_email(self, email: str) -> bool:
+        """Validate email format."""
+        if not email:
+            return True  # Email is optional
+        return EMAIL_PATTERN.match(email) is not None
+    
+    def get_contact_input(self) -> Dict[str, str]:
+        """Get contact information from user with validation."""
+        print("\n📝 CONTACT INFORMATION")
+        print("-" * 30)
+        
+        # Get name (required)
+        while True:
+            name = input("Enter contact name: ").strip()
+            if name:
+                break
+            print("❌ Name cannot be empty!")
+        
+        # Get phone (required)
+        while True:
+            phone = input("Enter phone number: ").strip()
+            if phone and self.validate_phone(phone):
+                break
+            print("❌ Please enter a valid phone number (at least 10 digits)!")
+        
+        # Get email (optional)
+        while True:
+            email = input("Enter email address (optional): ").strip()
+            if not email or self.validate_email(email):
+                break
+            print("❌ Please enter a valid email address!")
+        
+        # Get address (optional)
+        address = input("Enter address (optional): ").strip()
+        
+        return {
+            'name': name,
+            'phone': phone,
+            'email': email,
+            'address': address
+        }
+    
+    def add_contact_interactive(self):
+        """Interactive contact addition."""
+        print("\n👤 ADD NEW CONTACT")
+        print("-" * 30)
+        
+        try:
+            contact_data = self.get_contact_input()
+            contact = self.contact_manager.add_contact(**contact_data)
+            print(f"\n✅ Contact added successfully!")
+            print(f"Contact ID: {contact.id}")
+            print(f"Name: {contact.name}")
+            print(f"Phone: {contact.phone}")
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+    
+    def show_paged(self, contacts: Iterator[BaseContact], render: Callable[[BaseContact], str],
+                   page_size: int) -> int:
+        """Render contacts a page at a time with one stdout write per page.
+        
+        Only as many contacts as are displayed are pulled from the iterator,
+        so showing the first page of a huge book costs O(page size). Returns
+        the number of contacts shown.
+        """
+        shown = 0
+        while True:
+            page = [render(contact) for contact in itertools.islice(contacts, page_size)]
+            if page:
+                sys.stdout.write("\n".join(page) + "\n")
+                sys.stdout.flush()
+                shown += len(page)
+            if len(page) < page_size:
+                return shown
+            if input("-- Press Enter for more, or 'q' to stop: ").strip().lower() == 'q':
+                return shown
+    
+    @staticmethod
+    def format_row(contact: BaseContact) -> str:
+        """One line of the compact list view."""
+        email_display = contact.email[:22] + "..." if len(contact.email) > 25 else contact.email
+        return f"{contact.id:<6} {contact.name:<20} {contact.phone:<15} {email_display:<25}"
+    
+    def view_all_contacts(self):
+        """Display all contacts."""
+        total = self.contact_manager.get_contact_count()
+        if not total:
+            print("\n📭 No contacts found!")
+            return
+        
+        print(f"\n📋 ALL CONTACTS ({total} total)")
+        print("="*60)
+        
+        # Display in a compact format for the list view
+        print(f"{'ID':<6} {'Name':<20} {'Phone':<15} {'Email':<25}")
+        print("-" * 70)
+        
+        self.show_paged(self.contact_manager.iter_contacts(), self.format_row, self.LIST_PAGE_SIZE)
+        
+        print(f"\n💡 Use 'Search Contacts' to view detailed information")
+    
+    def search_contacts_interactive(self):
+        """Interactive contact search."""
+        print("\n🔍 SEARCH CONTACTS")
+        print("-" * 30)
+        
+        query = input("Enter search term (name, phone, email, or address): ").strip()
+        if not query:
+            print("❌ Search term cannot be empty!")
+            return
+        
+        results = self.contact_manager.iter_search(query)
+        first = next(results, None)
+        if first is None:
+            print(f"\n📭 No contacts found matching '{query}'")
+            fuzzy_search = getattr(self.contact_manager, 'fuzzy_search_contacts', None)
+            suggestions = fuzzy_search(query, limit=5) if fuzzy_search else []
+            if suggestions:
+                print("\n💡 Did you mean:")
+                for contact, score in suggestions:
+                    print(f"   {contact.name} ({contact.phone}) - {score:.0%} match")
+            return
+        
+        print("\n🔍 SEARCH RESULTS")
+        print("="*60)
+        
+        found = self.show_paged(itertools.chain([first], results), str, self.SEARCH_PAGE_SIZE)
+        print(f"\n🔍 {found} contact(s) shown")
+    
+    def update_contact_interactive(self):
+        """Interactive contact update."""
+        print("\n✏️ UPDATE CONTACT")
+        print("-" * 30)
+        
+        try:
+            contact_id = int(input("Enter contact ID to update: "))
+        except ValueError:
+            print("❌ Invalid contact ID!")
+            return
+        
+        contact = self.contact_manager.get_contact_by_id(contact_id)
+        if not contact:
+            print("❌ Contact not found!")
+            return
+        
+        print(f"\nCurrent contact details:")
+        print(contact)
+        
+        print("\nWhat would you like to update?")
+        print("1. Name")
+        print("2. Phone")
+        print("3. Email")
+        print("4. Address")
+        print("5. All Details")
+        
+        choice = input("Select option (1-5): ").strip()
+        
+        try:
+            if choice == "1":
+                new_name = input("Enter new name: ").strip()
+                if new_name:
+                    if self.contact_manager.update_contact(contact_id, name=new_name):
+                        print("✅ Contact name updated successfully!")
+                    else:
+                        print("❌ Failed to update contact name!")
+                else:
+                    print("❌ Name cannot be empty!")
+            
+            elif choice == "2":
+                while True:
+                    new_phone = input("Enter new phone number: ").strip()
+                    if new_phone and self.validate_phone(new_phone):
+                        if self.contact_manager.update_contact(contact_id, phone=new_phone):
+                            print("✅ Contact phone updated successfully!")
+                        else:
+                            print("❌ Failed to update contact phone!")
+                        break
+                    print("❌ Please enter a valid phone number!")
+            
+            elif choice == "3":
+                while True:
+                    new_email = input("Enter new email address: ").strip()
+                    if not new_email or self.validate_email(new_email):
+                        if self.contact_manager.update_contact(contact_id, email=new_email):
+                            print("✅ Contact email updated successfully!")
+                        else:
+                            print("❌ Failed to update contact email!")
+                        break
+                    print("❌ Please enter a valid email address!")
+            
+            elif choice == "4":
+                new_address = input("Enter new address: ").strip()
+                if self.contact_manager.update_contact(contact_id, address=new_address):
+                    print("✅ Contact address updated successfully!")
+                else:
+                    print("❌ Failed to update contact address!")
+            
+            elif choice == "5":
+                contact_data = self.get_contact_input()
+                if self.contact_manager.update_contact(contact_id, **contact_data):
+                    print("✅ All contact details updated successfully!")
+                else:
+                    print("❌ Failed to update contact details!")
+            
+            else:
+                print("❌ Invalid choice!")
+        
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+    
+    def delete_contact_interactive(self):
+        """Interactive contact deletion."""
+        print("\n🗑️ DELETE CONTACT")
+        print("-" * 30)
+        
+        try:
+            contact_id = int(input("Enter contact ID to delete: "))
+        except ValueError:
+            print("❌ Invalid contact ID!")
+            return
+        
+        contact = self.contact_manager.get_contact_by_id(contact_id)
+        if not contact:
+            print("❌ Contact not found!")
+            return
+        
+        print(f"\nContact to delete:")
+        print(contact)
+        
+        confirm = input("\nAre you sure you want to delete this contact? (y/n): ").strip().lower()
+        if confirm in ['y', 'yes']:
+            if self.contact_manager.delete_contact(contact_id):
+                print("✅ Contact deleted successfully!")
+            else:
+                print("❌ Failed to delete contact!")
+        else:
+            print("❌ Contact deletion cancelled.")
+    
+    def show_statistics(self):
+        """Display contact statistics."""
+        stats = self.contact_manager.get_statistics()
+        total_contacts = stats['total']
+        
+        print("\n📊 CONTACT STATISTICS")
+        print("="*40)
+        print(f"Total Contacts: {total_contacts}")
+        
+        if total_contacts > 0:
+            # Count contacts with complete information
+            with_email = stats['with_email']
+            with_address = stats['with_address']
+            
+            print(f"Contacts with email: {with_email} ({with_email/total_contacts*100:.1f}%)")
+            print(f"Contacts with address: {with_address} ({with_address/total_contacts*100:.1f}%)")
+            
+            # Show recent contacts
+            recent_contacts = self.contact_manager.get_recent_contacts(3)
+            print(f"\n📅 Recent Contacts:")
+            for contact in recent_contacts:
+                print(f"  • {contact.name} ({contact.created_date})")
+    
+    def save_contacts_manual(self):
+        """Manually save contacts."""
+        self.contact_manager.save_contacts()
+        print("✅ Contacts saved successfully!")
+    
+    def run_batch(self, lines: Iterable[str]) -> Dict[str, int]:
+        """Apply JSON-lines commands in one transaction with a single persistence flush.
+        
+        Each line is {"op": "add", "name", "phone", "email", "address"},
+        {"op": "update", "id", ...fields} or {"op": "delete", "id"}. Lines
+        that cannot be applied are reported on stderr and skipped.
+        """
+        manager = self.contact_manager
+        counts = {'applied': 0, 'failed': 0}
+        with manager.batch():
+            for number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                try:
+                    command = json.loads(line)
+                    op = command.pop('op')
+                    if op == 'add':
+                        ok = manager.add_contact(**command) is not None
+                    elif op == 'update':
+                        ok = manager.update_contact(command.pop('id'), **command)
+                    elif op == 'delete':
+                        ok = manager.delete_contact(command['id'])
+                    else:
+                        raise ValueError(f"unknown op {op!r}")
+                    if not ok:
+                        raise ValueError("contact not found")
+                except (ValueError, KeyError, TypeError) as e:
+                    counts['failed'] += 1
+                    print(f"Line {number}: {e}", file=sys.stderr)
+                else:
+                    counts['applied'] += 1
+        return counts
+    
+    def run(self):
+        """Main application loop."""
+        print("🚀 Welcome to the Contact Management System!")
+        print("Manage your contacts efficiently and securely!")
+        
+        while True:
+            self.display_menu()
+            
+            try:
+                choice = input("\nEnter your choice (1-8): ").strip()
+                
+                if choice == "1":
+                    self.add_contact_interactive()
+                elif choice == "2":
+                    self.view_all_contacts()
+                elif choice == "3":
+                    self.search_contacts_interactive()
+                elif choice == "4":
+                    self.update_contact_interactive()
+                elif choice == "5":
+                    self.delete_contact_interactive()
+                elif choice == "6":
+                    self.show_statistics()
+                elif choice == "7":
+                    self.save_contacts_manual()
+                elif choice == "8":
+                    print("\n👋 Thank you for using the Contact Management System!")
+                    print("Your contacts have been automatically saved.")
+                    break
+                else:
+                    print("❌ Invalid choice! Please enter a number between 1-8.")
+                
+                input("\nPress Enter to continue...")
+                
+            except KeyboardInterrupt:
+                print("\n\n👋 Application interrupted. Goodbye!")
+                break
+            except Exception as e:
+                print(f"\n❌ An error occurred: {e}")
+                input("Press Enter to continue...")
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+               "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+              "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas"]
+STREETS = ["Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Lake", "Hill"]
+CITIES = ["Springfield", "Riverside", "Franklin", "Greenville", "Bristol", "Clinton"]
+
+def generate_contact_records(count: int, seed: int = 42) -> List[Dict]:
+    """Generate a reproducible synthetic address book as contact dictionaries."""
+    rng = random.Random(seed)
+    stamp = "2024-01-01 00:00:00"
+    records = []
+    for i in range(count):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        records.append({
+            'id': i + 1,
+            'name': f"{first} {last} {i}",
+            'phone': f"555{i:07d}",
+            'email': f"{first.lower()}.{last.lower()}{i}@example.com" if rng.random() < 0.7 else "",
+            'address': f"{rng.randint(1, 9999)} {rng.choice(STREETS)} St, {rng.choice(CITIES)}" if rng.random() < 0.5 else "",
+            'created_date': stamp,
+            'updated_date': stamp
+        })
+    return records
+
+def _scan_search(contacts: List[Contact], query: str) -> List[Contact]:
+    """The original linear-scan search, kept as the benchmark baseline."""
+    query = query.strip().lower()
+    return [contact for contact in contacts
+            if (query in contact.name.lower() or
+                query in contact.phone or
+                query in contact.email.lower() or
+                query in contact.address.lower())]
+
+def benchmark_search(sizes=(10_000, 100_000, 1_000_000), repeats: int = 5):
+    """Compare indexed search latency against the linear scan."""
+    queries = ["smith", "jennifer lopez 4", "5550001", "example.com", "zzz-no-match"]
+    print(f"{'Contacts':>10} {'Query':<18} {'Hits':>8} {'Scan ms':>10} {'Index ms':>10} {'Speedup':>8}")
+    for size in sizes:
+        manager = ContactManager(storage=MemoryStorage(generate_contact_records(size)))
+        for query in queries:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                expected = _scan_search(manager.contacts, query)
+            scan_ms = (time.perf_counter() - start) / repeats * 1000
+            start = time.perf_counter()
+            for _ in range(repeats):
+                results = manager.search_contacts(query)
+            index_ms = (time.perf_counter() - start) / repeats * 1000
+            assert results == expected
+            print(f"{size:>10} {query:<18} {len(results):>8} {scan_ms:>10.2f} {index_ms:>10.2f} "
+                  f"{scan_ms / max(index_ms, 1e-6):>7.1f}x")
+
+NAME_SYLLABLES = ["an", "ber", "cal", "dor", "el", "fen", "gar", "hol", "is", "jen", "kor", "lin",
+                  "mar", "nel", "or", "pet", "quin", "ros", "sam", "tor", "ul", "ven", "wil", "zan"]
+
+def _synthetic_name(rng: random.Random) -> str:
+    """A made-up first and last name, so the vocabulary grows with the book."""
+    first = "".join(rng.choice(NAME_SYLLABLES) for _ in range(rng.randint(2, 3)))
+    last = "".join(rng.choice(NAME_SYLLABLES) for _ in range(rng.randint(2, 4)))
+    return f"{first.title()} {last.title()}"
+
+def _typo(word: str, rng: random.Random) -> str:
+    """The word with one random character substituted."""
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice("aeioulnrst") + word[i + 1:]
+
+def _scan_fuzzy(contacts: Iterable[BaseContact], query: str, max_distance: int) -> Set[int]:
+    """Ids of contacts with a name word within max_distance of the query, by brute force."""
+    index = FuzzyIndex()
+    return {contact.id for contact in contacts
+            if any(edit_distance(query, token) <= max_distance for token in index.tokens(contact.name))}
+
+def benchmark_fuzzy(sizes=(10_000, 100_000, 1_000_000), queries: int = 20, scan_limit: int = 100_000):
+    """Measure fuzzy search latency as the book grows, against a brute-force scan."""
+    print(f"{'Contacts':>10} {'Words':>8} {'Build s':>8} {'Fuzzy ms':>10} {'Scan ms':>10}")
+    for size in sizes:
+        rng = random.Random(size)
+        records = generate_contact_records(size)
+        for record in records:
+            record['name'] = _synthetic_name(rng)
+        manager = ContactManager(storage=MemoryStorage(records))
+        start = time.perf_counter()
+        manager.fuzzy_search_contacts("warmup")
+        build = time.perf_counter() - start
+        words = [_typo(rng.choice(records)['name'].split()[-1].lower(), rng) for _ in range(queries)]
+        start = time.perf_counter()
+        for word in words:
+            manager.fuzzy_search_contacts(word, limit=10, max_distance=1)
+        fuzzy_ms = (time.perf_counter() - start) / queries * 1000
+        scan = "-"
+        if size <= scan_limit:
+            start = time.perf_counter()
+            expected = _scan_fuzzy(manager.contacts, words[0], 1)
+            scan = f"{(time.perf_counter() - start) * 1000:.1f}"
+            found = manager.fuzzy_search_contacts(words[0], limit=len(expected) + 10, max_distance=1)
+            assert expected <= {contact.id for contact, _ in found}
+        print(f"{size:>10} {len(manager._fuzzy_index._tree):>8} {build:>8.2f} {fuzzy_ms:>10.2f} {scan:>10}")
+
+def benchmark_operations(sizes=(10_000, 100_000, 1_000_000), operations: int = 1000, seed: int = 42):
+    """Report throughput and p50/p99 latency of every ContactManager hot path.
+    
+    Each synthetic book is saved to a temporary directory and loaded back
+    with metrics enabled, then the same seeded mix of lookups, searches,
+    listings, adds, updates, deletes and a full save runs against it, so
+    runs are comparable across changes.
+    """
+    for size in sizes:
+        rng = random.Random(seed)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "contacts.json")
+            JournalStorage(filename).save(generate_contact_records(size))
+            metrics = OperationMetrics()
+            manager = ContactManager(storage=JournalStorage(filename), metrics=metrics)
+            sample = [manager.get_contact_by_id(rng.randint(1, size)) for _ in range(operations)]
+            for contact in sample:
+                with metrics.measure('get_by_phone'):
+                    manager.get_contact_by_phone(contact.phone)
+                with metrics.measure('first_page'):
+                    list(manager.iter_contacts(limit=50))
+            for contact in sample[:operations // 10]:
+                manager.search_contacts(rng.choice([contact.name, contact.phone[-6:], contact.email[:8] or "lopez"]))
+            added = [manager.add_contact(f"Bench Contact {i}", f"666{i:07d}", f"bench{i}@example.com").id
+                     for i in range(operations)]
+            for contact_id in added:
+                manager.update_contact(contact_id, address=f"{rng.randint(1, 9999)} Main St")
+            for contact_id in added:
+                manager.delete_contact(contact_id)
+            for _ in range(3):
+                manager.get_all_contacts()
+            manager.save_contacts()
+            manager.storage.close()
+        print(f"\n{size} contacts")
+        print(metrics.report())
+
+class _LegacyContact:
+    """The original dict-backed contact layout, kept as the memory baseline."""
+    
+    def __init__(self, data: Dict):
+        self.id = data['id']
+        self.name = data['name']
+        self.phone = data['phone']
+        self.email = data['email']
+        self.address = data['address']
+        self.created_date = data['created_date']
+        self.updated_date = data['updated_date']
+
+def _build_legacy(records: Iterable[Dict]):
+    return [_LegacyContact(record) for record in records]
+
+def _build_slots(records: Iterable[Dict]):
+    return [Contact.from_dict(record) for record in records]
+
+def _build_columnar(records: Iterable[Dict]):
+    return ContactStore(Contact.from_dict(record) for record in records)
+
+def _build_manager(records: Iterable[Dict], columnar: bool = False) -> ContactManager:
+    manager = ContactManager(storage=MemoryStorage(list(records)), columnar=columnar)
+    # The storage's copy of the decoded records is not part of the manager's footprint
+    manager.storage.records = []
+    return manager
+
+# Bare contact containers, then whole managers with their indexes and sorted views
+MEMORY_REPRESENTATIONS = {
+    "dict-based (original)": _build_legacy,
+    "__slots__ Contact": _build_slots,
+    "columnar ContactStore": _build_columnar,
+    "ContactManager": _build_manager,
+    "ContactManager(columnar=True)": lambda records: _build_manager(records, columnar=True),
+}
+
+def _traced_per_contact(representation: str, lines: List[str], count: int) -> float:
+    """Bytes per contact still allocated, according to tracemalloc, once a representation is built."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        # Decode one record at a time so only the built representation stays allocated
+        contacts = MEMORY_REPRESENTATIONS[representation](json.loads(line) for line in lines)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del contacts
+    return size / count
+
+def benchmark_memory(count: int = 200_000):
+    """Report memory per contact for each contact representation and for ContactManager itself."""
+    lines = [json.dumps(record) for record in generate_contact_records(count)]
+    print(f"{'Representation':<30} {'bytes/contact':>14}")
+    sizes = {}
+    for representation in MEMORY_REPRESENTATIONS:
+        sizes[representation] = _traced_per_contact(representation, lines, count)
+        print(f"{representation:<30} {sizes[representation]:>14.0f}")
+    saving = 1 - sizes["ContactManager(columnar=True)"] / sizes["ContactManager"]
+    print(f"columnar=True saves {saving:.1%} of the manager's memory")
+
+def benchmark_id_allocator(count: int = 2_000_000, threads: int = 4):
+    """Report id allocation throughput and check that no id is handed out twice."""
+    ids = IdAllocator()
+    allocate = ids.allocate
+    start = time.perf_counter()
+    for _ in range(count):
+        allocate()
+    elapsed = time.perf_counter() - start
+    print(f"Single thread: {count / elapsed / 1e6:.2f}M ids/s")
+    
+    ids = IdAllocator()
+    results = [[] for _ in range(threads)]
+    def worker(out: List[int]):
+        allocate = ids.allocate
+        for i in range(count // threads):
+            out.append(allocate())
+            if i % 10_000 == 0:
+                ids.seed(i)
+    workers = [threading.Thread(target=worker, args=(out,)) for out in results]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    allocated = [contact_id for out in results for contact_id in out]
+    print(f"{threads} threads: {len(allocated) / elapsed / 1e6:.2f}M ids/s, "
+          f"duplicates: {len(allocated) - len(set(allocated))}")
+
+def main(argv: Optional[List[str]] = None):
+    """Run the contact manager, a migration or one of the benchmarks."""
+    parser = argparse.ArgumentParser(description="Contact Management System")
+    parser.add_argument("--db", metavar="PATH", help="use a SQLite database instead of contacts.json")
+    parser.add_argument("--migrate", nargs=2, metavar=("JSON", "DB"),
+                        help="copy a contacts.json file into a SQLite database and exit")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="apply JSON-lines add/update/delete commands from FILE ('-' for stdin) and exit")
+    parser.add_argument("--metrics", action="store_true",
+                        help="print per-operation latency and bytes written when the app exits")
+    parser.add_argument("--merge-duplicates", action="store_true",
+                        help="list contacts in contacts.json that share a phone, email, or name and address,"
+                             " and merge those with the same phone")
+    parser.add_argument("--serve", nargs="?", const="127.0.0.1:8765", metavar="HOST:PORT",
+                        help="serve contacts.json to concurrent clients over HTTP (default 127.0.0.1:8765)")
+    parser.add_argument("--benchmark-search", action="store_true", help="compare indexed search with a scan")
+    parser.add_argument("--benchmark-operations", action="store_true",
+                        help="report throughput and p50/p99 latency of each ContactManager operation")
+    parser.add_argument("--benchmark-fuzzy", action="store_true", help="measure fuzzy search latency")
+    parser.add_argument("--benchmark-memory", action="store_true", help="report memory per contact")
+    parser.add_argument("--benchmark-ids", action="store_true", help="report id allocation throughput")
+    args = parser.parse_args(argv)
+    
+    if args.benchmark_search:
+        benchmark_search()
+    elif args.benchmark_operations:
+        benchmark_operations()
+    elif args.benchmark_fuzzy:
+        benchmark_fuzzy()
+    elif args.benchmark_memory:
+        benchmark_memory()
+    elif args.benchmark_ids:
+        benchmark_id_allocator()
+    elif args.migrate:
+        manager = SQLiteContactManager(args.migrate[1])
+        print(f"Migrated {manager.migrate_from_json(args.migrate[0])} contacts into {args.migrate[1]}")
+        manager.close()
+    elif args.merge_duplicates:
+        manager = ContactManager()
+        for group in manager.find_duplicates():
+            print("Possible duplicates:")
+            for contact in group:
+                print(f"  #{contact.id} {contact.name}, {contact.phone}, "
+                      f"{contact.email or '-'}, {contact.address or '-'}")
+        print(f"Merged away {manager.merge_duplicates()} duplicate contacts; "
+              f"those with different phone numbers were kept")
+    elif args.serve:
+        host, _, port = args.serve.rpartition(":")
+        service = ContactService()
+        server = serve_contacts(service, host or "127.0.0.1", int(port))
+        print(f"Serving contacts on http://{server.server_address[0]}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.close()
+    else:
+        metrics = OperationMetrics() if args.metrics else None
+        app = ContactApp(SQLiteContactManager(args.db) if args.db else ContactManager(metrics=metrics))
+        if args.batch:
+            start = time.perf_counter()
+            if args.batch == "-":
+                counts = app.run_batch(sys.stdin)
+            else:
+                with open(args.batch, encoding="utf-8") as f:
+                    counts = app.run_batch(f)
+            elapsed = time.perf_counter() - start
+            total = counts['applied'] + counts['failed']
+            print(f"Applied {counts['applied']} commands ({counts['failed']} failed) in {elapsed:.2f}s"
+                  f" - {total / max(elapsed, 1e-9):,.0f} commands/s")
+        else:
+            app.run()
+        if metrics is not None:
+            print(metrics.report())
+
+if __name__ == "__main__":
+    main()
+
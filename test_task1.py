@@ -0,0 +1,64 @@
+import os
+
+from TASK1 import TaskStore, run_batch
+
+
+def test_torn_journal_tail_is_cut_before_appending(tmp_path):
+    filename = str(tmp_path / "tasks.jsonl")
+    tasks = TaskStore(filename)
+    tasks.add("a")
+    tasks.add("b")
+    tasks.close()
+    with open(filename, "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "id": 3, "descr')
+    tasks = TaskStore(filename)
+    assert [description for _, description, _ in tasks] == ["a", "b"]
+    tasks.add("c")
+    tasks.close()
+    assert [description for _, description, _ in TaskStore(filename)] == ["a", "b", "c"]
+
+
+def test_compaction_keeps_the_journal_mode(tmp_path):
+    filename = str(tmp_path / "tasks.jsonl")
+    tasks = TaskStore(filename)
+    tasks.add("a")
+    os.chmod(filename, 0o640)
+    tasks.compact()
+    assert os.stat(filename).st_mode & 0o777 == 0o640
+
+
+def test_views_follow_completes_and_deletes():
+    tasks = TaskStore(None)
+    for description in "abcde":
+        tasks.add(description)
+    tasks.complete(4)
+    tasks.complete(2)
+    tasks.delete(3)
+    assert tasks.counts() == {"all": 4, "pending": 2, "completed": 2}
+    assert [row[0] for row in tasks.page("all")] == [1, 2, 4, 5]
+    assert [row[0] for row in tasks.page("pending")] == [1, 5]
+    assert tasks.page("completed", offset=1, limit=1) == [(4, "d", True)]
+
+
+def test_deep_pages_cross_blocks():
+    tasks = TaskStore(None)
+    for i in range(10_000):
+        tasks.add(str(i))
+    for task_id in range(1, 10_001, 3):
+        tasks.delete(task_id)
+    expected = [task_id for task_id in range(1, 10_001) if task_id % 3 != 1]
+    assert [row[0] for row in tasks.page("all", 5000, 20)] == expected[5000:5020]
+    assert tasks.page("all", len(expected), 20) == []
+
+
+def test_batch_applies_commands_and_rejects_bad_fields(tmp_path):
+    filename = str(tmp_path / "tasks.jsonl")
+    tasks = TaskStore(filename)
+    lines = ['{"op": "add", "description": "a"}', '{"op": "add", "description": null}',
+             '{"op": "add", "description": "b"}', '{"op": "complete", "id": true}',
+             '{"op": "complete", "id": 2}', '{"op": "delete", "id": "1"}', '{"op": "delete", "id": 1}']
+    assert run_batch(tasks, lines) == (4, 3)
+    assert list(tasks) == [(2, "b", True)]
+    tasks.compact()
+    tasks.close()
+    assert list(TaskStore(filename)) == [(2, "b", True)]
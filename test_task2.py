@@ -0,0 +1,68 @@
+import math
+from array import array
+from io import StringIO
+
+import pytest
+
+import TASK2
+from TASK2 import FLOAT_BACKEND, FRACTION_BACKEND, calculate_columns, calculate_file, decimal_backend, evaluate, read_csv_chunks
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("-7 % 3", 2), ("7 % -3", -2), ("-7 // 2", -4), ("7 // -2", -4), ("-7.5 % 2", 0.5), ("6 % 3", 0),
+])
+def test_backends_agree_on_floor_division_and_modulo(expression, expected):
+    for backend in (FLOAT_BACKEND, FRACTION_BACKEND, decimal_backend(28)):
+        assert evaluate(expression, backend) == expected
+
+
+def test_decimal_division_by_zero_has_the_calculator_message():
+    with pytest.raises(ZeroDivisionError, match="Cannot divide by zero!"):
+        evaluate("1 % 0", decimal_backend(28))
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_column_failures_are_masked_as_nan(monkeypatch, use_numpy):
+    if use_numpy and TASK2.np is None:
+        pytest.skip("numpy is not installed")
+    if not use_numpy:
+        monkeypatch.setattr(TASK2, "np", None)  # the array-module fallback
+    results, masked = calculate_columns(array('d', [0, -8, 4, 1]), array('d', [-1, 0.5, 0.5, 0]), '^')
+    assert math.isnan(results[0]) and math.isnan(results[1])
+    assert list(results[2:]) == [2.0, 1.0]
+    assert masked == 2
+    results, masked = calculate_columns(array('d', [1, 2, math.nan]), 0, '/')
+    assert all(map(math.isnan, results))
+    assert masked == 2
+
+
+def test_powers_without_a_real_value_raise():
+    with pytest.raises(ValueError, match="no real value"):
+        evaluate("(-8) ^ 0.5")
+
+
+def test_csv_blank_lines_are_skipped():
+    chunks = list(read_csv_chunks(StringIO("a,b\n1,2\n\n3,4\n\n")))
+    assert [(list(left), list(right)) for left, right in chunks] == [([1.0, 3.0], [2.0, 4.0])]
+
+
+def test_right_file_is_rejected_with_csv_input(tmp_path):
+    source = tmp_path / "in.csv"
+    source.write_text("1,2\n")
+    with pytest.raises(ValueError, match="binary input"):
+        calculate_file(str(source), '+', str(tmp_path / "out.csv"), right_path=str(tmp_path / "right.bin"))
+
+
+@pytest.mark.parametrize("right_values", [4, 14])
+def test_binary_inputs_of_different_lengths_are_rejected(tmp_path, right_values):
+    (tmp_path / "left.bin").write_bytes(array('d', range(10)).tobytes())
+    (tmp_path / "right.bin").write_bytes(array('d', range(right_values)).tobytes())
+    with pytest.raises(ValueError, match="different lengths"):
+        calculate_file(str(tmp_path / "left.bin"), '+', str(tmp_path / "out.bin"),
+                       right_path=str(tmp_path / "right.bin"), chunk_size=4)
+
+
+def test_chunk_size_must_be_positive(tmp_path):
+    (tmp_path / "in.csv").write_text("1,2\n")
+    with pytest.raises(ValueError):
+        calculate_file(str(tmp_path / "in.csv"), '+', str(tmp_path / "out.csv"), chunk_size=0)
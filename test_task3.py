@@ -0,0 +1,52 @@
+import io
+import os
+
+import pytest
+
+from TASK3 import PasswordPolicy, _shard_directory, generate_passwords, write_passwords_parallel
+
+
+def test_generated_passwords_meet_the_policy():
+    policy = PasswordPolicy(12, 1, 1, 2, 1, max_repeat=2)
+    assert all(map(policy.check, generate_passwords(200, policy)))
+
+
+def test_policy_few_draws_meet_is_rejected():
+    policy = PasswordPolicy(12, 0, 0, 8, 0)
+    assert policy.acceptance < 1e-5
+    with pytest.raises(ValueError, match="too few"):
+        generate_passwords(1, policy)
+
+
+def test_shards_only_go_next_to_real_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open(tmp_path / "out.txt", "wb") as f:
+        assert _shard_directory(f) == str(tmp_path)
+    with open(os.devnull, "wb") as f:
+        assert _shard_directory(f) is None
+    with io.FileIO(tmp_path / "piped.txt", "wb") as f:
+        f.name = "<stdout>"
+        assert _shard_directory(f) is None
+
+
+def test_seeded_output_does_not_depend_on_the_worker_count():
+    policy = PasswordPolicy(12)
+    outputs = []
+    for workers in (1, 3):
+        f = io.BytesIO()
+        assert write_passwords_parallel(f, 250, policy, workers=workers, seed=7, shard_size=100) == 250
+        outputs.append(f.getvalue())
+    assert outputs[0] == outputs[1]
+    assert len(outputs[0].splitlines()) == 250
+
+
+def test_no_passwords_needs_no_workers():
+    f = io.BytesIO()
+    assert write_passwords_parallel(f, 0, workers=2) == 0
+    assert f.getvalue() == b""
+
+
+@pytest.mark.parametrize("arguments", [(0,), (-4,), (12, -1), (12, 1, 1, -2)])
+def test_impossible_policy_arguments_are_rejected(arguments):
+    with pytest.raises(ValueError, match="at least 1 character|cannot be negative"):
+        PasswordPolicy(*arguments)
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+import TASK4
+from TASK4 import (CHOICE_INDEX, PAPER, RESULT_TABLE, ROCK, SCISSORS, ConstantStrategy, CycleStrategy,
+                   FrequencyStrategy, MarkovStrategy, RandomStrategy, count_pairs, determine_result, simulate)
+
+
+@pytest.fixture(params=["numpy", "big integers"])
+def backend(request, monkeypatch):
+    if request.param == "numpy" and TASK4.np is None:
+        pytest.skip("numpy is not installed")
+    if request.param == "big integers":
+        monkeypatch.setattr(TASK4, "np", None)
+    return request.param
+
+
+def test_result_table_follows_the_rules():
+    for move in (ROCK, PAPER, SCISSORS):
+        assert RESULT_TABLE[move * 3 + move] == 0
+        beaten = (move - 1) % 3
+        assert RESULT_TABLE[move * 3 + beaten] == 1 and RESULT_TABLE[beaten * 3 + move] == -1
+    assert determine_result("r", "s") == 1 and determine_result("s", "r") == -1
+    assert [CHOICE_INDEX[code] for code in "rps"] == [ROCK, PAPER, SCISSORS]
+
+
+def test_count_pairs(backend):
+    first = bytes([ROCK, ROCK, PAPER, SCISSORS, SCISSORS, SCISSORS])
+    second = bytes([ROCK, PAPER, PAPER, ROCK, ROCK, SCISSORS])
+    counts = count_pairs(first, second)
+    assert counts == [1, 1, 0, 0, 1, 0, 2, 0, 1]
+    assert sum(count_pairs(bytes(1000), bytes([SCISSORS]) * 1000)) == 1000
+
+
+@pytest.mark.parametrize("chunk", [1 << 20, 7])
+def test_rock_against_a_cycle_gives_exact_counts(backend, monkeypatch, chunk):
+    monkeypatch.setattr(TASK4, "SIMULATION_CHUNK", chunk)
+    result = simulate(ConstantStrategy(ROCK), CycleStrategy("rps"), 301, seed=1)
+    assert result == {"wins": 100, "losses": 100, "ties": 101}
+
+
+def test_seeded_random_simulation_is_reproducible(backend):
+    first = simulate(RandomStrategy(), RandomStrategy((5, 3, 2)), 30_000, seed=3)
+    assert first == simulate(RandomStrategy(), RandomStrategy((5, 3, 2)), 30_000, seed=3)
+    assert sum(first.values()) == 30_000
+    # Both sides random: each outcome is close to a third
+    assert all(abs(count - 10_000) < 600 for count in first.values())
+
+
+def test_markov_learns_a_cycle():
+    result = simulate(MarkovStrategy(2), CycleStrategy("rrpps"), 1000, seed=5)
+    assert result["wins"] >= 980
+
+
+@pytest.mark.parametrize("strategy", [FrequencyStrategy(7), MarkovStrategy(1, 7), MarkovStrategy(3, 7)])
+def test_windowed_counts_hold_the_window(strategy):
+    rng = random.Random(11)
+    counted = -getattr(strategy, "order", 0)
+    for _ in range(200):
+        strategy.observe(rng.randrange(3), rng.randrange(3))
+        counted += 1
+        assert sum(strategy.counts) == max(0, min(counted, 7))
+        assert min(strategy.counts) >= 0
@@ -0,0 +1,250 @@
+import http.client
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from TASK5 import (ContactApp, ContactManager, ContactService, JournalStorage, JsonFileStorage, MemoryStorage,
+                   OperationMetrics, SortedKeys, SQLiteContactManager, benchmark_memory, generate_contact_records,
+                   serve_contacts)
+
+
+def journal_manager(path, **kwargs):
+    return ContactManager(storage=JournalStorage(str(path / "contacts.json"), **kwargs))
+
+
+def names(manager):
+    return sorted(contact.name for contact in manager.contacts)
+
+
+def test_torn_journal_tail_is_cut_before_appending(tmp_path):
+    manager = journal_manager(tmp_path)
+    manager.add_contact("A", "5551110000")
+    manager.storage.close()
+    with open(tmp_path / "contacts.json.journal", "a") as f:
+        f.write('{"op":"add","contact":{"id":2,"na')
+    manager = journal_manager(tmp_path)
+    assert names(manager) == ["A"]
+    manager.add_contact("B", "5552220000")
+    manager.storage.close()
+    assert names(journal_manager(tmp_path)) == ["A", "B"]
+
+
+def test_journal_replays_adds_updates_and_deletes(tmp_path):
+    manager = journal_manager(tmp_path)
+    ann = manager.add_contact("Ann", "5551110000")
+    bob = manager.add_contact("Bob", "5552220000")
+    manager.add_contact("Cy", "5553330000")
+    manager.update_contact(ann.id, email="ann@example.com")
+    manager.delete_contact(bob.id)
+    manager.storage.close()
+    with open(tmp_path / "contacts.json.journal") as f:
+        assert len(f.readlines()) == 5
+    reloaded = journal_manager(tmp_path)
+    assert names(reloaded) == ["Ann", "Cy"]
+    assert reloaded.get_contact_by_id(ann.id).email == "ann@example.com"
+    assert reloaded.get_contact_by_phone("555-222-0000") is None
+    assert reloaded.add_contact("Di", "5554440000").id == 4  # deleted ids are not handed out again
+
+
+def test_journal_compacts_into_the_snapshot(tmp_path):
+    manager = journal_manager(tmp_path, compact_every=3)
+    for i in range(5):
+        manager.add_contact(f"Name {i}", f"555000000{i}")
+    manager.delete_contact(1)
+    manager.storage.close()
+    with open(tmp_path / "contacts.json.journal") as f:
+        assert len(f.readlines()) < 3
+    assert names(journal_manager(tmp_path)) == [f"Name {i}" for i in range(1, 5)]
+
+
+def test_manager_journals_by_default(tmp_path):
+    manager = ContactManager(str(tmp_path / "contacts.json"))
+    assert isinstance(manager.storage, JournalStorage)
+    contact = manager.add_contact("Ann", "5551110000")
+    assert manager.delete_contact(contact.id)
+    assert manager.get_contact_count() == 0
+
+
+def test_sorted_keys_match_a_sorted_list():
+    import random
+    rng = random.Random(7)
+    keys = SortedKeys()
+    expected = []
+    for _ in range(5000):
+        key = (rng.randrange(300), rng.randrange(1000))
+        if expected and rng.random() < 0.3:
+            key = rng.choice(expected)
+            keys.remove(key)
+            expected.remove(key)
+        else:
+            keys.add(key)
+            expected.append(key)
+    expected.sort()
+    assert list(keys) == expected and len(keys) == len(expected)
+    assert [keys[i] for i in range(0, len(expected), 97)] == expected[::97]
+    probe = (150, 500)
+    assert keys.bisect_right(probe) == sum(1 for key in expected if key <= probe)
+
+
+def test_listing_pages_resume_after_a_cursor():
+    manager = ContactManager(storage=MemoryStorage(generate_contact_records(3000)))
+    everyone = manager.get_all_contacts()
+    assert [c.name.lower() for c in everyone] == sorted(c.name.lower() for c in everyone)
+    page = list(manager.iter_contacts(limit=50))
+    assert list(manager.iter_contacts(limit=50, after=page[-1])) == everyone[50:100]
+    assert [c.id for c in manager.get_recent_contacts(3)] == [
+        c.id for c in sorted(everyone, key=lambda c: (c.created_at, c.id), reverse=True)[:3]]
+
+
+def test_import_rewrites_a_whole_file_book_once(tmp_path, monkeypatch):
+    source = tmp_path / "in.csv"
+    ContactManager(storage=MemoryStorage(generate_contact_records(25))).export_contacts(str(source))
+    saves = []
+    original_save = JsonFileStorage.save
+    monkeypatch.setattr(JsonFileStorage, "save", lambda self, records: saves.append(len(records))
+                        or original_save(self, records))
+    manager = ContactManager(storage=JsonFileStorage(str(tmp_path / "contacts.json")))
+    assert manager.import_contacts(str(source), batch_size=10)["imported"] == 25
+    assert saves == [25]
+    reloaded = ContactManager(storage=JsonFileStorage(str(tmp_path / "contacts.json")))
+    assert reloaded.get_contact_count() == 25
+
+
+def test_http_bad_ids_and_bodies_get_400():
+    service = ContactService(ContactManager(storage=MemoryStorage()))
+    server = serve_contacts(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        def request(method, path, body=None):
+            connection = http.client.HTTPConnection(*server.server_address)
+            connection.request(method, path, body)
+            response = connection.getresponse()
+            status, payload = response.status, json.loads(response.read())
+            connection.close()
+            return status, payload
+        assert request("GET", "/contacts/abc")[0] == 400
+        assert request("GET", "/contacts?limit=ten")[0] == 400
+        assert request("DELETE", "/contacts/1x")[0] == 400
+        assert request("POST", "/contacts", b"{not json")[0] == 400
+        assert request("POST", "/contacts", b"[]")[0] == 400
+        assert request("POST", "/contacts", b'{"name": 5, "phone": "5551110000"}')[0] == 400
+        assert request("POST", "/contacts", b'{"name": null, "phone": "5551110000"}')[0] == 400
+        status, contact = request("POST", "/contacts", json.dumps({'name': "A", 'phone': "5551110000"}))
+        assert status == 201
+        assert request("GET", f"/contacts/{contact['id']}") == (200, contact)
+        assert request("GET", "/contacts?offset=0&limit=1")[1] == [contact]
+        assert request("PATCH", f"/contacts/{contact['id']}", b'{"email": 5}')[0] == 400
+        assert request("GET", f"/contacts/{contact['id']}") == (200, contact)
+        assert service.manager.get_contact_count() == len(service.manager.get_all_contacts()) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_sqlite_phone_numbers_compare_in_canonical_form(tmp_path):
+    manager = SQLiteContactManager(str(tmp_path / "contacts.db"))
+    contact = manager.add_contact("A", "555-111-0000")
+    assert manager.get_contact_by_phone("+1 (555) 111 0000").id == contact.id
+    with pytest.raises(ValueError):
+        manager.add_contact("B", "(555) 111 0000")
+    other = manager.add_contact("B", "5552220000")
+    with pytest.raises(ValueError):
+        manager.update_contact(other.id, phone="1-555-111-0000")
+    (tmp_path / "more.csv").write_text("name,phone\nC,555.111.0000\nD,5553330000\n")
+    assert manager.import_contacts(str(tmp_path / "more.csv")) == {'imported': 1, 'duplicates': 1, 'invalid': 0}
+    manager.close()
+
+
+def test_sqlite_database_without_phone_key_is_upgraded(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    with sqlite3.connect(path) as conn:
+        conn.executescript("""
+            CREATE TABLE contacts (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, phone TEXT NOT NULL,
+                                   email TEXT NOT NULL DEFAULT '', address TEXT NOT NULL DEFAULT '',
+                                   created_at INTEGER NOT NULL, updated_at INTEGER NOT NULL);
+            CREATE UNIQUE INDEX contacts_phone ON contacts (phone);
+            INSERT INTO contacts (name, phone, created_at, updated_at) VALUES ('A', '555-111-0000', 0, 0);
+        """)
+    conn.close()
+    manager = SQLiteContactManager(path)
+    assert manager.get_contact_by_phone("5551110000").name == "A"
+    with pytest.raises(ValueError):
+        manager.add_contact("B", "(555) 111-0000")
+    manager.close()
+
+
+def test_memory_benchmark_measures_the_manager(capsys):
+    benchmark_memory(500)
+    report = capsys.readouterr().out
+    assert "ContactManager(columnar=True)" in report and "saves" in report
+
+
+def test_batch_rejects_fields_that_are_not_text():
+    manager = ContactManager(storage=MemoryStorage())
+    manager.add_contact("A", "5551110000")
+    counts = ContactApp(manager).run_batch(['{"op":"update","id":1,"email":5}', '{"op":"add","name":"B","phone":5}'])
+    assert counts == {'applied': 0, 'failed': 2}
+    assert manager.get_contact_by_id(1).email == ""
+    assert [contact.name for contact in manager.get_all_contacts()] == ["A"]
+    assert manager.get_contact_by_phone("5551110000").id == 1
+
+
+def test_snapshots_share_structure_but_stay_unchanged():
+    service = ContactService(ContactManager(storage=MemoryStorage(list(generate_contact_records(2000)))))
+    try:
+        before = service.snapshot()
+        listed = before.list()
+        added = service.add_contact("Aaron New", "5559990000")
+        service.update_contact(1, name="Zoe Renamed")
+        service.delete_contact(2)
+        after = service.snapshot()
+        assert before.list() == listed and len(before) == 2000 and before.get(2) is not None
+        manager = service.manager
+        assert [record['id'] for record in after.list()] == [contact.id for contact in manager.get_all_contacts()]
+        assert after.get(2) is None and after.get(1)['name'] == "Zoe Renamed"
+        assert after.get_by_phone("555-999-0000") == added and len(after) == 2000
+        assert after.list(1999, 5) == [after.get(1)]
+        assert after.search("zoe renamed") == [after.get(1)]
+    finally:
+        service.close()
+
+
+def test_import_keeps_rows_read_before_a_bad_line(tmp_path):
+    source = tmp_path / "contacts.jsonl"
+    source.write_text('{"name": "A", "phone": 5551110000}\n{"name": "B", "phone": "5552220000"}\n'
+                      '{"name": "C", "phone": [1]}\n{"name": "D", "phone": "555\n')
+    manager = journal_manager(tmp_path)
+    with pytest.raises(ValueError):
+        manager.import_contacts(str(source))
+    assert names(manager) == ["A", "B"]
+    manager.storage.close()
+    assert names(journal_manager(tmp_path)) == ["A", "B"]
+    source.write_text('{"name": "C", "phone": [1]}\n{"name": "D", "phone": "5553330000"}\n')
+    assert manager.import_contacts(str(source)) == {'imported': 1, 'duplicates': 0, 'invalid': 1}
+
+
+def test_merge_keeps_people_who_only_share_an_email():
+    records = [{'id': i, 'name': name, 'phone': phone, 'email': email, 'address': "",
+                'created_date': "2026-01-01 00:00:0%d" % i, 'updated_date': "2026-01-01 00:00:00"}
+               for i, name, phone, email in ((1, "Ann", "5551110000", "fam@example.com"),
+                                             (2, "Bob", "5552220000", "fam@example.com"),
+                                             (3, "Ann L", "(555) 111-0000", ""))]
+    manager = ContactManager(storage=MemoryStorage(records))
+    assert [[contact.id for contact in group] for group in manager.find_duplicates()] == [[1, 2, 3]]
+    assert manager.merge_duplicates() == 1
+    assert sorted(contact.phone for contact in manager.contacts) == ["5551110000", "5552220000"]
+
+
+def test_metrics_record_listing_and_search_iterators():
+    metrics = OperationMetrics()
+    manager = ContactManager(storage=MemoryStorage(list(generate_contact_records(200))), metrics=metrics)
+    page = manager.iter_contacts(limit=50)
+    assert len([next(page) for _ in range(10)]) == 10
+    del page
+    manager.search_contacts("a")
+    assert list(manager.iter_search("e", limit=5))
+    assert metrics.counts['list'] == 1 and metrics.counts['search'] == 2
+    assert not metrics.errors['list'] and metrics.seconds['search'] > 0